@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Plugins of ariadne-codegen, used when generating the GraphQL client."""
+
+import ast
+
+from ariadne_codegen.plugins.base import Plugin
+
+LAZY_INIT = """
+from importlib import import_module
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    pass
+
+_MODULES = {}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+"""
+
+
+class LazyInitPlugin(Plugin):
+    """Import the modules of the generated package when their names are first used.
+
+    The generated `__init__` otherwise imports every module of the client, including
+    the large `input_types`, which is a considerable share of the startup time of a
+    short run. The imports are kept for type checkers.
+    """
+
+    def generate_init_module(self, module: ast.Module) -> ast.Module:
+        imports = [node for node in module.body if isinstance(node, ast.ImportFrom)]
+        rest = [node for node in module.body if not isinstance(node, ast.ImportFrom)]
+        lazy = ast.parse(LAZY_INIT)
+        type_checking, modules = (
+            node for node in lazy.body if isinstance(node, ast.If | ast.Assign)
+        )
+        assert isinstance(type_checking, ast.If)
+        assert isinstance(modules, ast.Assign)
+        type_checking.body = list(imports)
+        # Submodule defining each name
+        names = sorted(
+            (node.module, alias.asname or alias.name)
+            for node in imports
+            for alias in node.names
+        )
+        modules.value = ast.Dict(
+            keys=[ast.Constant(name) for _, name in names],
+            values=[ast.Constant(module) for module, _ in names],
+        )
+        module.body = lazy.body + rest
+        return module
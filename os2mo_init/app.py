@@ -1,97 +1,573 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from uuid import UUID
 
+import httpx
 import structlog
-from authlib.integrations.httpx_client import AsyncOAuth2Client
-from fastramqpi.app import configure_logging
+import yaml
+from fastramqpi.logging import configure_logging
 
+from os2mo_init import metrics
+from os2mo_init import tracing
+from os2mo_init.auth import TokenManagedOAuth2Client
 from os2mo_init.autogenerated_graphql_client import GraphQLClient
-from os2mo_init.classes import ensure_classes
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.cache import MemorySnapshotCache
+from os2mo_init.cache import SnapshotCache
+from os2mo_init.cache import SnapshotStore
+from os2mo_init.cache import load_cached_snapshot
+from os2mo_init.classes import plan_classes
+from os2mo_init.classes import schedule_classes
 from os2mo_init.config import ConfigFile
+from os2mo_init.config import Mode
 from os2mo_init.config import Settings
 from os2mo_init.config import get_config_file
-from os2mo_init.facets import ensure_facets
-from os2mo_init.it_systems import ensure_it_systems
-from os2mo_init.root_org import ensure_root_organisation
+from os2mo_init.config import get_tenants_file
+from os2mo_init.executor import Executor
+from os2mo_init.facets import plan_facets
+from os2mo_init.facets import schedule_facets
+from os2mo_init.it_systems import plan_it_systems
+from os2mo_init.it_systems import schedule_it_systems
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.json_backend import get_backend
+from os2mo_init.metrics import STAGE_DURATION
+from os2mo_init.metrics import count_operations
+from os2mo_init.metrics import write_metrics
+from os2mo_init.plan import Action
+from os2mo_init.plan import FacetOperation
+from os2mo_init.plan import ITSystemOperation
+from os2mo_init.plan import Plan
+from os2mo_init.root_org import apply_root_organisation
+from os2mo_init.root_org import plan_root_organisation
+from os2mo_init.scheduler import Scheduler
+from os2mo_init.snapshot import Snapshot
+from os2mo_init.snapshot import load_snapshot
+from os2mo_init.state import State
+from os2mo_init.state import advance_watermark
+from os2mo_init.state import changed_since
+from os2mo_init.state import fingerprint
+from os2mo_init.state import latest_registration
+from os2mo_init.state import load_state
+from os2mo_init.state import save_state
+from os2mo_init.state import written_uuids
+from os2mo_init.tracing import record_trace
+from os2mo_init.tracing import span
+from os2mo_init.tracing import traced
+from os2mo_init.watch import diff_config
+from os2mo_init.watch import file_version
+from os2mo_init.watch import watch_file
 
 logger = structlog.stdlib.get_logger()
 
+# Even though facets are objects in the database equal to classes, they are
+# hard-coded everywhere. For this reason, OS2mo-init will *always* create this
+# expected set of facets.
+FACETS = {
+    "address_property",
+    "association_type",
+    "employee_address_type",
+    "engagement_job_function",
+    "engagement_type",
+    "kle_aspect",
+    "kle_number",
+    "leave_type",
+    "manager_address_type",
+    "manager_level",
+    "manager_type",
+    "org_unit_address_type",
+    "org_unit_hierarchy",
+    "org_unit_level",
+    "org_unit_type",
+    "primary_type",
+    "responsibility",
+    "role",
+    "time_planning",
+    "visibility",
+}
+
 # Heavily inspired by
 # https://git.magenta.dk/rammearkitektur/FastRAMQPI/-/blob/77411a70890f49e91444d14d886f263e379c8827/fastramqpi/main.py
 
 
-def create_clients(settings: Settings) -> tuple[AsyncOAuth2Client, GraphQLClient]:
+# Maximum number of reads running concurrently with the mutations, e.g. the root
+# organisation, snapshot and registrations queries when loading a snapshot
+READ_CONCURRENCY = 4
+
+
+def pool_limits(settings: Settings) -> httpx.Limits:
+    """Limits of the connection pool of the MO client.
+
+    Unless configured, the pool is sized such that no request waits for a
+    connection, and all connections are kept alive between mutation batches.
+    """
+    max_connections = settings.max_connections or (
+        settings.concurrency + READ_CONCURRENCY
+    )
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections or max_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+
+
+def create_clients(
+    settings: Settings,
+) -> tuple[TokenManagedOAuth2Client, GraphQLClient]:
     # Authenticated HTTPX Client
-    mo_client = AsyncOAuth2Client(
+    mo_client = TokenManagedOAuth2Client(
         base_url=settings.mo_url,
         client_id=settings.client_id,
         client_secret=settings.client_secret.get_secret_value(),
-        grant_type="client_credentials",
         # TODO: We should take a full token URL instead of hard-coding Keycloak's
         # URL scheme. Let's wait until the legacy clients are removed.
         token_endpoint=f"{settings.auth_server}/realms/{settings.auth_realm}/protocol/openid-connect/token",
-        # TODO (https://github.com/lepture/authlib/issues/531): Hack to enable
-        # automatic fetching of token on first call, instead of only refreshing.
-        token={"expires_at": -1, "access_token": ""},
         timeout=settings.graphql_timeout,
+        http2=settings.http2,
+        limits=pool_limits(settings),
+        event_hooks={
+            "request": [
+                *metrics.EVENT_HOOKS["request"],
+                *tracing.EVENT_HOOKS["request"],
+            ],
+            "response": [
+                *metrics.EVENT_HOOKS["response"],
+                *tracing.EVENT_HOOKS["response"],
+            ],
+        },
     )
     # GraphQL Client
     graphql_version = 20  # grep-compatibility with our other integrations
-    graphql_client = GraphQLClient(
+    graphql_client = FastJSONGraphQLClient(
         url=f"{settings.mo_url}/graphql/v{graphql_version}",
         http_client=mo_client,
+        json_backend=get_backend(settings.json_backend),
     )
     return mo_client, graphql_client
 
 
-async def init(config: ConfigFile, graphql_client: GraphQLClient) -> None:
+def plan(
+    config: ConfigFile, snapshot: Snapshot, uuid_namespace: UUID | None = None
+) -> Plan:
+    """Compute the operations needed to reconcile MO with the config.
+
+    Args:
+        config: Desired state.
+        snapshot: Current state of MO.
+        uuid_namespace: Namespace of deterministic UUIDs for created objects, if any.
+
+    Returns:
+        Plan of the operations needed to reconcile MO with the config.
+    """
     # Root Organisation
+    root_organisation = None
     if config.root_organisation is not None:
         logger.info("Handling root organisation")
-        await ensure_root_organisation(graphql_client, config.root_organisation)
+        root_organisation = plan_root_organisation(
+            snapshot.root_organisation, config.root_organisation
+        )
 
     # IT Systems
-    # NOTE: This MUST come before classes, since they can reference IT-systems
+    it_systems = []
     if config.it_systems is not None:
-        await ensure_it_systems(graphql_client, config.it_systems)
+        it_systems = plan_it_systems(
+            snapshot.it_systems, config.it_systems, uuid_namespace
+        )
 
     # Facets
-    # Even though facets are objects in the database equal to classes, they are
-    # hard-coded everywhere. For this reason, OS2mo-init will *always* create this
-    # expected set of facets.
-    facets = {
-        "address_property",
-        "association_type",
-        "employee_address_type",
-        "engagement_job_function",
-        "engagement_type",
-        "kle_aspect",
-        "kle_number",
-        "leave_type",
-        "manager_address_type",
-        "manager_level",
-        "manager_type",
-        "org_unit_address_type",
-        "org_unit_hierarchy",
-        "org_unit_level",
-        "org_unit_type",
-        "primary_type",
-        "responsibility",
-        "role",
-        "time_planning",
-        "visibility",
-    }
-    await ensure_facets(graphql_client, facets)
+    facets = plan_facets(snapshot.facets, FACETS, uuid_namespace)
 
     # Classes
+    classes = []
     if config.facets is not None:
-        await ensure_classes(graphql_client, config.facets)
+        planned_facets = {o.user_key for o in facets}
+        planned_it_systems = {o.user_key for o in it_systems}
+        classes = plan_classes(
+            snapshot.classes,
+            config.facets,
+            facets=planned_facets | snapshot.facets.keys(),
+            it_systems=planned_it_systems | snapshot.it_systems.keys(),
+            uuid_namespace=uuid_namespace,
+        )
+        # Classes may reference facets and IT systems which exist in MO without
+        # being managed by os2mo-init. They are included as no-ops, such that the
+        # plan can be applied without a snapshot of MO.
+        facets += [
+            FacetOperation(
+                action=Action.NOOP, uuid=snapshot.facets[user_key], user_key=user_key
+            )
+            for user_key in sorted({o.facet for o in classes} - planned_facets)
+        ]
+        it_systems += [
+            ITSystemOperation(
+                action=Action.NOOP,
+                uuid=snapshot.it_systems[user_key].uuid,
+                user_key=user_key,
+                name=snapshot.it_systems[user_key].name,
+            )
+            for user_key in sorted(
+                {o.it_system for o in classes if o.it_system is not None}
+                - planned_it_systems
+            )
+        ]
+
+    return Plan(
+        root_organisation=root_organisation,
+        it_systems=it_systems,
+        facets=facets,
+        classes=classes,
+    )
+
+
+async def apply(
+    plan: Plan,
+    graphql_client: GraphQLClient,
+    batcher: MutationBatcher,
+    snapshot: Snapshot,
+) -> None:
+    """Execute the operations of a plan.
+
+    The plan is applied as-is; it is not checked against the current state of MO.
+
+    Args:
+        plan: Plan to apply.
+        graphql_client: MO GraphQL client.
+        batcher: Batcher executing the mutations.
+        snapshot: Snapshot of MO, which is updated with the applied operations.
+    """
+    # Root Organisation
+    # NOTE: This MUST come before everything else, since nothing can be written
+    # before the root organisation exists
+    if plan.root_organisation is not None:
+        root_org = await apply_root_organisation(graphql_client, plan.root_organisation)
+        if root_org is not None:
+            snapshot.root_organisation = root_org
+
+    # Everything else is scheduled as a dependency graph, such that e.g. the
+    # facets and IT Systems are written concurrently, and the classes of a facet
+    # are written as soon as that particular facet exists.
+    scheduler = Scheduler()
+    schedule_it_systems(scheduler, batcher, plan.it_systems, snapshot.it_systems)
+    schedule_facets(scheduler, batcher, plan.facets, snapshot.facets)
+    schedule_classes(
+        scheduler,
+        batcher,
+        plan.classes,
+        facets=snapshot.facets,
+        it_systems=snapshot.it_systems,
+        classes=snapshot.classes,
+    )
+    await scheduler.run()
+    count_operations(plan)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Measure a stage of a run, both as a metric and a span."""
+    with STAGE_DURATION.labels(name).time(), span(name):
+        yield
+
+
+def snapshot_scope(settings: Settings) -> str:
+    """Fingerprint of what a cached snapshot of MO covers, i.e. the MO instance.
+
+    The classes of the config are not part of it, such that a change to them only
+    reloads the classes, see `load_cached_snapshot`.
+    """
+    return fingerprint(settings.mo_url)
+
+
+async def resolve(config: ConfigFile | Awaitable[ConfigFile]) -> ConfigFile:
+    """Wait for the config, if it is not ready yet."""
+    if isinstance(config, ConfigFile):
+        return config
+    return await config
+
+
+@traced("init")
+async def init(
+    settings: Settings,
+    config: ConfigFile | Awaitable[ConfigFile],
+    graphql_client: GraphQLClient,
+    batcher: MutationBatcher,
+    cache: SnapshotStore | None = None,
+) -> Plan | None:
+    """Reconcile MO with the config.
+
+    Args:
+        settings: Settings.
+        config: Desired state, or an awaitable of it, e.g. while the config file is
+            being parsed. MO is then read concurrently, as far as possible.
+        graphql_client: MO GraphQL client.
+        batcher: Batcher executing the mutations.
+        cache: Snapshot cache. If not given, the one configured by CACHE_DIR, if
+            any, is used.
+
+    Returns:
+        The applied plan, or `None` if the run was skipped since nothing changed.
+    """
+    parsing = asyncio.ensure_future(resolve(config))
+    if settings.mode == Mode.BOOTSTRAP:
+        # Plan against an empty MO, such that everything is created blindly. The
+        # deterministic UUIDs make this idempotent, as creating an object with an
+        # existing UUID overwrites it.
+        if settings.uuid_namespace is None:
+            raise ValueError("UUID_NAMESPACE must be set to bootstrap")
+        snapshot = Snapshot()
+        config = await parsing
+        with stage("plan"):
+            bootstrap_plan = plan(config, snapshot, settings.uuid_namespace)
+        with stage("apply"):
+            await apply(bootstrap_plan, graphql_client, batcher, snapshot)
+        return bootstrap_plan
+
+    if cache is None and settings.cache_dir is not None:
+        cache = SnapshotCache(settings.cache_dir / "snapshot.sqlite")
+    state = None
+    if settings.state_file is not None:
+        state = load_state(settings.state_file)
+
+    # Whether MO changed since the last run, and the snapshot of MO if the run
+    # cannot be skipped, are read while the config is being parsed. The cached
+    # snapshot is keyed by the config, so it has to wait.
+    snapshot_task: asyncio.Task[Snapshot] | None = None
+    try:
+        mo_changed = True
+        if state is not None and state.watermark is not None:
+            with stage("check"):
+                mo_changed = await changed_since(
+                    graphql_client, state.watermark, raw=settings.raw_decoding
+                )
+        if mo_changed and cache is None:
+            snapshot_task = asyncio.create_task(
+                load_snapshot(
+                    graphql_client, parsing, settings.page_size, settings.raw_decoding
+                )
+            )
+        config = await parsing
+    except BaseException:
+        if snapshot_task is not None:
+            snapshot_task.cancel()
+        parsing.cancel()
+        raise
+
+    # Skip the run entirely if neither the config nor MO changed since the last
+    config_fingerprint = fingerprint(
+        settings.mo_url, settings.uuid_namespace, FACETS, config
+    )
+    if state is not None and state.fingerprint == config_fingerprint and not mo_changed:
+        logger.info("Neither config nor MO changed since last run, skipping")
+        return None
+
+    # The watermark is taken before writing anything. Afterwards, it is moved past
+    # our own writes, unless others changed MO in the meantime, such that their
+    # changes are picked up by the next run.
+    watermark = None
+    cache_scope = snapshot_scope(settings)
+    cached = None
+    with stage("snapshot"):
+        if cache is not None:
+            cached = await load_cached_snapshot(
+                graphql_client,
+                config,
+                settings.page_size,
+                cache,
+                cache_scope,
+                raw=settings.raw_decoding,
+            )
+            snapshot, watermark = cached.snapshot, cached.watermark
+        elif settings.state_file is not None:
+            watermark, snapshot = await asyncio.gather(
+                latest_registration(
+                    graphql_client,
+                    settings.page_size,
+                    since=state.watermark if state is not None else None,
+                    raw=settings.raw_decoding,
+                ),
+                snapshot_task
+                or load_snapshot(
+                    graphql_client, config, settings.page_size, settings.raw_decoding
+                ),
+            )
+        else:
+            snapshot = await (
+                snapshot_task
+                or load_snapshot(
+                    graphql_client, config, settings.page_size, settings.raw_decoding
+                )
+            )
+
+    with stage("plan"):
+        init_plan = plan(config, snapshot, settings.uuid_namespace)
+    with stage("apply"):
+        await apply(init_plan, graphql_client, batcher, snapshot)
+    if settings.state_file is None and cache is None:
+        return init_plan
+
+    with stage("save"):
+        watermark = await advance_watermark(
+            graphql_client,
+            settings.page_size,
+            watermark,
+            written_uuids(init_plan, snapshot),
+            raw=settings.raw_decoding,
+        )
+        if settings.state_file is not None:
+            save_state(
+                settings.state_file,
+                State(fingerprint=config_fingerprint, watermark=watermark),
+            )
+        if cache is not None:
+            assert cached is not None
+            cache.save(cache_scope, replace(cached, watermark=watermark))
+    return init_plan
+
+
+async def watch(
+    settings: Settings,
+    config: ConfigFile,
+    graphql_client: GraphQLClient,
+    batcher: MutationBatcher,
+) -> None:
+    """Initialise MO, then keep reconciling changes to the config file.
+
+    Only the entries which changed since the previously applied config are
+    reconciled, so unchanged classes are neither read from nor written to MO. The
+    clients, and thereby the connection pool and token, are kept between runs, as
+    is the snapshot, which is refreshed with only the objects changed in MO since.
+
+    Args:
+        settings: Settings, including the config file to watch.
+        config: Initial config.
+        graphql_client: MO GraphQL client.
+        batcher: Batcher executing the mutations.
+    """
+    version = file_version(settings.config_file)
+    cache = MemorySnapshotCache()
+    scope = snapshot_scope(settings)
+    await init(settings, config, graphql_client, batcher, cache=cache)
+    logger.info("Watching config file", path=settings.config_file)
+    async for _ in watch_file(settings.config_file, settings.watch_interval, version):
+        logger.info("Config file changed", path=settings.config_file)
+        try:
+            new_config = await asyncio.to_thread(
+                get_config_file, settings.config_file, settings.cache_dir
+            )
+        except (OSError, ValueError, yaml.YAMLError):
+            logger.exception("Invalid config file, ignoring change")
+            continue
+        changes = diff_config(config, new_config)
+        if changes is None:
+            logger.info("No relevant changes")
+            config = new_config
+            continue
+        try:
+            cached = await load_cached_snapshot(
+                graphql_client,
+                changes,
+                settings.page_size,
+                cache,
+                scope,
+                raw=settings.raw_decoding,
+            )
+            snapshot = cached.snapshot
+            changes_plan = plan(changes, snapshot, settings.uuid_namespace)
+            await apply(changes_plan, graphql_client, batcher, snapshot)
+            watermark = await advance_watermark(
+                graphql_client,
+                settings.page_size,
+                cached.watermark,
+                written_uuids(changes_plan, snapshot),
+                raw=settings.raw_decoding,
+            )
+            cache.save(scope, replace(cached, watermark=watermark))
+        except Exception:
+            # Keep the previous config, such that the failed changes are retried
+            # along with the next change
+            logger.exception("Failed to apply config changes")
+            continue
+        config = new_config
 
 
 async def main() -> None:
     settings = Settings()
     configure_logging(settings.log_level)
+    if settings.mode in (Mode.SERVICE, Mode.EVENTS):
+        # Imported here, since the service imports this module
+        from os2mo_init.service import serve
+
+        await serve(settings)
+        return
+
+    try:
+        with record_trace(settings.trace_file):
+            await run(settings)
+    finally:
+        if settings.metrics_file is not None:
+            write_metrics(settings.metrics_file)
+
+
+async def run(settings: Settings) -> None:
+    """Run os2mo-init once, or until terminated in watch mode."""
+    if settings.mode == Mode.TENANTS:
+        # Imported here, since the tenants module imports this module
+        from os2mo_init.tenants import reconcile_tenants
+
+        if settings.tenants_file is None:
+            raise ValueError("TENANTS_FILE must be set to reconcile tenants")
+        # Parsed in threads, keeping the event loop free
+        shared_config, tenants = await asyncio.gather(
+            asyncio.to_thread(
+                get_config_file, settings.config_file, settings.cache_dir
+            ),
+            asyncio.to_thread(get_tenants_file, settings.tenants_file),
+        )
+        summary = await reconcile_tenants(settings, shared_config, tenants)
+        print(summary.json(indent=2))
+        if summary.failed:
+            raise RuntimeError(f"Failed to reconcile tenants: {summary.failed}")
+        return
+
     mo_client, graphql_client = create_clients(settings)
-    config = get_config_file(settings.config_file)
+    executor = Executor(concurrency=settings.concurrency)
+    batcher = MutationBatcher(
+        graphql_client, executor, batch_size=settings.mutation_batch_size
+    )
     async with mo_client, graphql_client:
-        await init(config, graphql_client)
+        if settings.mode == Mode.APPLY:
+            if settings.plan_file is None:
+                raise ValueError("PLAN_FILE must be set to apply a plan")
+            await apply(
+                Plan.parse_file(settings.plan_file),
+                graphql_client,
+                batcher,
+                Snapshot(),
+            )
+            return
+
+        # Parsed in a thread, while the initial token is fetched and MO is read
+        config = asyncio.ensure_future(
+            asyncio.to_thread(get_config_file, settings.config_file, settings.cache_dir)
+        )
+        if settings.mode == Mode.PLAN:
+            snapshot = await load_snapshot(
+                graphql_client, config, settings.page_size, settings.raw_decoding
+            )
+            plan_json = plan(await config, snapshot, settings.uuid_namespace).json(
+                indent=2
+            )
+            if settings.plan_file is None:
+                print(plan_json)
+            else:
+                settings.plan_file.write_text(plan_json)
+            return
+
+        if settings.mode == Mode.WATCH:
+            await watch(settings, await config, graphql_client, batcher)
+            return
+
+        await init(settings, config, graphql_client, batcher)
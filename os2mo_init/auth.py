@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from authlib.integrations.httpx_client import AsyncOAuth2Client
+
+logger = structlog.stdlib.get_logger()
+
+# Requests wait for a new token if theirs expires within this many seconds
+LEEWAY = 10
+# Seconds before expiry at which tokens are refreshed in the background, or halfway
+# through their lifetime if that is sooner
+REFRESH_MARGIN = 60
+# Seconds between attempts to refresh the token in the background after a failure,
+# and the least time between refreshes
+RETRY_DELAY = 5
+
+
+class TokenManagedOAuth2Client(AsyncOAuth2Client):
+    """OAuth 2 client credentials client, managing its own access token.
+
+    Requests needing a new token at the same time share a single token request, and
+    the token is refreshed in the background before it expires, such that requests
+    do not wait for it, and do not fail with an expired token. The initial token is
+    fetched as soon as the client is entered, concurrently with whatever the caller
+    does before its first request.
+
+    Args:
+        token_endpoint: URL of the token endpoint of the authorisation server.
+        args: Arguments of `AsyncOAuth2Client`.
+        kwargs: Keyword arguments of `AsyncOAuth2Client`.
+    """
+
+    def __init__(self, *args: Any, token_endpoint: str, **kwargs: Any) -> None:
+        super().__init__(
+            *args,
+            token_endpoint=token_endpoint,
+            grant_type="client_credentials",
+            # TODO (https://github.com/lepture/authlib/issues/531): authlib refuses
+            # to make requests without a token, so start from an expired one.
+            token={"expires_at": -1, "access_token": ""},
+            leeway=LEEWAY,
+            **kwargs,
+        )
+        self.token_endpoint = token_endpoint
+        self._fetch: asyncio.Task[None] | None = None
+        self._refresher: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "TokenManagedOAuth2Client":
+        await super().__aenter__()
+        self.fetch()
+        self._refresher = asyncio.create_task(self._refresh_in_background())
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        for task in (self._refresher, self._fetch):
+            if task is not None:
+                task.cancel()
+        await super().__aexit__(*args)
+
+    def fetch(self) -> asyncio.Task[None]:
+        """Fetch a new token, unless a fetch is already in flight.
+
+        Returns:
+            Task of the fetch, completing when the new token is in use.
+        """
+        if self._fetch is None or self._fetch.done():
+            self._fetch = asyncio.create_task(self._fetch_new_token())
+        return self._fetch
+
+    async def _fetch_new_token(self) -> None:
+        logger.debug("Fetching token")
+        await self.fetch_token(self.token_endpoint, grant_type="client_credentials")
+
+    async def ensure_active_token(self, token: Any) -> None:
+        while self.token.is_expired(leeway=self.leeway):
+            # Shielded, as the fetch is shared with the other waiting requests
+            await asyncio.shield(self.fetch())
+
+    async def _refresh_in_background(self) -> None:
+        while True:
+            try:
+                await asyncio.shield(self.fetch())
+            except Exception:
+                logger.exception("Failed to fetch token, retrying")
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            while True:
+                expires_at = self.token.get("expires_at")
+                if expires_at is None:
+                    # The token never expires
+                    return
+                remaining = expires_at - time.time()
+                # At least the retry delay, such that a token which is already
+                # expired, e.g. due to clock skew, is not refetched in a busy loop
+                await asyncio.sleep(
+                    max(remaining - REFRESH_MARGIN, remaining / 2, RETRY_DELAY)
+                )
+                # Unless a request has fetched a new token in the meantime
+                if self.token.get("expires_at") == expires_at:
+                    break
@@ -1,155 +1,381 @@
 # Generated by ariadne-codegen on 2024-08-13 19:15
 
-from .async_base_client import AsyncBaseClient
-from .base_model import BaseModel
-from .client import GraphQLClient
-from .create_class_mutation import CreateClassMutation
-from .create_class_mutation import CreateClassMutationClassCreate
-from .create_facet_mutation import CreateFacetMutation
-from .create_facet_mutation import CreateFacetMutationFacetCreate
-from .create_i_t_system_mutation import CreateITSystemMutation
-from .create_i_t_system_mutation import CreateITSystemMutationItsystemCreate
-from .enums import AuditLogModel
-from .enums import FileStore
-from .enums import OwnerInferencePriority
-from .exceptions import GraphQLClientError
-from .exceptions import GraphQLClientGraphQLError
-from .exceptions import GraphQLClientGraphQLMultiError
-from .exceptions import GraphQLClientHttpError
-from .exceptions import GraphQlClientInvalidResponseError
-from .facets_query import FacetsQuery
-from .facets_query import FacetsQueryFacets
-from .facets_query import FacetsQueryFacetsObjects
-from .facets_query import FacetsQueryFacetsObjectsCurrent
-from .get_class import GetClass
-from .get_class import GetClassClasses
-from .get_class import GetClassClassesObjects
-from .get_class import GetClassClassesObjectsCurrent
-from .get_class import GetClassClassesObjectsCurrentFacet
-from .get_class import GetClassClassesObjectsCurrentItSystem
-from .i_t_systems_query import ITSystemsQuery
-from .i_t_systems_query import ITSystemsQueryItsystems
-from .i_t_systems_query import ITSystemsQueryItsystemsObjects
-from .i_t_systems_query import ITSystemsQueryItsystemsObjectsCurrent
-from .input_types import AddressCreateInput
-from .input_types import AddressFilter
-from .input_types import AddressRegistrationFilter
-from .input_types import AddressTerminateInput
-from .input_types import AddressUpdateInput
-from .input_types import AssociationCreateInput
-from .input_types import AssociationFilter
-from .input_types import AssociationRegistrationFilter
-from .input_types import AssociationTerminateInput
-from .input_types import AssociationUpdateInput
-from .input_types import AuditLogFilter
-from .input_types import ClassCreateInput
-from .input_types import ClassFilter
-from .input_types import ClassRegistrationFilter
-from .input_types import ClassTerminateInput
-from .input_types import ClassUpdateInput
-from .input_types import ConfigurationFilter
-from .input_types import EmployeeCreateInput
-from .input_types import EmployeeFilter
-from .input_types import EmployeeRegistrationFilter
-from .input_types import EmployeesBoundAddressFilter
-from .input_types import EmployeesBoundAssociationFilter
-from .input_types import EmployeesBoundEngagementFilter
-from .input_types import EmployeesBoundITUserFilter
-from .input_types import EmployeesBoundLeaveFilter
-from .input_types import EmployeesBoundManagerFilter
-from .input_types import EmployeeTerminateInput
-from .input_types import EmployeeUpdateInput
-from .input_types import EngagementCreateInput
-from .input_types import EngagementFilter
-from .input_types import EngagementRegistrationFilter
-from .input_types import EngagementTerminateInput
-from .input_types import EngagementUpdateInput
-from .input_types import FacetCreateInput
-from .input_types import FacetFilter
-from .input_types import FacetRegistrationFilter
-from .input_types import FacetsBoundClassFilter
-from .input_types import FacetTerminateInput
-from .input_types import FacetUpdateInput
-from .input_types import FileFilter
-from .input_types import HealthFilter
-from .input_types import ITAssociationCreateInput
-from .input_types import ITAssociationTerminateInput
-from .input_types import ITAssociationUpdateInput
-from .input_types import ITSystemCreateInput
-from .input_types import ITSystemFilter
-from .input_types import ITSystemRegistrationFilter
-from .input_types import ITSystemTerminateInput
-from .input_types import ITSystemUpdateInput
-from .input_types import ItuserBoundAddressFilter
-from .input_types import ItuserBoundRoleBindingFilter
-from .input_types import ITUserCreateInput
-from .input_types import ITUserFilter
-from .input_types import ITUserRegistrationFilter
-from .input_types import ITUserTerminateInput
-from .input_types import ITUserUpdateInput
-from .input_types import KLECreateInput
-from .input_types import KLEFilter
-from .input_types import KLERegistrationFilter
-from .input_types import KLETerminateInput
-from .input_types import KLEUpdateInput
-from .input_types import LeaveCreateInput
-from .input_types import LeaveFilter
-from .input_types import LeaveRegistrationFilter
-from .input_types import LeaveTerminateInput
-from .input_types import LeaveUpdateInput
-from .input_types import ManagerCreateInput
-from .input_types import ManagerFilter
-from .input_types import ManagerRegistrationFilter
-from .input_types import ManagerTerminateInput
-from .input_types import ManagerUpdateInput
-from .input_types import ModelsUuidsBoundRegistrationFilter
-from .input_types import OrganisationCreate
-from .input_types import OrganisationUnitCreateInput
-from .input_types import OrganisationUnitFilter
-from .input_types import OrganisationUnitRegistrationFilter
-from .input_types import OrganisationUnitTerminateInput
-from .input_types import OrganisationUnitUpdateInput
-from .input_types import OrgUnitsboundaddressfilter
-from .input_types import OrgUnitsboundassociationfilter
-from .input_types import OrgUnitsboundengagementfilter
-from .input_types import OrgUnitsboundituserfilter
-from .input_types import OrgUnitsboundklefilter
-from .input_types import OrgUnitsboundleavefilter
-from .input_types import OrgUnitsboundrelatedunitfilter
-from .input_types import OwnerCreateInput
-from .input_types import OwnerFilter
-from .input_types import OwnerTerminateInput
-from .input_types import OwnerUpdateInput
-from .input_types import ParentsBoundClassFilter
-from .input_types import ParentsBoundFacetFilter
-from .input_types import ParentsBoundOrganisationUnitFilter
-from .input_types import RAOpenValidityInput
-from .input_types import RAValidityInput
-from .input_types import RegistrationFilter
-from .input_types import RelatedUnitFilter
-from .input_types import RelatedUnitsUpdateInput
-from .input_types import RoleBindingCreateInput
-from .input_types import RoleBindingFilter
-from .input_types import RoleBindingTerminateInput
-from .input_types import RoleBindingUpdateInput
-from .input_types import RoleRegistrationFilter
-from .input_types import UuidsBoundClassFilter
-from .input_types import UuidsBoundEmployeeFilter
-from .input_types import UuidsBoundEngagementFilter
-from .input_types import UuidsBoundFacetFilter
-from .input_types import UuidsBoundITSystemFilter
-from .input_types import UuidsBoundITUserFilter
-from .input_types import UuidsBoundLeaveFilter
-from .input_types import UuidsBoundOrganisationUnitFilter
-from .input_types import ValidityInput
-from .root_org_create import RootOrgCreate
-from .root_org_create import RootOrgCreateOrgCreate
-from .root_org_query import RootOrgQuery
-from .root_org_query import RootOrgQueryOrg
-from .update_class_mutation import UpdateClassMutation
-from .update_class_mutation import UpdateClassMutationClassUpdate
-from .update_i_t_system_mutation import UpdateITSystemMutation
-from .update_i_t_system_mutation import UpdateITSystemMutationItsystemUpdate
+from importlib import import_module
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from .async_base_client import AsyncBaseClient
+    from .base_model import BaseModel
+    from .classes_query import ClassesQuery
+    from .classes_query import ClassesQueryClasses
+    from .classes_query import ClassesQueryClassesObjects
+    from .classes_query import ClassesQueryClassesObjectsCurrent
+    from .classes_query import ClassesQueryClassesPageInfo
+    from .client import GraphQLClient
+    from .create_class_mutation import CreateClassMutation
+    from .create_class_mutation import CreateClassMutationClassCreate
+    from .create_facet_mutation import CreateFacetMutation
+    from .create_facet_mutation import CreateFacetMutationFacetCreate
+    from .create_i_t_system_mutation import CreateITSystemMutation
+    from .create_i_t_system_mutation import CreateITSystemMutationItsystemCreate
+    from .enums import AuditLogModel
+    from .enums import FileStore
+    from .enums import OwnerInferencePriority
+    from .exceptions import GraphQLClientError
+    from .exceptions import GraphQLClientGraphQLError
+    from .exceptions import GraphQLClientGraphQLMultiError
+    from .exceptions import GraphQLClientHttpError
+    from .exceptions import GraphQlClientInvalidResponseError
+    from .facets_query import FacetsQuery
+    from .facets_query import FacetsQueryFacets
+    from .facets_query import FacetsQueryFacetsObjects
+    from .facets_query import FacetsQueryFacetsObjectsCurrent
+    from .facets_query import FacetsQueryFacetsPageInfo
+    from .fragments import ClassFields
+    from .fragments import ClassFieldsFacet
+    from .fragments import ClassFieldsItSystem
+    from .fragments import FacetFields
+    from .fragments import ITSystemFields
+    from .get_class import GetClass
+    from .get_class import GetClassClasses
+    from .get_class import GetClassClassesObjects
+    from .get_class import GetClassClassesObjectsCurrent
+    from .get_class import GetClassClassesObjectsCurrentFacet
+    from .get_class import GetClassClassesObjectsCurrentItSystem
+    from .i_t_systems_query import ITSystemsQuery
+    from .i_t_systems_query import ITSystemsQueryItsystems
+    from .i_t_systems_query import ITSystemsQueryItsystemsObjects
+    from .i_t_systems_query import ITSystemsQueryItsystemsObjectsCurrent
+    from .i_t_systems_query import ITSystemsQueryItsystemsPageInfo
+    from .input_types import AddressCreateInput
+    from .input_types import AddressFilter
+    from .input_types import AddressRegistrationFilter
+    from .input_types import AddressTerminateInput
+    from .input_types import AddressUpdateInput
+    from .input_types import AssociationCreateInput
+    from .input_types import AssociationFilter
+    from .input_types import AssociationRegistrationFilter
+    from .input_types import AssociationTerminateInput
+    from .input_types import AssociationUpdateInput
+    from .input_types import AuditLogFilter
+    from .input_types import ClassCreateInput
+    from .input_types import ClassFilter
+    from .input_types import ClassRegistrationFilter
+    from .input_types import ClassTerminateInput
+    from .input_types import ClassUpdateInput
+    from .input_types import ConfigurationFilter
+    from .input_types import EmployeeCreateInput
+    from .input_types import EmployeeFilter
+    from .input_types import EmployeeRegistrationFilter
+    from .input_types import EmployeesBoundAddressFilter
+    from .input_types import EmployeesBoundAssociationFilter
+    from .input_types import EmployeesBoundEngagementFilter
+    from .input_types import EmployeesBoundITUserFilter
+    from .input_types import EmployeesBoundLeaveFilter
+    from .input_types import EmployeesBoundManagerFilter
+    from .input_types import EmployeeTerminateInput
+    from .input_types import EmployeeUpdateInput
+    from .input_types import EngagementCreateInput
+    from .input_types import EngagementFilter
+    from .input_types import EngagementRegistrationFilter
+    from .input_types import EngagementTerminateInput
+    from .input_types import EngagementUpdateInput
+    from .input_types import FacetCreateInput
+    from .input_types import FacetFilter
+    from .input_types import FacetRegistrationFilter
+    from .input_types import FacetsBoundClassFilter
+    from .input_types import FacetTerminateInput
+    from .input_types import FacetUpdateInput
+    from .input_types import FileFilter
+    from .input_types import HealthFilter
+    from .input_types import ITAssociationCreateInput
+    from .input_types import ITAssociationTerminateInput
+    from .input_types import ITAssociationUpdateInput
+    from .input_types import ITSystemCreateInput
+    from .input_types import ITSystemFilter
+    from .input_types import ITSystemRegistrationFilter
+    from .input_types import ITSystemTerminateInput
+    from .input_types import ITSystemUpdateInput
+    from .input_types import ItuserBoundAddressFilter
+    from .input_types import ItuserBoundRoleBindingFilter
+    from .input_types import ITUserCreateInput
+    from .input_types import ITUserFilter
+    from .input_types import ITUserRegistrationFilter
+    from .input_types import ITUserTerminateInput
+    from .input_types import ITUserUpdateInput
+    from .input_types import KLECreateInput
+    from .input_types import KLEFilter
+    from .input_types import KLERegistrationFilter
+    from .input_types import KLETerminateInput
+    from .input_types import KLEUpdateInput
+    from .input_types import LeaveCreateInput
+    from .input_types import LeaveFilter
+    from .input_types import LeaveRegistrationFilter
+    from .input_types import LeaveTerminateInput
+    from .input_types import LeaveUpdateInput
+    from .input_types import ManagerCreateInput
+    from .input_types import ManagerFilter
+    from .input_types import ManagerRegistrationFilter
+    from .input_types import ManagerTerminateInput
+    from .input_types import ManagerUpdateInput
+    from .input_types import ModelsUuidsBoundRegistrationFilter
+    from .input_types import OrganisationCreate
+    from .input_types import OrganisationUnitCreateInput
+    from .input_types import OrganisationUnitFilter
+    from .input_types import OrganisationUnitRegistrationFilter
+    from .input_types import OrganisationUnitTerminateInput
+    from .input_types import OrganisationUnitUpdateInput
+    from .input_types import OrgUnitsboundaddressfilter
+    from .input_types import OrgUnitsboundassociationfilter
+    from .input_types import OrgUnitsboundengagementfilter
+    from .input_types import OrgUnitsboundituserfilter
+    from .input_types import OrgUnitsboundklefilter
+    from .input_types import OrgUnitsboundleavefilter
+    from .input_types import OrgUnitsboundrelatedunitfilter
+    from .input_types import OwnerCreateInput
+    from .input_types import OwnerFilter
+    from .input_types import OwnerTerminateInput
+    from .input_types import OwnerUpdateInput
+    from .input_types import ParentsBoundClassFilter
+    from .input_types import ParentsBoundFacetFilter
+    from .input_types import ParentsBoundOrganisationUnitFilter
+    from .input_types import RAOpenValidityInput
+    from .input_types import RAValidityInput
+    from .input_types import RegistrationFilter
+    from .input_types import RelatedUnitFilter
+    from .input_types import RelatedUnitsUpdateInput
+    from .input_types import RoleBindingCreateInput
+    from .input_types import RoleBindingFilter
+    from .input_types import RoleBindingTerminateInput
+    from .input_types import RoleBindingUpdateInput
+    from .input_types import RoleRegistrationFilter
+    from .input_types import UuidsBoundClassFilter
+    from .input_types import UuidsBoundEmployeeFilter
+    from .input_types import UuidsBoundEngagementFilter
+    from .input_types import UuidsBoundFacetFilter
+    from .input_types import UuidsBoundITSystemFilter
+    from .input_types import UuidsBoundITUserFilter
+    from .input_types import UuidsBoundLeaveFilter
+    from .input_types import UuidsBoundOrganisationUnitFilter
+    from .input_types import ValidityInput
+    from .registrations_query import RegistrationsQuery
+    from .registrations_query import RegistrationsQueryRegistrations
+    from .registrations_query import RegistrationsQueryRegistrationsObjects
+    from .registrations_query import RegistrationsQueryRegistrationsPageInfo
+    from .root_org_create import RootOrgCreate
+    from .root_org_create import RootOrgCreateOrgCreate
+    from .root_org_query import RootOrgQuery
+    from .root_org_query import RootOrgQueryOrg
+    from .snapshot_query import SnapshotQuery
+    from .snapshot_query import SnapshotQueryClasses
+    from .snapshot_query import SnapshotQueryClassesObjects
+    from .snapshot_query import SnapshotQueryClassesObjectsCurrent
+    from .snapshot_query import SnapshotQueryClassesPageInfo
+    from .snapshot_query import SnapshotQueryFacets
+    from .snapshot_query import SnapshotQueryFacetsObjects
+    from .snapshot_query import SnapshotQueryFacetsObjectsCurrent
+    from .snapshot_query import SnapshotQueryFacetsPageInfo
+    from .snapshot_query import SnapshotQueryItsystems
+    from .snapshot_query import SnapshotQueryItsystemsObjects
+    from .snapshot_query import SnapshotQueryItsystemsObjectsCurrent
+    from .snapshot_query import SnapshotQueryItsystemsPageInfo
+    from .update_class_mutation import UpdateClassMutation
+    from .update_class_mutation import UpdateClassMutationClassUpdate
+    from .update_i_t_system_mutation import UpdateITSystemMutation
+    from .update_i_t_system_mutation import UpdateITSystemMutationItsystemUpdate
+_MODULES = {
+    "AsyncBaseClient": "async_base_client",
+    "BaseModel": "base_model",
+    "ClassesQuery": "classes_query",
+    "ClassesQueryClasses": "classes_query",
+    "ClassesQueryClassesObjects": "classes_query",
+    "ClassesQueryClassesObjectsCurrent": "classes_query",
+    "ClassesQueryClassesPageInfo": "classes_query",
+    "GraphQLClient": "client",
+    "CreateClassMutation": "create_class_mutation",
+    "CreateClassMutationClassCreate": "create_class_mutation",
+    "CreateFacetMutation": "create_facet_mutation",
+    "CreateFacetMutationFacetCreate": "create_facet_mutation",
+    "CreateITSystemMutation": "create_i_t_system_mutation",
+    "CreateITSystemMutationItsystemCreate": "create_i_t_system_mutation",
+    "AuditLogModel": "enums",
+    "FileStore": "enums",
+    "OwnerInferencePriority": "enums",
+    "GraphQLClientError": "exceptions",
+    "GraphQLClientGraphQLError": "exceptions",
+    "GraphQLClientGraphQLMultiError": "exceptions",
+    "GraphQLClientHttpError": "exceptions",
+    "GraphQlClientInvalidResponseError": "exceptions",
+    "FacetsQuery": "facets_query",
+    "FacetsQueryFacets": "facets_query",
+    "FacetsQueryFacetsObjects": "facets_query",
+    "FacetsQueryFacetsObjectsCurrent": "facets_query",
+    "FacetsQueryFacetsPageInfo": "facets_query",
+    "ClassFields": "fragments",
+    "ClassFieldsFacet": "fragments",
+    "ClassFieldsItSystem": "fragments",
+    "FacetFields": "fragments",
+    "ITSystemFields": "fragments",
+    "GetClass": "get_class",
+    "GetClassClasses": "get_class",
+    "GetClassClassesObjects": "get_class",
+    "GetClassClassesObjectsCurrent": "get_class",
+    "GetClassClassesObjectsCurrentFacet": "get_class",
+    "GetClassClassesObjectsCurrentItSystem": "get_class",
+    "ITSystemsQuery": "i_t_systems_query",
+    "ITSystemsQueryItsystems": "i_t_systems_query",
+    "ITSystemsQueryItsystemsObjects": "i_t_systems_query",
+    "ITSystemsQueryItsystemsObjectsCurrent": "i_t_systems_query",
+    "ITSystemsQueryItsystemsPageInfo": "i_t_systems_query",
+    "AddressCreateInput": "input_types",
+    "AddressFilter": "input_types",
+    "AddressRegistrationFilter": "input_types",
+    "AddressTerminateInput": "input_types",
+    "AddressUpdateInput": "input_types",
+    "AssociationCreateInput": "input_types",
+    "AssociationFilter": "input_types",
+    "AssociationRegistrationFilter": "input_types",
+    "AssociationTerminateInput": "input_types",
+    "AssociationUpdateInput": "input_types",
+    "AuditLogFilter": "input_types",
+    "ClassCreateInput": "input_types",
+    "ClassFilter": "input_types",
+    "ClassRegistrationFilter": "input_types",
+    "ClassTerminateInput": "input_types",
+    "ClassUpdateInput": "input_types",
+    "ConfigurationFilter": "input_types",
+    "EmployeeCreateInput": "input_types",
+    "EmployeeFilter": "input_types",
+    "EmployeeRegistrationFilter": "input_types",
+    "EmployeeTerminateInput": "input_types",
+    "EmployeeUpdateInput": "input_types",
+    "EmployeesBoundAddressFilter": "input_types",
+    "EmployeesBoundAssociationFilter": "input_types",
+    "EmployeesBoundEngagementFilter": "input_types",
+    "EmployeesBoundITUserFilter": "input_types",
+    "EmployeesBoundLeaveFilter": "input_types",
+    "EmployeesBoundManagerFilter": "input_types",
+    "EngagementCreateInput": "input_types",
+    "EngagementFilter": "input_types",
+    "EngagementRegistrationFilter": "input_types",
+    "EngagementTerminateInput": "input_types",
+    "EngagementUpdateInput": "input_types",
+    "FacetCreateInput": "input_types",
+    "FacetFilter": "input_types",
+    "FacetRegistrationFilter": "input_types",
+    "FacetTerminateInput": "input_types",
+    "FacetUpdateInput": "input_types",
+    "FacetsBoundClassFilter": "input_types",
+    "FileFilter": "input_types",
+    "HealthFilter": "input_types",
+    "ITAssociationCreateInput": "input_types",
+    "ITAssociationTerminateInput": "input_types",
+    "ITAssociationUpdateInput": "input_types",
+    "ITSystemCreateInput": "input_types",
+    "ITSystemFilter": "input_types",
+    "ITSystemRegistrationFilter": "input_types",
+    "ITSystemTerminateInput": "input_types",
+    "ITSystemUpdateInput": "input_types",
+    "ITUserCreateInput": "input_types",
+    "ITUserFilter": "input_types",
+    "ITUserRegistrationFilter": "input_types",
+    "ITUserTerminateInput": "input_types",
+    "ITUserUpdateInput": "input_types",
+    "ItuserBoundAddressFilter": "input_types",
+    "ItuserBoundRoleBindingFilter": "input_types",
+    "KLECreateInput": "input_types",
+    "KLEFilter": "input_types",
+    "KLERegistrationFilter": "input_types",
+    "KLETerminateInput": "input_types",
+    "KLEUpdateInput": "input_types",
+    "LeaveCreateInput": "input_types",
+    "LeaveFilter": "input_types",
+    "LeaveRegistrationFilter": "input_types",
+    "LeaveTerminateInput": "input_types",
+    "LeaveUpdateInput": "input_types",
+    "ManagerCreateInput": "input_types",
+    "ManagerFilter": "input_types",
+    "ManagerRegistrationFilter": "input_types",
+    "ManagerTerminateInput": "input_types",
+    "ManagerUpdateInput": "input_types",
+    "ModelsUuidsBoundRegistrationFilter": "input_types",
+    "OrgUnitsboundaddressfilter": "input_types",
+    "OrgUnitsboundassociationfilter": "input_types",
+    "OrgUnitsboundengagementfilter": "input_types",
+    "OrgUnitsboundituserfilter": "input_types",
+    "OrgUnitsboundklefilter": "input_types",
+    "OrgUnitsboundleavefilter": "input_types",
+    "OrgUnitsboundrelatedunitfilter": "input_types",
+    "OrganisationCreate": "input_types",
+    "OrganisationUnitCreateInput": "input_types",
+    "OrganisationUnitFilter": "input_types",
+    "OrganisationUnitRegistrationFilter": "input_types",
+    "OrganisationUnitTerminateInput": "input_types",
+    "OrganisationUnitUpdateInput": "input_types",
+    "OwnerCreateInput": "input_types",
+    "OwnerFilter": "input_types",
+    "OwnerTerminateInput": "input_types",
+    "OwnerUpdateInput": "input_types",
+    "ParentsBoundClassFilter": "input_types",
+    "ParentsBoundFacetFilter": "input_types",
+    "ParentsBoundOrganisationUnitFilter": "input_types",
+    "RAOpenValidityInput": "input_types",
+    "RAValidityInput": "input_types",
+    "RegistrationFilter": "input_types",
+    "RelatedUnitFilter": "input_types",
+    "RelatedUnitsUpdateInput": "input_types",
+    "RoleBindingCreateInput": "input_types",
+    "RoleBindingFilter": "input_types",
+    "RoleBindingTerminateInput": "input_types",
+    "RoleBindingUpdateInput": "input_types",
+    "RoleRegistrationFilter": "input_types",
+    "UuidsBoundClassFilter": "input_types",
+    "UuidsBoundEmployeeFilter": "input_types",
+    "UuidsBoundEngagementFilter": "input_types",
+    "UuidsBoundFacetFilter": "input_types",
+    "UuidsBoundITSystemFilter": "input_types",
+    "UuidsBoundITUserFilter": "input_types",
+    "UuidsBoundLeaveFilter": "input_types",
+    "UuidsBoundOrganisationUnitFilter": "input_types",
+    "ValidityInput": "input_types",
+    "RegistrationsQuery": "registrations_query",
+    "RegistrationsQueryRegistrations": "registrations_query",
+    "RegistrationsQueryRegistrationsObjects": "registrations_query",
+    "RegistrationsQueryRegistrationsPageInfo": "registrations_query",
+    "RootOrgCreate": "root_org_create",
+    "RootOrgCreateOrgCreate": "root_org_create",
+    "RootOrgQuery": "root_org_query",
+    "RootOrgQueryOrg": "root_org_query",
+    "SnapshotQuery": "snapshot_query",
+    "SnapshotQueryClasses": "snapshot_query",
+    "SnapshotQueryClassesObjects": "snapshot_query",
+    "SnapshotQueryClassesObjectsCurrent": "snapshot_query",
+    "SnapshotQueryClassesPageInfo": "snapshot_query",
+    "SnapshotQueryFacets": "snapshot_query",
+    "SnapshotQueryFacetsObjects": "snapshot_query",
+    "SnapshotQueryFacetsObjectsCurrent": "snapshot_query",
+    "SnapshotQueryFacetsPageInfo": "snapshot_query",
+    "SnapshotQueryItsystems": "snapshot_query",
+    "SnapshotQueryItsystemsObjects": "snapshot_query",
+    "SnapshotQueryItsystemsObjectsCurrent": "snapshot_query",
+    "SnapshotQueryItsystemsPageInfo": "snapshot_query",
+    "UpdateClassMutation": "update_class_mutation",
+    "UpdateClassMutationClassUpdate": "update_class_mutation",
+    "UpdateITSystemMutation": "update_i_t_system_mutation",
+    "UpdateITSystemMutationItsystemUpdate": "update_i_t_system_mutation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AddressCreateInput",
@@ -167,10 +393,18 @@ __all__ = [
     "AuditLogModel",
     "BaseModel",
     "ClassCreateInput",
+    "ClassFields",
+    "ClassFieldsFacet",
+    "ClassFieldsItSystem",
     "ClassFilter",
     "ClassRegistrationFilter",
     "ClassTerminateInput",
     "ClassUpdateInput",
+    "ClassesQuery",
+    "ClassesQueryClasses",
+    "ClassesQueryClassesObjects",
+    "ClassesQueryClassesObjectsCurrent",
+    "ClassesQueryClassesPageInfo",
     "ConfigurationFilter",
     "CreateClassMutation",
     "CreateClassMutationClassCreate",
@@ -195,6 +429,7 @@ __all__ = [
     "EngagementTerminateInput",
     "EngagementUpdateInput",
     "FacetCreateInput",
+    "FacetFields",
     "FacetFilter",
     "FacetRegistrationFilter",
     "FacetTerminateInput",
@@ -204,6 +439,7 @@ __all__ = [
     "FacetsQueryFacets",
     "FacetsQueryFacetsObjects",
     "FacetsQueryFacetsObjectsCurrent",
+    "FacetsQueryFacetsPageInfo",
     "FileFilter",
     "FileStore",
     "GetClass",
@@ -223,6 +459,7 @@ __all__ = [
     "ITAssociationTerminateInput",
     "ITAssociationUpdateInput",
     "ITSystemCreateInput",
+    "ITSystemFields",
     "ITSystemFilter",
     "ITSystemRegistrationFilter",
     "ITSystemTerminateInput",
@@ -231,6 +468,7 @@ __all__ = [
     "ITSystemsQueryItsystems",
     "ITSystemsQueryItsystemsObjects",
     "ITSystemsQueryItsystemsObjectsCurrent",
+    "ITSystemsQueryItsystemsPageInfo",
     "ITUserCreateInput",
     "ITUserFilter",
     "ITUserRegistrationFilter",
@@ -278,6 +516,10 @@ __all__ = [
     "RAOpenValidityInput",
     "RAValidityInput",
     "RegistrationFilter",
+    "RegistrationsQuery",
+    "RegistrationsQueryRegistrations",
+    "RegistrationsQueryRegistrationsObjects",
+    "RegistrationsQueryRegistrationsPageInfo",
     "RelatedUnitFilter",
     "RelatedUnitsUpdateInput",
     "RoleBindingCreateInput",
@@ -289,6 +531,19 @@ __all__ = [
     "RootOrgCreateOrgCreate",
     "RootOrgQuery",
     "RootOrgQueryOrg",
+    "SnapshotQuery",
+    "SnapshotQueryClasses",
+    "SnapshotQueryClassesObjects",
+    "SnapshotQueryClassesObjectsCurrent",
+    "SnapshotQueryClassesPageInfo",
+    "SnapshotQueryFacets",
+    "SnapshotQueryFacetsObjects",
+    "SnapshotQueryFacetsObjectsCurrent",
+    "SnapshotQueryFacetsPageInfo",
+    "SnapshotQueryItsystems",
+    "SnapshotQueryItsystemsObjects",
+    "SnapshotQueryItsystemsObjectsCurrent",
+    "SnapshotQueryItsystemsPageInfo",
     "UpdateClassMutation",
     "UpdateClassMutationClassUpdate",
     "UpdateITSystemMutation",
@@ -0,0 +1,36 @@
+# Generated by ariadne-codegen on 2024-08-13 19:15
+# Source: queries.graphql
+
+from typing import List
+from typing import Optional
+
+from .base_model import BaseModel
+from .fragments import ClassFields
+
+
+class ClassesQuery(BaseModel):
+    classes: "ClassesQueryClasses"
+
+
+class ClassesQueryClasses(BaseModel):
+    objects: List["ClassesQueryClassesObjects"]
+    page_info: "ClassesQueryClassesPageInfo"
+
+
+class ClassesQueryClassesObjects(BaseModel):
+    current: Optional["ClassesQueryClassesObjectsCurrent"]
+
+
+class ClassesQueryClassesObjectsCurrent(ClassFields):
+    pass
+
+
+class ClassesQueryClassesPageInfo(BaseModel):
+    next_cursor: Optional[str]
+
+
+ClassesQuery.update_forward_refs()
+ClassesQueryClasses.update_forward_refs()
+ClassesQueryClassesObjects.update_forward_refs()
+ClassesQueryClassesObjectsCurrent.update_forward_refs()
+ClassesQueryClassesPageInfo.update_forward_refs()
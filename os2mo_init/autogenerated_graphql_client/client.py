@@ -1,6 +1,8 @@
 # Generated by ariadne-codegen on 2024-08-13 19:15
 # Source: queries.graphql
 
+from datetime import datetime
+from typing import List
 from typing import Optional
 from typing import Union
 from uuid import UUID
@@ -8,6 +10,8 @@ from uuid import UUID
 from .async_base_client import AsyncBaseClient
 from .base_model import UNSET
 from .base_model import UnsetType
+from .classes_query import ClassesQuery
+from .classes_query import ClassesQueryClasses
 from .create_class_mutation import CreateClassMutation
 from .create_class_mutation import CreateClassMutationClassCreate
 from .create_facet_mutation import CreateFacetMutation
@@ -20,10 +24,13 @@ from .get_class import GetClass
 from .get_class import GetClassClasses
 from .i_t_systems_query import ITSystemsQuery
 from .i_t_systems_query import ITSystemsQueryItsystems
+from .registrations_query import RegistrationsQuery
+from .registrations_query import RegistrationsQueryRegistrations
 from .root_org_create import RootOrgCreate
 from .root_org_create import RootOrgCreateOrgCreate
 from .root_org_query import RootOrgQuery
 from .root_org_query import RootOrgQueryOrg
+from .snapshot_query import SnapshotQuery
 from .update_class_mutation import UpdateClassMutation
 from .update_class_mutation import UpdateClassMutationClassUpdate
 from .update_i_t_system_mutation import UpdateITSystemMutation
@@ -35,22 +42,38 @@ def gql(q: str) -> str:
 
 
 class GraphQLClient(AsyncBaseClient):
-    async def facets_query(self) -> FacetsQueryFacets:
+    async def facets_query(
+        self,
+        uuids: Union[Optional[List[UUID]], UnsetType] = UNSET,
+        limit: Union[Optional[int], UnsetType] = UNSET,
+        cursor: Union[Optional[str], UnsetType] = UNSET,
+    ) -> FacetsQueryFacets:
         query = gql(
             """
-            query FacetsQuery {
-              facets {
+            query FacetsQuery($uuids: [UUID!], $limit: int, $cursor: Cursor) {
+              facets(filter: {uuids: $uuids}, limit: $limit, cursor: $cursor) {
                 objects {
                   current {
-                    uuid
-                    user_key
+                    ...FacetFields
                   }
                 }
+                page_info {
+                  next_cursor
+                }
               }
             }
+
+            fragment FacetFields on Facet {
+              uuid
+              user_key
+            }
             """
         )
-        variables: dict[str, object] = {}
+        variables: dict[str, object] = {
+            "uuids": uuids,
+            "limit": limit,
+            "cursor": cursor,
+        }
         response = await self.execute(query=query, variables=variables)
         data = self.get_data(response)
         return FacetsQuery.parse_obj(data).facets
@@ -134,23 +157,39 @@ class GraphQLClient(AsyncBaseClient):
         data = self.get_data(response)
         return UpdateClassMutation.parse_obj(data).class_update
 
-    async def i_t_systems_query(self) -> ITSystemsQueryItsystems:
+    async def i_t_systems_query(
+        self,
+        uuids: Union[Optional[List[UUID]], UnsetType] = UNSET,
+        limit: Union[Optional[int], UnsetType] = UNSET,
+        cursor: Union[Optional[str], UnsetType] = UNSET,
+    ) -> ITSystemsQueryItsystems:
         query = gql(
             """
-            query ITSystemsQuery {
-              itsystems {
+            query ITSystemsQuery($uuids: [UUID!], $limit: int, $cursor: Cursor) {
+              itsystems(filter: {uuids: $uuids}, limit: $limit, cursor: $cursor) {
                 objects {
                   current {
-                    uuid
-                    user_key
-                    name
+                    ...ITSystemFields
                   }
                 }
+                page_info {
+                  next_cursor
+                }
               }
             }
+
+            fragment ITSystemFields on ITSystem {
+              uuid
+              user_key
+              name
+            }
             """
         )
-        variables: dict[str, object] = {}
+        variables: dict[str, object] = {
+            "uuids": uuids,
+            "limit": limit,
+            "cursor": cursor,
+        }
         response = await self.execute(query=query, variables=variables)
         data = self.get_data(response)
         return ITSystemsQuery.parse_obj(data).itsystems
@@ -265,3 +304,174 @@ class GraphQLClient(AsyncBaseClient):
         response = await self.execute(query=query, variables=variables)
         data = self.get_data(response)
         return GetClass.parse_obj(data).classes
+
+    async def classes_query(
+        self,
+        facet_user_keys: List[str],
+        class_user_keys: List[str],
+        uuids: Union[Optional[List[UUID]], UnsetType] = UNSET,
+        limit: Union[Optional[int], UnsetType] = UNSET,
+        cursor: Union[Optional[str], UnsetType] = UNSET,
+    ) -> ClassesQueryClasses:
+        query = gql(
+            """
+            query ClassesQuery($facet_user_keys: [String!]!, $class_user_keys: [String!]!, $uuids: [UUID!], $limit: int, $cursor: Cursor) {
+              classes(
+                filter: {uuids: $uuids, user_keys: $class_user_keys, from_date: null, to_date: null, facet: {user_keys: $facet_user_keys}}
+                limit: $limit
+                cursor: $cursor
+              ) {
+                objects {
+                  current {
+                    ...ClassFields
+                  }
+                }
+                page_info {
+                  next_cursor
+                }
+              }
+            }
+
+            fragment ClassFields on Class {
+              facet {
+                user_key
+              }
+              uuid
+              user_key
+              name
+              scope
+              it_system {
+                uuid
+                user_key
+              }
+            }
+            """
+        )
+        variables: dict[str, object] = {
+            "facet_user_keys": facet_user_keys,
+            "class_user_keys": class_user_keys,
+            "uuids": uuids,
+            "limit": limit,
+            "cursor": cursor,
+        }
+        response = await self.execute(query=query, variables=variables)
+        data = self.get_data(response)
+        return ClassesQuery.parse_obj(data).classes
+
+    async def snapshot_query(
+        self,
+        facet_user_keys: List[str],
+        class_user_keys: List[str],
+        limit: Union[Optional[int], UnsetType] = UNSET,
+    ) -> SnapshotQuery:
+        query = gql(
+            """
+            query SnapshotQuery($facet_user_keys: [String!]!, $class_user_keys: [String!]!, $limit: int) {
+              facets(limit: $limit) {
+                objects {
+                  current {
+                    ...FacetFields
+                  }
+                }
+                page_info {
+                  next_cursor
+                }
+              }
+              itsystems(limit: $limit) {
+                objects {
+                  current {
+                    ...ITSystemFields
+                  }
+                }
+                page_info {
+                  next_cursor
+                }
+              }
+              classes(
+                filter: {user_keys: $class_user_keys, from_date: null, to_date: null, facet: {user_keys: $facet_user_keys}}
+                limit: $limit
+              ) {
+                objects {
+                  current {
+                    ...ClassFields
+                  }
+                }
+                page_info {
+                  next_cursor
+                }
+              }
+            }
+
+            fragment ClassFields on Class {
+              facet {
+                user_key
+              }
+              uuid
+              user_key
+              name
+              scope
+              it_system {
+                uuid
+                user_key
+              }
+            }
+
+            fragment FacetFields on Facet {
+              uuid
+              user_key
+            }
+
+            fragment ITSystemFields on ITSystem {
+              uuid
+              user_key
+              name
+            }
+            """
+        )
+        variables: dict[str, object] = {
+            "facet_user_keys": facet_user_keys,
+            "class_user_keys": class_user_keys,
+            "limit": limit,
+        }
+        response = await self.execute(query=query, variables=variables)
+        data = self.get_data(response)
+        return SnapshotQuery.parse_obj(data)
+
+    async def registrations_query(
+        self,
+        models: List[str],
+        uuids: Union[Optional[List[UUID]], UnsetType] = UNSET,
+        start: Union[Optional[datetime], UnsetType] = UNSET,
+        limit: Union[Optional[int], UnsetType] = UNSET,
+        cursor: Union[Optional[str], UnsetType] = UNSET,
+    ) -> RegistrationsQueryRegistrations:
+        query = gql(
+            """
+            query RegistrationsQuery($models: [String!]!, $uuids: [UUID!], $start: DateTime, $limit: int, $cursor: Cursor) {
+              registrations(
+                filter: {models: $models, uuids: $uuids, start: $start}
+                limit: $limit
+                cursor: $cursor
+              ) {
+                objects {
+                  start
+                  model
+                  uuid
+                }
+                page_info {
+                  next_cursor
+                }
+              }
+            }
+            """
+        )
+        variables: dict[str, object] = {
+            "models": models,
+            "uuids": uuids,
+            "start": start,
+            "limit": limit,
+            "cursor": cursor,
+        }
+        response = await self.execute(query=query, variables=variables)
+        data = self.get_data(response)
+        return RegistrationsQuery.parse_obj(data).registrations
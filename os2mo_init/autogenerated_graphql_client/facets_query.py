@@ -3,9 +3,9 @@
 
 from typing import List
 from typing import Optional
-from uuid import UUID
 
 from .base_model import BaseModel
+from .fragments import FacetFields
 
 
 class FacetsQuery(BaseModel):
@@ -14,18 +14,23 @@ class FacetsQuery(BaseModel):
 
 class FacetsQueryFacets(BaseModel):
     objects: List["FacetsQueryFacetsObjects"]
+    page_info: "FacetsQueryFacetsPageInfo"
 
 
 class FacetsQueryFacetsObjects(BaseModel):
     current: Optional["FacetsQueryFacetsObjectsCurrent"]
 
 
-class FacetsQueryFacetsObjectsCurrent(BaseModel):
-    uuid: UUID
-    user_key: str
+class FacetsQueryFacetsObjectsCurrent(FacetFields):
+    pass
+
+
+class FacetsQueryFacetsPageInfo(BaseModel):
+    next_cursor: Optional[str]
 
 
 FacetsQuery.update_forward_refs()
 FacetsQueryFacets.update_forward_refs()
 FacetsQueryFacetsObjects.update_forward_refs()
 FacetsQueryFacetsObjectsCurrent.update_forward_refs()
+FacetsQueryFacetsPageInfo.update_forward_refs()
@@ -0,0 +1,43 @@
+# Generated by ariadne-codegen on 2024-08-13 19:15
+# Source: queries.graphql
+
+from typing import Optional
+from uuid import UUID
+
+from .base_model import BaseModel
+
+
+class ClassFields(BaseModel):
+    facet: "ClassFieldsFacet"
+    uuid: UUID
+    user_key: str
+    name: str
+    scope: Optional[str]
+    it_system: Optional["ClassFieldsItSystem"]
+
+
+class ClassFieldsFacet(BaseModel):
+    user_key: str
+
+
+class ClassFieldsItSystem(BaseModel):
+    uuid: UUID
+    user_key: str
+
+
+class FacetFields(BaseModel):
+    uuid: UUID
+    user_key: str
+
+
+class ITSystemFields(BaseModel):
+    uuid: UUID
+    user_key: str
+    name: str
+
+
+ClassFields.update_forward_refs()
+ClassFieldsFacet.update_forward_refs()
+ClassFieldsItSystem.update_forward_refs()
+FacetFields.update_forward_refs()
+ITSystemFields.update_forward_refs()
@@ -3,9 +3,9 @@
 
 from typing import List
 from typing import Optional
-from uuid import UUID
 
 from .base_model import BaseModel
+from .fragments import ITSystemFields
 
 
 class ITSystemsQuery(BaseModel):
@@ -14,19 +14,23 @@ class ITSystemsQuery(BaseModel):
 
 class ITSystemsQueryItsystems(BaseModel):
     objects: List["ITSystemsQueryItsystemsObjects"]
+    page_info: "ITSystemsQueryItsystemsPageInfo"
 
 
 class ITSystemsQueryItsystemsObjects(BaseModel):
     current: Optional["ITSystemsQueryItsystemsObjectsCurrent"]
 
 
-class ITSystemsQueryItsystemsObjectsCurrent(BaseModel):
-    uuid: UUID
-    user_key: str
-    name: str
+class ITSystemsQueryItsystemsObjectsCurrent(ITSystemFields):
+    pass
+
+
+class ITSystemsQueryItsystemsPageInfo(BaseModel):
+    next_cursor: Optional[str]
 
 
 ITSystemsQuery.update_forward_refs()
 ITSystemsQueryItsystems.update_forward_refs()
 ITSystemsQueryItsystemsObjects.update_forward_refs()
 ITSystemsQueryItsystemsObjectsCurrent.update_forward_refs()
+ITSystemsQueryItsystemsPageInfo.update_forward_refs()
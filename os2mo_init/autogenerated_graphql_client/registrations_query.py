@@ -0,0 +1,34 @@
+# Generated by ariadne-codegen on 2024-08-13 19:15
+# Source: queries.graphql
+
+from datetime import datetime
+from typing import List
+from typing import Optional
+from uuid import UUID
+
+from .base_model import BaseModel
+
+
+class RegistrationsQuery(BaseModel):
+    registrations: "RegistrationsQueryRegistrations"
+
+
+class RegistrationsQueryRegistrations(BaseModel):
+    objects: List["RegistrationsQueryRegistrationsObjects"]
+    page_info: "RegistrationsQueryRegistrationsPageInfo"
+
+
+class RegistrationsQueryRegistrationsObjects(BaseModel):
+    start: datetime
+    model: str
+    uuid: UUID
+
+
+class RegistrationsQueryRegistrationsPageInfo(BaseModel):
+    next_cursor: Optional[str]
+
+
+RegistrationsQuery.update_forward_refs()
+RegistrationsQueryRegistrations.update_forward_refs()
+RegistrationsQueryRegistrationsObjects.update_forward_refs()
+RegistrationsQueryRegistrationsPageInfo.update_forward_refs()
@@ -0,0 +1,82 @@
+# Generated by ariadne-codegen on 2024-08-13 19:15
+# Source: queries.graphql
+
+from typing import List
+from typing import Optional
+
+from .base_model import BaseModel
+from .fragments import ClassFields
+from .fragments import FacetFields
+from .fragments import ITSystemFields
+
+
+class SnapshotQuery(BaseModel):
+    facets: "SnapshotQueryFacets"
+    itsystems: "SnapshotQueryItsystems"
+    classes: "SnapshotQueryClasses"
+
+
+class SnapshotQueryFacets(BaseModel):
+    objects: List["SnapshotQueryFacetsObjects"]
+    page_info: "SnapshotQueryFacetsPageInfo"
+
+
+class SnapshotQueryFacetsObjects(BaseModel):
+    current: Optional["SnapshotQueryFacetsObjectsCurrent"]
+
+
+class SnapshotQueryFacetsObjectsCurrent(FacetFields):
+    pass
+
+
+class SnapshotQueryFacetsPageInfo(BaseModel):
+    next_cursor: Optional[str]
+
+
+class SnapshotQueryItsystems(BaseModel):
+    objects: List["SnapshotQueryItsystemsObjects"]
+    page_info: "SnapshotQueryItsystemsPageInfo"
+
+
+class SnapshotQueryItsystemsObjects(BaseModel):
+    current: Optional["SnapshotQueryItsystemsObjectsCurrent"]
+
+
+class SnapshotQueryItsystemsObjectsCurrent(ITSystemFields):
+    pass
+
+
+class SnapshotQueryItsystemsPageInfo(BaseModel):
+    next_cursor: Optional[str]
+
+
+class SnapshotQueryClasses(BaseModel):
+    objects: List["SnapshotQueryClassesObjects"]
+    page_info: "SnapshotQueryClassesPageInfo"
+
+
+class SnapshotQueryClassesObjects(BaseModel):
+    current: Optional["SnapshotQueryClassesObjectsCurrent"]
+
+
+class SnapshotQueryClassesObjectsCurrent(ClassFields):
+    pass
+
+
+class SnapshotQueryClassesPageInfo(BaseModel):
+    next_cursor: Optional[str]
+
+
+SnapshotQuery.update_forward_refs()
+SnapshotQueryFacets.update_forward_refs()
+SnapshotQueryFacetsObjects.update_forward_refs()
+SnapshotQueryFacetsObjectsCurrent.update_forward_refs()
+SnapshotQueryFacetsPageInfo.update_forward_refs()
+SnapshotQueryItsystems.update_forward_refs()
+SnapshotQueryItsystemsObjects.update_forward_refs()
+SnapshotQueryItsystemsObjectsCurrent.update_forward_refs()
+SnapshotQueryItsystemsPageInfo.update_forward_refs()
+SnapshotQueryClasses.update_forward_refs()
+SnapshotQueryClassesObjects.update_forward_refs()
+SnapshotQueryClassesObjectsCurrent.update_forward_refs()
+SnapshotQueryClassesPageInfo.update_forward_refs()
@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Hashable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+from uuid import UUID
+
+import structlog
+from more_itertools import chunked
+
+from os2mo_init.autogenerated_graphql_client import BaseModel
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import GraphQLClientGraphQLMultiError
+from os2mo_init.executor import Executor
+from os2mo_init.tracing import span
+
+logger = structlog.stdlib.get_logger()
+
+# Mutations supported by the batcher and the input type of their `input` argument
+MUTATION_INPUT_TYPES = {
+    "class_create": "ClassCreateInput",
+    "class_update": "ClassUpdateInput",
+    "facet_create": "FacetCreateInput",
+    "itsystem_create": "ITSystemCreateInput",
+    "itsystem_update": "ITSystemUpdateInput",
+}
+
+
+@dataclass(frozen=True)
+class Mutation:
+    """A single mutation, e.g. `class_create`, and its input."""
+
+    field: str
+    input: BaseModel
+
+
+class MutationError(Exception):
+    """A mutation in a batch failed."""
+
+    def __init__(self, key: Hashable, message: str) -> None:
+        super().__init__(f"{key}: {message}")
+        self.key = key
+        self.message = message
+
+
+def build_document(mutations: Sequence[Mutation]) -> tuple[str, dict[str, Any]]:
+    """Pack the given mutations into a single aliased GraphQL document.
+
+    Each mutation is aliased as `m<index>`, with its input in the variable
+    `$i<index>`, such that the results can be mapped back to the mutations.
+
+    Returns:
+        Tuple of GraphQL document and variables.
+    """
+    definitions = ", ".join(
+        f"$i{i}: {MUTATION_INPUT_TYPES[m.field]}!" for i, m in enumerate(mutations)
+    )
+    fields = "\n".join(
+        f"  m{i}: {m.field}(input: $i{i}) {{ uuid }}" for i, m in enumerate(mutations)
+    )
+    query = f"mutation BatchMutation({definitions}) {{\n{fields}\n}}"
+    variables = {f"i{i}": m.input for i, m in enumerate(mutations)}
+    return query, variables
+
+
+@dataclass(frozen=True)
+class PendingMutation:
+    key: Hashable
+    mutation: Mutation
+    future: asyncio.Future[UUID]
+
+
+class MutationBatcher:
+    """Execute mutations in batches of aliased multi-mutation GraphQL documents.
+
+    Mutations submitted during the same iteration of the event loop are coalesced
+    into batches of at most `batch_size` mutations. The batches are executed
+    concurrently, within the concurrency limit of the given executor.
+    """
+
+    def __init__(
+        self, client: GraphQLClient, executor: Executor, batch_size: int
+    ) -> None:
+        self.client = client
+        self.executor = executor
+        self.batch_size = batch_size
+        self.pending: list[PendingMutation] = []
+        self.flushes: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, mutation: Mutation) -> UUID:
+        """Submit a mutation for execution in the next batch.
+
+        Args:
+            key: Key identifying the mutation, e.g. the user key of the object it
+                modifies. Used for error reporting.
+            mutation: The mutation.
+
+        Raises:
+            MutationError: If the mutation failed, or its outcome is unknown.
+
+        Returns:
+            UUID of the modified object.
+        """
+        loop = asyncio.get_running_loop()
+        if not self.pending:
+            loop.call_soon(self._flush)
+        future = loop.create_future()
+        self.pending.append(PendingMutation(key, mutation, future))
+        return await future
+
+    def _flush(self) -> None:
+        pending, self.pending = self.pending, []
+        for batch in chunked(pending, self.batch_size):
+            task = asyncio.create_task(
+                self.executor.execute(partial(self._execute_batch, batch))
+            )
+            self.flushes.add(task)
+            task.add_done_callback(self.flushes.discard)
+            task.add_done_callback(partial(self._cancel_batch, batch))
+
+    @staticmethod
+    def _cancel_batch(batch: Sequence[PendingMutation], task: asyncio.Task) -> None:
+        """Cancel the mutations left unresolved by a batch, e.g. as it was cancelled.
+
+        Otherwise, their submitters would wait forever.
+        """
+        for p in batch:
+            p.future.cancel()
+
+    async def _execute_batch(self, batch: Sequence[PendingMutation]) -> None:
+        logger.debug("Executing mutation batch", size=len(batch))
+        query, variables = build_document([p.mutation for p in batch])
+        try:
+            with span("mutation batch", size=len(batch)):
+                response = await self.client.execute(query=query, variables=variables)
+                data = self.client.get_data(response)
+        except GraphQLClientGraphQLMultiError as e:
+            # All the mutations return non-nullable types, so a single failing
+            # mutation nulls the entire response. Map the errors back to the
+            # mutations they originate from, using the alias in the error path.
+            # The outcome of the other mutations in the batch is unknown.
+            messages = {}
+            for error in e.errors:
+                alias = error.path[0] if error.path else None
+                if isinstance(alias, str) and alias.startswith("m"):
+                    messages[int(alias[1:])] = error.message
+            for i, p in enumerate(batch):
+                message = messages.get(i, f"Outcome unknown; batch failed: {e}")
+                if not p.future.done():
+                    p.future.set_exception(MutationError(p.key, message))
+            return
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+            return
+        for i, p in enumerate(batch):
+            if not p.future.done():
+                p.future.set_result(UUID(data[f"m{i}"]["uuid"]))
@@ -0,0 +1,364 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import sqlite3
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import closing
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Protocol
+from typing import TypeVar
+from uuid import UUID
+
+import structlog
+
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.config import ConfigFile
+from os2mo_init.pagination import iter_classes
+from os2mo_init.pagination import iter_facets
+from os2mo_init.pagination import iter_it_systems
+from os2mo_init.pagination import iter_registrations
+from os2mo_init.root_org import get_root_org
+from os2mo_init.snapshot import Class
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.snapshot import Snapshot
+from os2mo_init.snapshot import class_filter
+from os2mo_init.snapshot import load_snapshot
+from os2mo_init.state import MODELS
+from os2mo_init.state import fingerprint
+from os2mo_init.state import latest_registration
+
+logger = structlog.stdlib.get_logger()
+
+T = TypeVar("T")
+
+# Bumped whenever the schema changes, invalidating existing caches
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facets (
+    uuid TEXT PRIMARY KEY,
+    user_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS it_systems (
+    uuid TEXT PRIMARY KEY,
+    user_key TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    uuid TEXT PRIMARY KEY,
+    facet TEXT NOT NULL,
+    user_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    scope TEXT,
+    it_system TEXT
+);
+"""
+
+
+@dataclass
+class CachedSnapshot:
+    snapshot: Snapshot
+    # All registrations of managed objects up to and including this time are
+    # reflected in the snapshot. `None` if there were no registrations at all.
+    watermark: datetime | None
+    # Fingerprint of the class filter the classes of the snapshot were loaded with,
+    # see `class_scope`. `None` if unknown.
+    class_scope: str | None = None
+
+
+def class_scope(config: ConfigFile) -> str:
+    """Fingerprint of the classes in MO relevant for the configuration."""
+    return fingerprint(*class_filter(config))
+
+
+class SnapshotStore(Protocol):
+    def load(self, scope: str) -> CachedSnapshot | None: ...  # pragma: no cover
+
+    def save(self, scope: str, cached: CachedSnapshot) -> None: ...  # pragma: no cover
+
+
+class MemorySnapshotCache:
+    """In-memory cache of the snapshot, for processes handling multiple runs."""
+
+    def __init__(self) -> None:
+        self.scope: str | None = None
+        self.cached: CachedSnapshot | None = None
+
+    def load(self, scope: str) -> CachedSnapshot | None:
+        if self.cached is None or self.scope != scope:
+            return None
+        # Copied, such that the cache is unaffected by a failed run
+        return deepcopy(self.cached)
+
+    def save(self, scope: str, cached: CachedSnapshot) -> None:
+        self.scope = scope
+        self.cached = deepcopy(cached)
+
+
+class SnapshotCache:
+    """On-disk SQLite cache of the facets, IT systems and classes last seen in MO.
+
+    The root organisation is not cached, as it is fetched in a single cheap request.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def load(self, scope: str) -> CachedSnapshot | None:
+        """Load the cached snapshot.
+
+        Args:
+            scope: Fingerprint of what the snapshot covers, i.e. the MO instance.
+
+        Returns:
+            The cached snapshot, or `None` if there is no cached snapshot for the
+            given scope.
+        """
+        if not self.path.exists():
+            return None
+        with closing(self._connect()) as connection:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            if meta.get("version") != SCHEMA_VERSION or meta.get("scope") != scope:
+                return None
+            snapshot = Snapshot()
+            for uuid, user_key in connection.execute(
+                "SELECT uuid, user_key FROM facets"
+            ):
+                snapshot.facets[user_key] = UUID(uuid)
+            for uuid, user_key, name in connection.execute(
+                "SELECT uuid, user_key, name FROM it_systems"
+            ):
+                snapshot.it_systems[user_key] = ITSystem(
+                    uuid=UUID(uuid), user_key=user_key, name=name
+                )
+            for uuid, facet, user_key, name, scope_, it_system in connection.execute(
+                "SELECT uuid, facet, user_key, name, scope, it_system FROM classes"
+            ):
+                snapshot.classes[(facet, user_key)] = Class(
+                    uuid=UUID(uuid),
+                    facet=facet,
+                    user_key=user_key,
+                    name=name,
+                    scope=scope_,
+                    it_system=it_system,
+                )
+        watermark = meta.get("watermark")
+        return CachedSnapshot(
+            snapshot=snapshot,
+            watermark=datetime.fromisoformat(watermark) if watermark else None,
+            class_scope=meta.get("class_scope") or None,
+        )
+
+    def save(self, scope: str, cached: CachedSnapshot) -> None:
+        """Replace the cached snapshot.
+
+        Args:
+            scope: Fingerprint of what the snapshot covers.
+            cached: Snapshot to cache.
+        """
+        snapshot = cached.snapshot
+        meta = {
+            "version": SCHEMA_VERSION,
+            "scope": scope,
+            "watermark": cached.watermark.isoformat() if cached.watermark else "",
+            "class_scope": cached.class_scope or "",
+        }
+        with closing(self._connect()) as connection, connection:
+            for table in ("meta", "facets", "it_systems", "classes"):
+                connection.execute(f"DELETE FROM {table}")
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            connection.executemany(
+                "INSERT INTO facets VALUES (?, ?)",
+                ((str(uuid), user_key) for user_key, uuid in snapshot.facets.items()),
+            )
+            connection.executemany(
+                "INSERT INTO it_systems VALUES (?, ?, ?)",
+                (
+                    (str(i.uuid), i.user_key, i.name)
+                    for i in snapshot.it_systems.values()
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (str(c.uuid), c.facet, c.user_key, c.name, c.scope, c.it_system)
+                    for c in snapshot.classes.values()
+                ),
+            )
+
+
+async def collect(pages: AsyncIterator[list[T]]) -> list[T]:
+    return [o async for page in pages for o in page]
+
+
+async def load_cached_snapshot(
+    client: GraphQLClient,
+    config: ConfigFile,
+    page_size: int,
+    cache: SnapshotStore,
+    scope: str,
+    raw: bool = False,
+    classes: str | None = None,
+) -> CachedSnapshot:
+    """Load the state of MO relevant for the given configuration, using the cache.
+
+    Only the objects registered in MO after the cached watermark are refetched. If
+    the classes of the configuration changed, all of its classes are reloaded, and
+    if there is no usable cache, everything is loaded from MO instead.
+
+    Args:
+        client: MO GraphQL client.
+        config: Desired state, used to filter the classes.
+        page_size: Maximum number of objects fetched per request.
+        cache: Snapshot cache.
+        scope: Fingerprint of what the snapshot covers, i.e. the MO instance.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+        classes: `class_scope` of the configuration, if already computed.
+
+    Returns:
+        Up-to-date snapshot of MO, and the watermark it is up to date with.
+    """
+    if classes is None:
+        classes = class_scope(config)
+    cached = cache.load(scope)
+    if cached is None:
+        logger.info("No usable snapshot cache")
+        # The watermark is taken no later than the snapshot, such that changes
+        # made in the meantime are picked up by the next run.
+        watermark, snapshot = await asyncio.gather(
+            latest_registration(client, page_size, since=None, raw=raw),
+            load_snapshot(client, config, page_size, raw=raw),
+        )
+        return CachedSnapshot(
+            snapshot=snapshot, watermark=watermark, class_scope=classes
+        )
+    return await refresh_snapshot(
+        client, config, page_size, cached, raw=raw, classes=classes
+    )
+
+
+async def refresh_snapshot(
+    client: GraphQLClient,
+    config: ConfigFile,
+    page_size: int,
+    cached: CachedSnapshot,
+    raw: bool = False,
+    classes: str | None = None,
+) -> CachedSnapshot:
+    """Refresh a cached snapshot with the objects registered in MO since its watermark.
+
+    The snapshot is refreshed in place.
+
+    Args:
+        client: MO GraphQL client.
+        config: Desired state, used to filter the classes.
+        page_size: Maximum number of objects fetched per request.
+        cached: Cached snapshot to refresh.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+        classes: `class_scope` of the configuration, if already computed.
+
+    Returns:
+        Up-to-date snapshot of MO, and the watermark it is up to date with.
+    """
+    if classes is None:
+        classes = class_scope(config)
+    logger.info("Refreshing cached snapshot", watermark=cached.watermark)
+    snapshot, watermark = cached.snapshot, cached.watermark
+    start = watermark + timedelta(microseconds=1) if watermark is not None else None
+
+    async def changed_uuids() -> dict[str, set[UUID]]:
+        nonlocal watermark
+        changed = defaultdict(set)
+        async for page in iter_registrations(
+            client, page_size, models=MODELS, start=start, raw=raw
+        ):
+            for registration in page:
+                changed[registration.model].add(registration.uuid)
+                if watermark is None or registration.start > watermark:
+                    watermark = registration.start
+        return changed
+
+    snapshot.root_organisation, changed = await asyncio.gather(
+        get_root_org(client), changed_uuids()
+    )
+    logger.debug("Changed objects", **{m: len(u) for m, u in changed.items()})
+
+    async def refresh_facets(uuids: set[UUID]) -> None:
+        facets = await collect(
+            iter_facets(client, page_size, uuids=list(uuids), raw=raw)
+        )
+        snapshot.facets = {k: v for k, v in snapshot.facets.items() if v not in uuids}
+        snapshot.facets.update({f.user_key: f.uuid for f in facets})
+
+    async def refresh_it_systems(uuids: set[UUID]) -> None:
+        it_systems = await collect(
+            iter_it_systems(client, page_size, uuids=list(uuids), raw=raw)
+        )
+        snapshot.it_systems = {
+            k: v for k, v in snapshot.it_systems.items() if v.uuid not in uuids
+        }
+        snapshot.it_systems.update(
+            {
+                i.user_key: ITSystem(uuid=i.uuid, user_key=i.user_key, name=i.name)
+                for i in it_systems
+            }
+        )
+
+    async def refresh_classes(uuids: set[UUID] | None) -> None:
+        """Refresh the given classes, or reload all of them if `None`."""
+        facet_user_keys, class_user_keys = class_filter(config)
+        records = await collect(
+            iter_classes(
+                client,
+                page_size,
+                facet_user_keys=facet_user_keys,
+                class_user_keys=class_user_keys,
+                uuids=list(uuids) if uuids is not None else None,
+                raw=raw,
+            )
+        )
+        if uuids is None:
+            snapshot.classes = {}
+        else:
+            snapshot.classes = {
+                k: v for k, v in snapshot.classes.items() if v.uuid not in uuids
+            }
+        for record in records:
+            class_ = Class.from_record(record)
+            snapshot.classes[(class_.facet, class_.user_key)] = class_
+
+    # Objects which are changed such that they are no longer returned, e.g. because
+    # they were terminated, are removed from the snapshot.
+    refreshes = []
+    if changed["facet"]:
+        refreshes.append(refresh_facets(changed["facet"]))
+    if changed["itsystem"]:
+        refreshes.append(refresh_it_systems(changed["itsystem"]))
+    if cached.class_scope != classes:
+        # The classes of the configuration changed. They are reloaded after the
+        # watermark is taken, such that changes made in the meantime are picked up
+        # by the next run, while the facets and IT systems are still refreshed.
+        logger.info("Classes of the config changed, reloading classes")
+        refreshes.append(refresh_classes(None))
+    elif changed["class"]:
+        refreshes.append(refresh_classes(changed["class"]))
+    await asyncio.gather(*refreshes)
+
+    return CachedSnapshot(snapshot=snapshot, watermark=watermark, class_scope=classes)
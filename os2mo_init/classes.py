@@ -1,82 +1,194 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
+from functools import partial
 from uuid import UUID
 
 import structlog
-from more_itertools import last
 
-from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.batch import Mutation
+from os2mo_init.batch import MutationBatcher
 from os2mo_init.config import ConfigFacet
+from os2mo_init.plan import Action
+from os2mo_init.plan import ClassOperation
+from os2mo_init.scheduler import Scheduler
+from os2mo_init.snapshot import Class
+from os2mo_init.snapshot import ClassKey
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.tracing import span
+from os2mo_init.uuids import deterministic_uuid
 
 logger = structlog.stdlib.get_logger()
 
 
-async def ensure_classes(
-    client: GraphQLClient,
+def plan_classes(
+    existing_classes: dict[ClassKey, Class],
     config_classes: dict[str, ConfigFacet],
-) -> None:
-    """Ensure that the given classes exists.
+    facets: set[str],
+    it_systems: set[str],
+    uuid_namespace: UUID | None = None,
+) -> list[ClassOperation]:
+    """Plan the operations needed to ensure that the given classes exists.
 
     Args:
-        client: MO GraphQL client.
+        existing_classes: Dictionary mapping from (facet user key, class user key)
+            to existing class.
         config_classes: Desired facets and their classes.
+        facets: User keys of the facets which exist after the plan is applied.
+        it_systems: User keys of the IT systems which exist after the plan is
+            applied.
+        uuid_namespace: Namespace of deterministic UUIDs for created classes, if
+            any.
+
+    Returns:
+        Operation for each of the desired classes.
     """
-    logger.info("Ensuring classes", classes=config_classes)
-
-    existing_facets_by_user_key = {
-        o.current.user_key: o.current.uuid
-        for o in (await client.facets_query()).objects
-        if o.current is not None
-    }
-    existing_it_systems_by_user_key = {
-        o.current.user_key: o.current
-        for o in (await client.i_t_systems_query()).objects
-        if o.current is not None
-    }
+    logger.info("Planning classes", classes=config_classes)
+    logger.debug("Existing classes", count=len(existing_classes))
 
+    operations = []
     for facet_user_key, classes in config_classes.items():
+        if facet_user_key not in facets:
+            raise ValueError(
+                f"Classes cannot be associated with non-existent facet '{facet_user_key}'"
+            )
         for class_user_key, class_data in classes.items():
-            it_system_uuid: UUID | None = None
-            if class_data.it_system is not None:
-                try:
-                    it_system = existing_it_systems_by_user_key[class_data.it_system]
-                except KeyError as e:
-                    raise ValueError(
-                        # noqa: E501
-                        f"Class '{class_user_key}' cannot be associated with non-existent it-system '{class_data.it_system}'"
-                    ) from e
-                it_system_uuid = it_system.uuid
-
-            class_ = await client.get_class(facet_user_key, class_user_key)
-            obj = last(
-                class_.objects, default=None
-            )  # TODO: fail if more than one class?
-            if obj is None or obj.current is None:
-                logger.info("Creating class", data=class_data)
-                await client.create_class_mutation(
-                    facet_uuid=existing_facets_by_user_key[facet_user_key],
+            if (
+                class_data.it_system is not None
+                and class_data.it_system not in it_systems
+            ):
+                raise ValueError(
+                    # noqa: E501
+                    f"Class '{class_user_key}' cannot be associated with non-existent it-system '{class_data.it_system}'"
+                )
+
+            existing = existing_classes.get((facet_user_key, class_user_key))
+            if existing is None:
+                action = Action.CREATE
+            else:
+                if (
+                    existing.name != class_data.title
+                    or existing.scope != class_data.scope
+                    or existing.it_system != class_data.it_system
+                ):
+                    action = Action.UPDATE
+                else:
+                    action = Action.NOOP
+            operations.append(
+                ClassOperation(
+                    action=action,
+                    uuid=existing.uuid
+                    if existing is not None
+                    else deterministic_uuid(
+                        uuid_namespace, "class", facet_user_key, class_user_key
+                    ),
+                    facet=facet_user_key,
                     user_key=class_user_key,
                     name=class_data.title,
                     scope=class_data.scope,
-                    it_system_uuid=it_system_uuid,
+                    it_system=class_data.it_system,
                 )
-                continue
+            )
+    return operations
+
+
+def schedule_classes(
+    scheduler: Scheduler,
+    batcher: MutationBatcher,
+    operations: list[ClassOperation],
+    facets: dict[str, UUID],
+    it_systems: dict[str, ITSystem],
+    classes: dict[ClassKey, Class],
+) -> None:
+    """Schedule the given class operations.
 
-            existing = obj.current
-            existing_it_system_uuid = (
-                existing.it_system.uuid if existing.it_system is not None else None
+    Each created or updated class is scheduled as `("class", facet, user_key)`, and
+    depends on its facet and IT system, if they are created in the same run. This
+    lets the classes of a facet start as soon as that particular facet exists.
+
+    Args:
+        scheduler: Scheduler running the operations.
+        batcher: Batcher executing the mutations.
+        operations: Planned class operations.
+        facets: Dictionary mapping from facet user key to UUID.
+        it_systems: Dictionary mapping from IT system user key to IT system.
+        classes: Dictionary mapping from (facet user key, class user key) to class,
+            which is updated with the classes of the operations.
+    """
+
+    async def write(operation: ClassOperation) -> None:
+        # Imported here, since the input types are slow to import, and not needed
+        # by runs which write nothing
+        from os2mo_init.autogenerated_graphql_client import ClassCreateInput
+        from os2mo_init.autogenerated_graphql_client import ClassUpdateInput
+        from os2mo_init.autogenerated_graphql_client import ValidityInput
+
+        key = (operation.facet, operation.user_key)
+        it_system_uuid = (
+            it_systems[operation.it_system].uuid
+            if operation.it_system is not None
+            else None
+        )
+        if operation.action == Action.CREATE:
+            logger.info("Creating class", key=key)
+            mutation = Mutation(
+                "class_create",
+                ClassCreateInput(
+                    uuid=operation.uuid,
+                    facet_uuid=facets[operation.facet],
+                    user_key=operation.user_key,
+                    name=operation.name,
+                    scope=operation.scope,
+                    it_system_uuid=it_system_uuid,
+                    validity=ValidityInput(from_=None),
+                ),
             )
-            if (
-                existing.name != class_data.title
-                or existing.scope != class_data.scope
-                or existing_it_system_uuid != class_data.it_system
-            ):
-                logger.info("Updating class", data=class_data)
-                await client.update_class_mutation(
-                    facet_uuid=existing_facets_by_user_key[facet_user_key],
-                    uuid=existing.uuid,
-                    user_key=class_user_key,
-                    name=class_data.title,
-                    scope=class_data.scope,
+        else:
+            assert operation.uuid is not None
+            logger.info("Updating class", key=key)
+            mutation = Mutation(
+                "class_update",
+                ClassUpdateInput(
+                    facet_uuid=facets[operation.facet],
+                    uuid=operation.uuid,
+                    user_key=operation.user_key,
+                    name=operation.name,
+                    scope=operation.scope,
                     it_system_uuid=it_system_uuid,
-                )
+                    validity=ValidityInput(from_=None),
+                ),
+            )
+        with span(
+            "write class",
+            facet=operation.facet,
+            user_key=operation.user_key,
+            action=operation.action.value,
+        ):
+            uuid = await batcher.submit(key, mutation)
+        classes[key] = class_from_operation(operation, uuid)
+
+    for operation in operations:
+        if operation.action == Action.NOOP:
+            assert operation.uuid is not None
+            classes[(operation.facet, operation.user_key)] = class_from_operation(
+                operation, operation.uuid
+            )
+            continue
+        dependencies = [("facet", operation.facet)]
+        if operation.it_system is not None:
+            dependencies.append(("it_system", operation.it_system))
+        scheduler.add(
+            ("class", operation.facet, operation.user_key),
+            partial(write, operation),
+            dependencies=dependencies,
+        )
+
+
+def class_from_operation(operation: ClassOperation, uuid: UUID) -> Class:
+    return Class(
+        uuid=uuid,
+        facet=operation.facet,
+        user_key=operation.user_key,
+        name=operation.name,
+        scope=operation.scope,
+        it_system=operation.it_system,
+    )
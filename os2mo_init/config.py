@@ -1,13 +1,35 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
+import hashlib
+from enum import Enum
 from pathlib import Path
+from typing import Any
 from typing import ItemsView
+from typing import Literal
+from uuid import UUID
 
+import orjson
+import structlog
 import yaml
 from fastramqpi.config import ClientSettings
 from fastramqpi.config import FastAPIIntegrationSystemSettings
+from fastramqpi.ramqp.config import AMQPConnectionSettings
+from pydantic import AnyHttpUrl
 from pydantic import BaseModel
 from pydantic import FilePath
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+from pydantic import SecretStr
+from pydantic import constr
+from pydantic import parse_obj_as
+
+try:
+    # libyaml's loader, which is many times faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+logger = structlog.stdlib.get_logger()
 
 
 class ConfigRootOrganisation(BaseModel):
@@ -33,15 +55,174 @@ class ConfigFile(BaseModel):
     it_systems: dict[str, str] | None
 
 
-def get_config_file(config_file: Path) -> ConfigFile:
-    with config_file.open() as f:
-        config_yaml = yaml.safe_load(f)
-    config = ConfigFile.parse_obj(config_yaml)
+def load_yaml(content: bytes | str) -> Any:
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def construct_config(data: dict[str, Any]) -> ConfigFile:
+    """Rebuild a config from its `dict()` without validating it again."""
+    root_organisation = data["root_organisation"]
+    facets = data["facets"]
+    return ConfigFile.construct(
+        root_organisation=(
+            ConfigRootOrganisation.construct(**root_organisation)
+            if root_organisation is not None
+            else None
+        ),
+        facets=(
+            {
+                facet_user_key: ConfigFacet.construct(
+                    __root__={
+                        user_key: ConfigClass.construct(**class_data)
+                        for user_key, class_data in classes.items()
+                    }
+                )
+                for facet_user_key, classes in facets.items()
+            }
+            if facets is not None
+            else None
+        ),
+        it_systems=data["it_systems"],
+    )
+
+
+def get_config_file(config_file: Path, cache_dir: Path | None = None) -> ConfigFile:
+    """Load and validate the config file.
+
+    Args:
+        config_file: YAML config file.
+        cache_dir: Directory of a cache of the validated config. If set, an
+            unchanged config file is loaded from the cache, skipping both parsing
+            and validation.
+
+    Returns:
+        The validated config.
+    """
+    content = config_file.read_bytes()
+    if cache_dir is None:
+        return ConfigFile.parse_obj(load_yaml(content))
+
+    # The cache is keyed by the content of the config file, and the schema of the
+    # models, such that a cache written by another version is not used. It only
+    # holds data, as anyone able to write to the directory can forge the key.
+    cache = cache_dir / "config.json"
+    key = hashlib.sha256(ConfigFile.schema_json().encode() + content).hexdigest()
+    try:
+        cached = orjson.loads(cache.read_bytes())
+        if cached["key"] == key:
+            return construct_config(cached["config"])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Ignoring invalid config cache", path=cache, error=e)
+
+    config = ConfigFile.parse_obj(load_yaml(content))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.tmp")
+        tmp.write_bytes(orjson.dumps({"key": key, "config": config.dict()}))
+        tmp.replace(cache)
+    except OSError as e:
+        logger.warning("Failed to write config cache", path=cache, error=e)
     return config
 
 
+class Tenant(BaseModel):
+    # Identifies the tenant in the summary, and in the paths of its state and cache
+    name: constr(regex=r"^[A-Za-z0-9_-]+$")  # type: ignore[valid-type]
+    mo_url: AnyHttpUrl
+    client_id: str
+    client_secret: SecretStr
+    # AUTH_SERVER is used if unset
+    auth_server: AnyHttpUrl | None = None
+    auth_realm: str = "mo"
+
+
+def get_tenants_file(tenants_file: Path) -> list[Tenant]:
+    tenants_yaml = load_yaml(tenants_file.read_bytes())
+    return parse_obj_as(list[Tenant], tenants_yaml)
+
+
+class Mode(str, Enum):
+    # Plan and apply in a single run
+    INIT = "init"
+    # Only plan, writing the plan as JSON to PLAN_FILE or stdout
+    PLAN = "plan"
+    # Only apply, reading a previously computed plan from PLAN_FILE
+    APPLY = "apply"
+    # Create everything in the config without reading MO first. Only for an empty
+    # MO; requires UUID_NAMESPACE, so that the objects can reference each other
+    BOOTSTRAP = "bootstrap"
+    # Plan and apply, then keep running, applying changes to CONFIG_FILE as they
+    # happen
+    WATCH = "watch"
+    # Run an HTTP service on port 8000, reconciling on request
+    SERVICE = "service"
+    # Run the HTTP service, and additionally reconcile managed objects as soon as
+    # they are changed in MO, as announced over AMQP
+    EVENTS = "events"
+    # Plan and apply against each of the MO instances in TENANTS_FILE, concurrently
+    TENANTS = "tenants"
+
+
 class Settings(FastAPIIntegrationSystemSettings, ClientSettings):
     class Config:
         frozen = True
+        env_nested_delimiter = "__"
 
     config_file: FilePath = Path("/config/config.yml")
+
+    mode: Mode = Mode.INIT
+    plan_file: Path | None = None
+
+    # Maximum number of concurrent mutations against MO
+    concurrency: PositiveInt = 10
+    # Maximum number of mutations sent to MO in a single GraphQL request
+    mutation_batch_size: PositiveInt = 100
+    # Maximum number of objects fetched from MO in a single GraphQL request
+    page_size: PositiveInt = 500
+    # Negotiate HTTP/2 with MO, multiplexing concurrent requests over a single
+    # connection. Requires MO to be served over HTTPS by an HTTP/2-capable proxy;
+    # plain HTTP always uses HTTP/1.1.
+    http2: bool = False
+    # Maximum number of connections to MO. If unset, sized to CONCURRENCY plus the
+    # reads running alongside the mutations.
+    max_connections: PositiveInt | None = None
+    # Maximum number of idle connections to MO kept alive. If unset, all of them.
+    max_keepalive_connections: PositiveInt | None = None
+    # Seconds idle connections to MO are kept alive
+    keepalive_expiry: PositiveFloat = 5.0
+    # Namespace of deterministic UUIDv5 identifiers for created objects. If unset,
+    # MO assigns random UUIDs.
+    uuid_namespace: UUID | None = None
+    # File storing the config fingerprint and MO registration watermark of the last
+    # successful run. If set, runs where neither has changed are skipped.
+    state_file: Path | None = None
+    # Directory of the on-disk cache of the objects last seen in MO, and of the
+    # validated config. If set, only the objects changed in MO since the last run
+    # are fetched, and an unchanged CONFIG_FILE is neither parsed nor validated.
+    cache_dir: Path | None = None
+    # Seconds between checks of CONFIG_FILE for changes in watch mode
+    watch_interval: PositiveFloat = 5.0
+    # Connection to the AMQP broker of MO, e.g. AMQP__URL, required in events mode
+    amqp: AMQPConnectionSettings | None = None
+    # File to write Prometheus metrics to at the end of a run, e.g. for the node
+    # exporter's textfile collector. In the service modes, they are served on
+    # /metrics instead.
+    metrics_file: Path | None = None
+    # File to write a trace of the run to, in the Chrome trace event format. Not
+    # supported in the service modes.
+    trace_file: Path | None = None
+    # YAML list of the MO instances to reconcile in tenants mode, each with a name,
+    # mo_url, client_id, client_secret and optionally auth_server and auth_realm
+    tenants_file: Path | None = None
+    # Maximum number of tenants reconciled concurrently in tenants mode. CONCURRENCY
+    # caps the mutations across all tenants.
+    tenant_concurrency: PositiveInt = 5
+    # Backend encoding and decoding the JSON of GraphQL requests and responses,
+    # either "orjson" or "stdlib". If unset, orjson is used.
+    json_backend: Literal["orjson", "stdlib"] | None = None
+    # Decode the responses of the large reads of facets, IT systems, classes and
+    # registrations directly from the JSON, bypassing the pydantic models of the
+    # generated client
+    raw_decoding: bool = False
@@ -0,0 +1,227 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from dataclasses import replace
+from typing import Annotated
+from typing import Any
+from uuid import UUID
+
+import structlog
+from fastapi import Depends
+from fastramqpi.app import FastAPIIntegrationSystem
+from fastramqpi.depends import from_user_context
+from fastramqpi.ramqp.config import AMQPConnectionSettings
+from fastramqpi.ramqp.depends import Context
+from fastramqpi.ramqp.depends import RoutingKey
+from fastramqpi.ramqp.mo import MOAMQPSystem
+from fastramqpi.ramqp.mo import MORouter
+from fastramqpi.ramqp.mo import PayloadUUID
+
+from os2mo_init.app import FACETS
+from os2mo_init.app import apply
+from os2mo_init.app import plan
+from os2mo_init.app import snapshot_scope
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.cache import SnapshotStore
+from os2mo_init.cache import load_cached_snapshot
+from os2mo_init.cache import refresh_snapshot
+from os2mo_init.config import ConfigFacet
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.plan import Plan
+from os2mo_init.snapshot import Snapshot
+from os2mo_init.state import advance_watermark
+from os2mo_init.state import written_uuids
+
+logger = structlog.stdlib.get_logger()
+
+router = MORouter()
+
+# Avoids importing the service, which imports this module
+Service = Annotated[Any, Depends(from_user_context("service"))]
+
+
+def find_user_keys(snapshot: Snapshot, model: str, uuid: UUID) -> set[tuple[str, ...]]:
+    """Find the user keys of an object in a snapshot.
+
+    Args:
+        snapshot: Snapshot of MO.
+        model: Model of the object, as named in MO's AMQP events.
+        uuid: UUID of the object.
+
+    Returns:
+        User keys of the object, i.e. `(user_key,)` for facets and IT systems, and
+        `(facet user key, user_key)` for classes. Empty if it is not in the
+        snapshot.
+    """
+    if model == "facet":
+        return {(k,) for k, v in snapshot.facets.items() if v == uuid}
+    if model == "itsystem":
+        return {(k,) for k, v in snapshot.it_systems.items() if v.uuid == uuid}
+    return {k for k, v in snapshot.classes.items() if v.uuid == uuid}
+
+
+def touched_config(
+    config: ConfigFile, model: str, user_keys: set[tuple[str, ...]]
+) -> ConfigFile | None:
+    """Narrow the config down to the entries of a touched object.
+
+    IT systems referenced by touched classes are included, since the classes cannot
+    be planned without them.
+
+    Args:
+        config: Desired state.
+        model: Model of the touched object, as named in MO's AMQP events.
+        user_keys: User keys of the touched object, as found by `find_user_keys`.
+
+    Returns:
+        Config with only the entries of the touched object, or `None` if the object
+        is not managed by os2mo-init.
+    """
+    if model == "facet":
+        # The facets are not part of the config, as they are always ensured
+        if not any(k in FACETS for (k,) in user_keys):
+            return None
+        return ConfigFile(root_organisation=None, facets=None, it_systems=None)
+
+    config_it_systems = config.it_systems or {}
+    if model == "itsystem":
+        it_systems = {
+            k: config_it_systems[k] for (k,) in user_keys if k in config_it_systems
+        }
+        if not it_systems:
+            return None
+        return ConfigFile(root_organisation=None, facets=None, it_systems=it_systems)
+
+    config_facets = config.facets or {}
+    facets: dict[str, ConfigFacet] = {}
+    it_systems = {}
+    for facet_user_key, user_key in user_keys:
+        if facet_user_key not in config_facets:
+            continue
+        class_data = config_facets[facet_user_key].__root__.get(user_key)
+        if class_data is None:
+            continue
+        facet = facets.setdefault(facet_user_key, ConfigFacet(__root__={}))
+        facet.__root__[user_key] = class_data
+        if class_data.it_system in config_it_systems:
+            it_systems[class_data.it_system] = config_it_systems[class_data.it_system]
+    if not facets:
+        return None
+    return ConfigFile(
+        root_organisation=None, facets=facets, it_systems=it_systems or None
+    )
+
+
+async def ensure(
+    settings: Settings,
+    config: ConfigFile,
+    graphql_client: GraphQLClient,
+    batcher: MutationBatcher,
+    cache: SnapshotStore,
+    model: str,
+    uuid: UUID,
+    scope: str | None = None,
+    classes: str | None = None,
+) -> Plan | None:
+    """Reconcile a single object in MO with the config.
+
+    The snapshot is refreshed from the cache, such that only the objects changed in
+    MO since the last run are fetched. If there is no cached snapshot, it is loaded
+    in full anyway, so the entire config is reconciled instead.
+
+    Args:
+        settings: Settings.
+        config: Desired state.
+        graphql_client: MO GraphQL client.
+        batcher: Batcher executing the mutations.
+        cache: Snapshot cache, kept between events.
+        model: Model of the changed object, as named in MO's AMQP events.
+        uuid: UUID of the changed object.
+        scope: `snapshot_scope` of the settings, if already computed.
+        classes: `class_scope` of the config, if already computed.
+
+    Returns:
+        The applied plan, or `None` if the object is not managed by os2mo-init.
+    """
+    if scope is None:
+        scope = snapshot_scope(settings)
+    cached = cache.load(scope)
+    touched: ConfigFile | None
+    if cached is None:
+        logger.info("No cached snapshot, reconciling everything")
+        cached = await load_cached_snapshot(
+            graphql_client,
+            config,
+            settings.page_size,
+            cache,
+            scope,
+            raw=settings.raw_decoding,
+            classes=classes,
+        )
+        touched = config
+    else:
+        # The object may have been changed such that it is no longer in the
+        # refreshed snapshot, e.g. terminated, so it is looked up before the
+        # refresh as well.
+        user_keys = find_user_keys(cached.snapshot, model, uuid)
+        cached = await refresh_snapshot(
+            graphql_client,
+            config,
+            settings.page_size,
+            cached,
+            raw=settings.raw_decoding,
+            classes=classes,
+        )
+        user_keys |= find_user_keys(cached.snapshot, model, uuid)
+        touched = touched_config(config, model, user_keys)
+    snapshot = cached.snapshot
+    if touched is None:
+        logger.debug("Ignoring unmanaged object", model=model, uuid=uuid)
+        cache.save(scope, cached)
+        return None
+
+    ensure_plan = plan(touched, snapshot, settings.uuid_namespace)
+    await apply(ensure_plan, graphql_client, batcher, snapshot)
+    watermark = await advance_watermark(
+        graphql_client,
+        settings.page_size,
+        cached.watermark,
+        written_uuids(ensure_plan, snapshot),
+        raw=settings.raw_decoding,
+    )
+    cache.save(scope, replace(cached, watermark=watermark))
+    return ensure_plan
+
+
+@router.register("class")
+@router.register("facet")
+@router.register("itsystem")
+async def on_change(service: Service, model: RoutingKey, uuid: PayloadUUID) -> None:
+    """Reconcile a managed object whenever it is changed in MO."""
+    logger.info("Object changed", model=model, uuid=uuid)
+    await service.ensure(model, uuid)
+
+
+def add_event_listener(
+    integration: FastAPIIntegrationSystem, settings: AMQPConnectionSettings
+) -> None:
+    """Listen for changes to managed objects over AMQP.
+
+    Args:
+        integration: Integration to add the listener to. The service must be in
+            its context.
+        settings: AMQP connection settings.
+    """
+    if settings.queue_prefix is None:
+        settings = settings.copy(update={"queue_prefix": "os2mo-init"})
+    amqpsystem = MOAMQPSystem(
+        settings=settings, router=router, context=integration.get_context()
+    )
+
+    async def healthcheck_amqp(context: Context) -> bool:
+        return amqpsystem.healthcheck()
+
+    # Started last, such that the clients are ready before any event is handled
+    integration.add_lifespan_manager(amqpsystem, priority=1000)
+    integration.add_healthcheck(name="AMQP", healthcheck=healthcheck_amqp)
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class Executor:
+    """Run operations concurrently, with an upper bound on concurrency.
+
+    The same executor is shared between all stages of a run, so the concurrency
+    limit applies to the number of in-flight requests against MO as a whole.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def execute(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run a single operation, once the concurrency limit allows it."""
+        async with self.semaphore:
+            return await operation()
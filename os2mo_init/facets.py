@@ -1,36 +1,91 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
+from functools import partial
+from uuid import UUID
+
 import structlog
 
-from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.batch import Mutation
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.plan import Action
+from os2mo_init.plan import FacetOperation
+from os2mo_init.scheduler import Scheduler
+from os2mo_init.tracing import span
+from os2mo_init.uuids import deterministic_uuid
 
 logger = structlog.stdlib.get_logger()
 
 
-async def ensure_facets(
-    client: GraphQLClient,
+def plan_facets(
+    existing_facets: dict[str, UUID],
     config_facets: set[str],
-) -> None:
+    uuid_namespace: UUID | None = None,
+) -> list[FacetOperation]:
     """
-    Ensure that the given facets exists.
+    Plan the operations needed to ensure that the given facets exists.
 
     Args:
-        client: MO GraphQL client.
+        existing_facets: Dictionary mapping from user key to UUID of existing facets.
         config_facets: Desired facets.
-    """
-    logger.info("Ensuring facets", facets=config_facets)
+        uuid_namespace: Namespace of deterministic UUIDs for created facets, if any.
 
-    existing_facets = {
-        o.current.user_key
-        for o in (await client.facets_query()).objects
-        if o.current is not None
-    }
+    Returns:
+        Operation for each of the desired facets.
+    """
+    logger.info("Planning facets", facets=config_facets)
     logger.debug("Existing facets", existing=existing_facets)
 
-    missing_facets = config_facets - existing_facets
+    operations = []
+    for user_key in sorted(config_facets):
+        uuid = existing_facets.get(user_key)
+        if uuid is None:
+            action = Action.CREATE
+            uuid = deterministic_uuid(uuid_namespace, "facet", user_key)
+        else:
+            action = Action.NOOP
+        operations.append(FacetOperation(action=action, uuid=uuid, user_key=user_key))
+    return operations
+
+
+def schedule_facets(
+    scheduler: Scheduler,
+    batcher: MutationBatcher,
+    operations: list[FacetOperation],
+    facets: dict[str, UUID],
+) -> None:
+    """
+    Schedule the given facet operations.
+
+    Each created facet is scheduled as `("facet", user_key)`.
 
-    for user_key in missing_facets:
-        logger.info("Creating facet", user_key=user_key)
-        await client.create_facet_mutation(
-            user_key=user_key,
+    Args:
+        scheduler: Scheduler running the operations.
+        batcher: Batcher executing the mutations.
+        operations: Planned facet operations.
+        facets: Dictionary mapping from user key to UUID of facets, which is
+            updated with the facets of the operations.
+    """
+    facets.update({o.user_key: o.uuid for o in operations if o.uuid is not None})
+
+    async def create(operation: FacetOperation) -> None:
+        # Imported here, since the input types are slow to import, and not needed
+        # by runs which write nothing
+        from os2mo_init.autogenerated_graphql_client import FacetCreateInput
+        from os2mo_init.autogenerated_graphql_client import ValidityInput
+
+        logger.info("Creating facet", user_key=operation.user_key)
+        mutation = Mutation(
+            "facet_create",
+            FacetCreateInput(
+                uuid=operation.uuid,
+                user_key=operation.user_key,
+                validity=ValidityInput(from_=None),
+            ),
         )
+        with span("write facet", user_key=operation.user_key, action="create"):
+            uuid = await batcher.submit(operation.user_key, mutation)
+        facets[operation.user_key] = uuid
+
+    for operation in operations:
+        if operation.action == Action.CREATE:
+            scheduler.add(("facet", operation.user_key), partial(create, operation))
@@ -1,45 +1,126 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
+from functools import partial
+from uuid import UUID
+
 import structlog
 
-from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.batch import Mutation
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.plan import Action
+from os2mo_init.plan import ITSystemOperation
+from os2mo_init.scheduler import Scheduler
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.tracing import span
+from os2mo_init.uuids import deterministic_uuid
 
 logger = structlog.stdlib.get_logger()
 
 
-async def ensure_it_systems(
-    client: GraphQLClient,
+def plan_it_systems(
+    existing_it_systems: dict[str, ITSystem],
     config_it_systems: dict[str, str],
-) -> None:
-    """Ensure that the given IT Systems exists.
+    uuid_namespace: UUID | None = None,
+) -> list[ITSystemOperation]:
+    """Plan the operations needed to ensure that the given IT Systems exists.
 
     Args:
-        client: MO GraphQL client.
+        existing_it_systems: Dictionary mapping from user key to existing IT System.
         config_it_systems: Dictionary mapping from desired IT System user key to name.
-    """
-    logger.info("Ensuring IT Systems", it_systems=config_it_systems)
+        uuid_namespace: Namespace of deterministic UUIDs for created IT Systems, if
+            any.
 
-    existing_it_systems = {
-        o.current.user_key: o.current
-        for o in (await client.i_t_systems_query()).objects
-        if o.current is not None
-    }
+    Returns:
+        Operation for each of the desired IT Systems.
+    """
+    logger.info("Planning IT Systems", it_systems=config_it_systems)
     logger.debug("Existing IT Systems", existing=existing_it_systems)
 
+    operations = []
     for user_key, name in config_it_systems.items():
-        try:
-            existing = existing_it_systems[user_key]
-        except KeyError:
-            logger.info("Creating IT System", user_key=user_key)
-            await client.create_i_t_system_mutation(
+        existing = existing_it_systems.get(user_key)
+        if existing is None:
+            action = Action.CREATE
+        elif existing.name != name:
+            action = Action.UPDATE
+        else:
+            action = Action.NOOP
+        operations.append(
+            ITSystemOperation(
+                action=action,
+                uuid=existing.uuid
+                if existing is not None
+                else deterministic_uuid(uuid_namespace, "itsystem", user_key),
                 user_key=user_key,
                 name=name,
             )
-            continue
-        if existing.name != name:
-            logger.info("Updating IT System", user_key=user_key)
-            await client.update_i_t_system_mutation(
-                uuid=existing.uuid,
-                user_key=user_key,
-                name=name,
+        )
+    return operations
+
+
+def schedule_it_systems(
+    scheduler: Scheduler,
+    batcher: MutationBatcher,
+    operations: list[ITSystemOperation],
+    it_systems: dict[str, ITSystem],
+) -> None:
+    """Schedule the given IT System operations.
+
+    Each created or updated IT System is scheduled as `("it_system", user_key)`.
+
+    Args:
+        scheduler: Scheduler running the operations.
+        batcher: Batcher executing the mutations.
+        operations: Planned IT System operations.
+        it_systems: Dictionary mapping from user key to IT System, which is updated
+            with the IT Systems of the operations.
+    """
+
+    async def write(operation: ITSystemOperation) -> None:
+        # Imported here, since the input types are slow to import, and not needed
+        # by runs which write nothing
+        from os2mo_init.autogenerated_graphql_client import ITSystemCreateInput
+        from os2mo_init.autogenerated_graphql_client import ITSystemUpdateInput
+        from os2mo_init.autogenerated_graphql_client import RAOpenValidityInput
+
+        if operation.action == Action.CREATE:
+            logger.info("Creating IT System", user_key=operation.user_key)
+            mutation = Mutation(
+                "itsystem_create",
+                ITSystemCreateInput(
+                    uuid=operation.uuid,
+                    user_key=operation.user_key,
+                    name=operation.name,
+                    validity=RAOpenValidityInput(from_=None),
+                ),
+            )
+        else:
+            assert operation.uuid is not None
+            logger.info("Updating IT System", user_key=operation.user_key)
+            mutation = Mutation(
+                "itsystem_update",
+                ITSystemUpdateInput(
+                    uuid=operation.uuid,
+                    user_key=operation.user_key,
+                    name=operation.name,
+                    validity=RAOpenValidityInput(from_=None),
+                ),
             )
+        with span(
+            "write it_system",
+            user_key=operation.user_key,
+            action=operation.action.value,
+        ):
+            uuid = await batcher.submit(operation.user_key, mutation)
+        it_systems[operation.user_key] = ITSystem(
+            uuid=uuid, user_key=operation.user_key, name=operation.name
+        )
+
+    for operation in operations:
+        if operation.action == Action.NOOP:
+            assert operation.uuid is not None
+            it_systems[operation.user_key] = ITSystem(
+                uuid=operation.uuid, user_key=operation.user_key, name=operation.name
+            )
+            continue
+        scheduler.add(("it_system", operation.user_key), partial(write, operation))
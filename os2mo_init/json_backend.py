@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import json
+from typing import Any
+from typing import Protocol
+from typing import cast
+
+import httpx
+import orjson
+from pydantic.json import pydantic_encoder
+
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import GraphQLClientGraphQLMultiError
+from os2mo_init.autogenerated_graphql_client import GraphQLClientHttpError
+from os2mo_init.autogenerated_graphql_client import GraphQlClientInvalidResponseError
+
+
+class JSONBackend(Protocol):
+    """Encoder and decoder of the JSON bodies of GraphQL requests and responses."""
+
+    name: str
+
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class StdlibJSON:
+    """The standard library `json` module, as used by the generated client."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=pydantic_encoder).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJSON:
+    """orjson, which encodes UUIDs, datetimes and enums natively.
+
+    Other types, e.g. pydantic models, fall back to pydantic's encoder.
+    """
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=pydantic_encoder)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+BACKENDS: dict[str, type[JSONBackend]] = {
+    StdlibJSON.name: StdlibJSON,
+    OrjsonJSON.name: OrjsonJSON,
+}
+
+
+def get_backend(name: str | None = None) -> JSONBackend:
+    """Get a JSON backend by name.
+
+    Args:
+        name: Name of the backend. If `None`, the fastest backend, orjson, is used.
+
+    Returns:
+        The JSON backend.
+    """
+    if name is None:
+        name = OrjsonJSON.name
+    return BACKENDS[name]()
+
+
+class FastJSONGraphQLClient(GraphQLClient):
+    """GraphQL client encoding requests and decoding responses with a JSON backend.
+
+    The generated client encodes requests with the standard library and decodes
+    responses from text. This client works on the bytes directly instead, which is
+    significant for large snapshot responses and batched mutation documents.
+
+    Args:
+        json_backend: Backend to use. The fastest backend by default.
+        args: Arguments of the generated client.
+        kwargs: Keyword arguments of the generated client.
+    """
+
+    def __init__(
+        self, *args: Any, json_backend: JSONBackend | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.json_backend = json_backend or get_backend()
+
+    async def execute(
+        self, query: str, variables: dict[str, Any] | None = None
+    ) -> httpx.Response:
+        payload: dict[str, Any] = {"query": query}
+        if variables:
+            payload["variables"] = self._convert_dict_to_json_serializable(variables)
+        return await self.http_client.post(
+            url=self.url,
+            content=self.json_backend.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        if not response.is_success:
+            raise GraphQLClientHttpError(
+                status_code=response.status_code, response=response
+            )
+
+        try:
+            response_json = self.json_backend.loads(response.content)
+        except ValueError as exc:
+            raise GraphQlClientInvalidResponseError(response=response) from exc
+
+        if (not isinstance(response_json, dict)) or ("data" not in response_json):
+            raise GraphQlClientInvalidResponseError(response=response)
+
+        data = response_json["data"]
+        errors = response_json.get("errors")
+
+        if errors:
+            raise GraphQLClientGraphQLMultiError.from_errors_dicts(
+                errors_dicts=errors, data=data
+            )
+
+        return cast(dict[str, Any], data)
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+from prometheus_client import REGISTRY
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import write_to_textfile
+
+from os2mo_init.plan import Plan
+
+GRAPHQL_REQUEST_DURATION = Histogram(
+    "os2mo_init_graphql_request_duration_seconds",
+    "Latency of GraphQL requests to MO, including reading the response",
+    ["operation"],
+)
+GRAPHQL_REQUEST_BYTES = Counter(
+    "os2mo_init_graphql_request_bytes",
+    "Bytes sent in GraphQL requests to MO",
+    ["operation"],
+)
+GRAPHQL_RESPONSE_BYTES = Counter(
+    "os2mo_init_graphql_response_bytes",
+    "Bytes received in GraphQL responses from MO, after decompression",
+    ["operation"],
+)
+OPERATIONS = Counter(
+    "os2mo_init_operations",
+    "Operations applied to MO",
+    ["kind", "action"],
+)
+STAGE_DURATION = Histogram(
+    "os2mo_init_stage_duration_seconds",
+    "Duration of each stage of a reconciliation",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+OPERATION_NAME = re.compile(rb"\b(?:query|mutation)\s+(\w+)")
+
+
+def operation_name(request: httpx.Request) -> str | None:
+    """Find the name of the GraphQL operation of a request, if it is one."""
+    match = OPERATION_NAME.search(request.content)
+    if match is None:
+        return None
+    return match.group(1).decode()
+
+
+async def on_request(request: httpx.Request) -> None:
+    request.extensions["os2mo_init_start"] = time.perf_counter()
+
+
+async def on_response(response: httpx.Response) -> None:
+    request = response.request
+    operation = operation_name(request)
+    # E.g. token requests
+    if operation is None:
+        return
+    await response.aread()
+    duration = time.perf_counter() - request.extensions["os2mo_init_start"]
+    GRAPHQL_REQUEST_DURATION.labels(operation).observe(duration)
+    GRAPHQL_REQUEST_BYTES.labels(operation).inc(len(request.content))
+    GRAPHQL_RESPONSE_BYTES.labels(operation).inc(len(response.content))
+
+
+# Event hooks of the MO HTTPX client, measuring each GraphQL request
+EVENT_HOOKS: dict[str, list[Callable[..., Any]]] = {
+    "request": [on_request],
+    "response": [on_response],
+}
+
+
+def count_operations(plan: Plan) -> None:
+    """Count the operations of an applied plan."""
+    if plan.root_organisation is not None:
+        OPERATIONS.labels(
+            "root_organisation", plan.root_organisation.action.value
+        ).inc()
+    for it_system in plan.it_systems:
+        OPERATIONS.labels("it_system", it_system.action.value).inc()
+    for facet in plan.facets:
+        OPERATIONS.labels("facet", facet.action.value).inc()
+    for class_ in plan.classes:
+        OPERATIONS.labels("class", class_.action.value).inc()
+
+
+def write_metrics(path: Path) -> None:
+    """Write all metrics to a file, for Prometheus' node exporter textfile collector.
+
+    The file is replaced atomically, so it is never read half-written.
+    """
+    write_to_textfile(str(path), REGISTRY)
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from datetime import datetime
+from typing import TypeVar
+from uuid import UUID
+
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.records import ClassRecord
+from os2mo_init.records import FacetRecord
+from os2mo_init.records import ITSystemRecord
+from os2mo_init.records import RegistrationRecord
+from os2mo_init.records import classes_page
+from os2mo_init.records import facets_page
+from os2mo_init.records import it_systems_page
+from os2mo_init.records import registrations_page
+
+T = TypeVar("T")
+
+
+async def consume(
+    pages: AsyncIterator[list[T]], callback: Callable[[list[T]], None]
+) -> None:
+    """Call the callback with each page as soon as it has been fetched."""
+    async for page in pages:
+        callback(page)
+
+
+async def iter_facets(
+    client: GraphQLClient,
+    page_size: int,
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> AsyncIterator[list[FacetRecord]]:
+    """Fetch all facets in MO, page by page.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of facets fetched per request.
+        cursor: Cursor to continue from, e.g. after a previously fetched page.
+        uuids: Only fetch the facets with these UUIDs. All, if `None`.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Yields:
+        A page of facets.
+    """
+    while True:
+        page = await facets_page(client, page_size, cursor=cursor, uuids=uuids, raw=raw)
+        yield page.objects
+        cursor = page.next_cursor
+        if cursor is None:
+            return
+
+
+async def iter_it_systems(
+    client: GraphQLClient,
+    page_size: int,
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> AsyncIterator[list[ITSystemRecord]]:
+    """Fetch all IT systems in MO, page by page.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of IT systems fetched per request.
+        cursor: Cursor to continue from, e.g. after a previously fetched page.
+        uuids: Only fetch the IT systems with these UUIDs. All, if `None`.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Yields:
+        A page of IT systems.
+    """
+    while True:
+        page = await it_systems_page(
+            client, page_size, cursor=cursor, uuids=uuids, raw=raw
+        )
+        yield page.objects
+        cursor = page.next_cursor
+        if cursor is None:
+            return
+
+
+async def iter_classes(
+    client: GraphQLClient,
+    page_size: int,
+    facet_user_keys: list[str],
+    class_user_keys: list[str],
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> AsyncIterator[list[ClassRecord]]:
+    """Fetch the given classes in MO, page by page.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of classes fetched per request.
+        facet_user_keys: User keys of the facets to fetch classes from.
+        class_user_keys: User keys of the classes to fetch.
+        cursor: Cursor to continue from, e.g. after a previously fetched page.
+        uuids: Only fetch the classes with these UUIDs. All, if `None`.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Yields:
+        A page of classes.
+    """
+    while True:
+        page = await classes_page(
+            client,
+            page_size,
+            facet_user_keys=facet_user_keys,
+            class_user_keys=class_user_keys,
+            cursor=cursor,
+            uuids=uuids,
+            raw=raw,
+        )
+        yield page.objects
+        cursor = page.next_cursor
+        if cursor is None:
+            return
+
+
+async def iter_registrations(
+    client: GraphQLClient,
+    page_size: int,
+    models: list[str],
+    uuids: list[UUID] | None = None,
+    start: datetime | None = None,
+    raw: bool = False,
+) -> AsyncIterator[list[RegistrationRecord]]:
+    """Fetch registrations in MO, page by page.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of registrations fetched per request.
+        models: Models to fetch registrations for, e.g. `"class"`.
+        uuids: UUIDs of the objects to fetch registrations for. All, if `None`.
+        start: Only fetch registrations starting at or after this time.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Yields:
+        A page of registrations.
+    """
+    cursor = None
+    while True:
+        page = await registrations_page(
+            client,
+            page_size,
+            models=models,
+            uuids=uuids,
+            start=start,
+            cursor=cursor,
+            raw=raw,
+        )
+        yield page.objects
+        cursor = page.next_cursor
+        if cursor is None:
+            return
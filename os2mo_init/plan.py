@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Action(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    NOOP = "noop"
+
+
+class RootOrganisationOperation(BaseModel):
+    action: Action
+    municipality_code: int | None
+
+
+class ITSystemOperation(BaseModel):
+    action: Action
+    uuid: UUID | None
+    user_key: str
+    name: str
+
+
+class FacetOperation(BaseModel):
+    action: Action
+    uuid: UUID | None
+    user_key: str
+
+
+class ClassOperation(BaseModel):
+    action: Action
+    uuid: UUID | None
+    facet: str
+    user_key: str
+    name: str
+    scope: str | None
+    it_system: str | None
+
+
+class Plan(BaseModel):
+    """The complete set of operations needed to reconcile MO with the config.
+
+    Objects are referenced by user key, rather than UUID, since objects created by
+    the plan do not have a UUID until the plan is applied, unless deterministic
+    UUIDs are enabled.
+    """
+
+    root_organisation: RootOrganisationOperation | None
+    it_systems: list[ITSystemOperation] = []
+    facets: list[FacetOperation] = []
+    classes: list[ClassOperation] = []
@@ -0,0 +1,483 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Compact records of the objects read from MO by the reconcilers.
+
+The reads can be decoded in two ways: through the generated client, which
+validates each response with its pydantic models, or raw, directly from the JSON,
+which is considerably faster for large reads. Either way, the results are the same
+records.
+"""
+
+from datetime import datetime
+from typing import Any
+from typing import Generic
+from typing import NamedTuple
+from typing import TypeVar
+from uuid import UUID
+
+from os2mo_init.autogenerated_graphql_client import ClassFields
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+
+T = TypeVar("T")
+
+
+class FacetRecord(NamedTuple):
+    uuid: UUID
+    user_key: str
+
+
+class ITSystemRecord(NamedTuple):
+    uuid: UUID
+    user_key: str
+    name: str
+
+
+class ClassRecord(NamedTuple):
+    uuid: UUID
+    # User key of the facet of the class
+    facet: str
+    user_key: str
+    name: str
+    scope: str | None
+    # User key of the IT system of the class, if any
+    it_system: str | None
+
+
+class RegistrationRecord(NamedTuple):
+    start: datetime
+    model: str
+    uuid: UUID
+
+
+class Page(NamedTuple, Generic[T]):
+    objects: list[T]
+    next_cursor: str | None
+
+
+# The documents of the raw reads are those of the generated client, see
+# queries.graphql. Each includes only the fragments it uses, as GraphQL forbids
+# unused fragments.
+FACET_FIELDS = """
+fragment FacetFields on Facet {
+  uuid
+  user_key
+}
+"""
+
+IT_SYSTEM_FIELDS = """
+fragment ITSystemFields on ITSystem {
+  uuid
+  user_key
+  name
+}
+"""
+
+CLASS_FIELDS = """
+fragment ClassFields on Class {
+  facet {
+    user_key
+  }
+  uuid
+  user_key
+  name
+  scope
+  it_system {
+    uuid
+    user_key
+  }
+}
+"""
+
+FACETS_QUERY = (
+    """
+query FacetsQuery($uuids: [UUID!], $limit: int, $cursor: Cursor) {
+  facets(filter: { uuids: $uuids }, limit: $limit, cursor: $cursor) {
+    objects {
+      current {
+        ...FacetFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+}
+"""
+    + FACET_FIELDS
+)
+
+IT_SYSTEMS_QUERY = (
+    """
+query ITSystemsQuery($uuids: [UUID!], $limit: int, $cursor: Cursor) {
+  itsystems(filter: { uuids: $uuids }, limit: $limit, cursor: $cursor) {
+    objects {
+      current {
+        ...ITSystemFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+}
+"""
+    + IT_SYSTEM_FIELDS
+)
+
+CLASSES_QUERY = (
+    """
+query ClassesQuery(
+  $facet_user_keys: [String!]!
+  $class_user_keys: [String!]!
+  $uuids: [UUID!]
+  $limit: int
+  $cursor: Cursor
+) {
+  classes(
+    filter: {
+      uuids: $uuids
+      user_keys: $class_user_keys
+      from_date: null
+      to_date: null
+      facet: { user_keys: $facet_user_keys }
+    }
+    limit: $limit
+    cursor: $cursor
+  ) {
+    objects {
+      current {
+        ...ClassFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+}
+"""
+    + CLASS_FIELDS
+)
+
+SNAPSHOT_QUERY = (
+    """
+query SnapshotQuery(
+  $facet_user_keys: [String!]!
+  $class_user_keys: [String!]!
+  $limit: int
+) {
+  facets(limit: $limit) {
+    objects {
+      current {
+        ...FacetFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+  itsystems(limit: $limit) {
+    objects {
+      current {
+        ...ITSystemFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+  classes(
+    filter: {
+      user_keys: $class_user_keys
+      from_date: null
+      to_date: null
+      facet: { user_keys: $facet_user_keys }
+    }
+    limit: $limit
+  ) {
+    objects {
+      current {
+        ...ClassFields
+      }
+    }
+    page_info {
+      next_cursor
+    }
+  }
+}
+"""
+    + FACET_FIELDS
+    + IT_SYSTEM_FIELDS
+    + CLASS_FIELDS
+)
+
+REGISTRATIONS_QUERY = """
+query RegistrationsQuery(
+  $models: [String!]!
+  $uuids: [UUID!]
+  $start: DateTime
+  $limit: int
+  $cursor: Cursor
+) {
+  registrations(
+    filter: { models: $models, uuids: $uuids, start: $start }
+    limit: $limit
+    cursor: $cursor
+  ) {
+    objects {
+      start
+      model
+      uuid
+    }
+    page_info {
+      next_cursor
+    }
+  }
+}
+"""
+
+
+def class_record(fields: ClassFields) -> ClassRecord:
+    return ClassRecord(
+        uuid=fields.uuid,
+        facet=fields.facet.user_key,
+        user_key=fields.user_key,
+        name=fields.name,
+        scope=fields.scope,
+        it_system=fields.it_system.user_key if fields.it_system else None,
+    )
+
+
+# Raw decoding. Objects which are not valid at the current time are filtered out.
+
+
+def decode_facets(page: dict[str, Any]) -> Page[FacetRecord]:
+    return Page(
+        [
+            FacetRecord(UUID(c["uuid"]), c["user_key"])
+            for o in page["objects"]
+            if (c := o["current"]) is not None
+        ],
+        page["page_info"]["next_cursor"],
+    )
+
+
+def decode_it_systems(page: dict[str, Any]) -> Page[ITSystemRecord]:
+    return Page(
+        [
+            ITSystemRecord(UUID(c["uuid"]), c["user_key"], c["name"])
+            for o in page["objects"]
+            if (c := o["current"]) is not None
+        ],
+        page["page_info"]["next_cursor"],
+    )
+
+
+def decode_classes(page: dict[str, Any]) -> Page[ClassRecord]:
+    return Page(
+        [
+            ClassRecord(
+                UUID(c["uuid"]),
+                c["facet"]["user_key"],
+                c["user_key"],
+                c["name"],
+                c["scope"],
+                it_system["user_key"] if (it_system := c["it_system"]) else None,
+            )
+            for o in page["objects"]
+            if (c := o["current"]) is not None
+        ],
+        page["page_info"]["next_cursor"],
+    )
+
+
+def decode_registrations(page: dict[str, Any]) -> Page[RegistrationRecord]:
+    return Page(
+        [
+            RegistrationRecord(
+                datetime.fromisoformat(o["start"]), o["model"], UUID(o["uuid"])
+            )
+            for o in page["objects"]
+        ],
+        page["page_info"]["next_cursor"],
+    )
+
+
+async def query(
+    client: GraphQLClient, document: str, variables: dict[str, Any]
+) -> dict[str, Any]:
+    """Execute a GraphQL document, returning the undecoded data of the response."""
+    response = await client.execute(query=document, variables=variables)
+    return client.get_data(response)
+
+
+# Reads
+
+
+async def facets_page(
+    client: GraphQLClient,
+    limit: int,
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> Page[FacetRecord]:
+    if raw:
+        data = await query(
+            client,
+            FACETS_QUERY,
+            {"uuids": uuids, "limit": limit, "cursor": cursor},
+        )
+        return decode_facets(data["facets"])
+    result = await client.facets_query(uuids=uuids, limit=limit, cursor=cursor)
+    return Page(
+        [
+            FacetRecord(o.current.uuid, o.current.user_key)
+            for o in result.objects
+            if o.current is not None
+        ],
+        result.page_info.next_cursor,
+    )
+
+
+async def it_systems_page(
+    client: GraphQLClient,
+    limit: int,
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> Page[ITSystemRecord]:
+    if raw:
+        data = await query(
+            client,
+            IT_SYSTEMS_QUERY,
+            {"uuids": uuids, "limit": limit, "cursor": cursor},
+        )
+        return decode_it_systems(data["itsystems"])
+    result = await client.i_t_systems_query(uuids=uuids, limit=limit, cursor=cursor)
+    return Page(
+        [
+            ITSystemRecord(o.current.uuid, o.current.user_key, o.current.name)
+            for o in result.objects
+            if o.current is not None
+        ],
+        result.page_info.next_cursor,
+    )
+
+
+async def classes_page(
+    client: GraphQLClient,
+    limit: int,
+    facet_user_keys: list[str],
+    class_user_keys: list[str],
+    cursor: str | None = None,
+    uuids: list[UUID] | None = None,
+    raw: bool = False,
+) -> Page[ClassRecord]:
+    if raw:
+        data = await query(
+            client,
+            CLASSES_QUERY,
+            {
+                "facet_user_keys": facet_user_keys,
+                "class_user_keys": class_user_keys,
+                "uuids": uuids,
+                "limit": limit,
+                "cursor": cursor,
+            },
+        )
+        return decode_classes(data["classes"])
+    result = await client.classes_query(
+        facet_user_keys=facet_user_keys,
+        class_user_keys=class_user_keys,
+        uuids=uuids,
+        limit=limit,
+        cursor=cursor,
+    )
+    return Page(
+        [class_record(o.current) for o in result.objects if o.current is not None],
+        result.page_info.next_cursor,
+    )
+
+
+async def registrations_page(
+    client: GraphQLClient,
+    limit: int,
+    models: list[str],
+    uuids: list[UUID] | None = None,
+    start: datetime | None = None,
+    cursor: str | None = None,
+    raw: bool = False,
+) -> Page[RegistrationRecord]:
+    if raw:
+        data = await query(
+            client,
+            REGISTRATIONS_QUERY,
+            {
+                "models": models,
+                "uuids": uuids,
+                "start": start,
+                "limit": limit,
+                "cursor": cursor,
+            },
+        )
+        return decode_registrations(data["registrations"])
+    result = await client.registrations_query(
+        models=models, uuids=uuids, start=start, limit=limit, cursor=cursor
+    )
+    return Page(
+        [RegistrationRecord(o.start, o.model, o.uuid) for o in result.objects],
+        result.page_info.next_cursor,
+    )
+
+
+async def snapshot_pages(
+    client: GraphQLClient,
+    limit: int,
+    facet_user_keys: list[str],
+    class_user_keys: list[str],
+    raw: bool = False,
+) -> tuple[Page[FacetRecord], Page[ITSystemRecord], Page[ClassRecord]]:
+    """Fetch the first page of facets, IT systems and classes in a single request."""
+    if raw:
+        data = await query(
+            client,
+            SNAPSHOT_QUERY,
+            {
+                "facet_user_keys": facet_user_keys,
+                "class_user_keys": class_user_keys,
+                "limit": limit,
+            },
+        )
+        return (
+            decode_facets(data["facets"]),
+            decode_it_systems(data["itsystems"]),
+            decode_classes(data["classes"]),
+        )
+    result = await client.snapshot_query(
+        facet_user_keys=facet_user_keys, class_user_keys=class_user_keys, limit=limit
+    )
+    return (
+        Page(
+            [
+                FacetRecord(o.current.uuid, o.current.user_key)
+                for o in result.facets.objects
+                if o.current is not None
+            ],
+            result.facets.page_info.next_cursor,
+        ),
+        Page(
+            [
+                ITSystemRecord(o.current.uuid, o.current.user_key, o.current.name)
+                for o in result.itsystems.objects
+                if o.current is not None
+            ],
+            result.itsystems.page_info.next_cursor,
+        ),
+        Page(
+            [
+                class_record(o.current)
+                for o in result.classes.objects
+                if o.current is not None
+            ],
+            result.classes.page_info.next_cursor,
+        ),
+    )
@@ -8,6 +8,8 @@ from os2mo_init.autogenerated_graphql_client import GraphQLClient
 from os2mo_init.autogenerated_graphql_client import GraphQLClientGraphQLMultiError
 from os2mo_init.autogenerated_graphql_client import RootOrgQueryOrg
 from os2mo_init.config import ConfigRootOrganisation
+from os2mo_init.plan import Action
+from os2mo_init.plan import RootOrganisationOperation
 
 logger = structlog.stdlib.get_logger()
 
@@ -24,19 +26,22 @@ async def get_root_org(client: GraphQLClient) -> RootOrgQueryOrg | None:
     return result
 
 
-async def ensure_root_organisation(
-    client: GraphQLClient,
+def plan_root_organisation(
+    root_org: RootOrgQueryOrg | None,
     config_root_organisation: ConfigRootOrganisation,
-) -> None:
+) -> RootOrganisationOperation:
     """
-    Ensure that the root organisation exists with the given configuration.
+    Plan the operation needed to ensure that the root organisation exists with the
+    given configuration.
 
     Args:
-        client: MO GraphQL client.
+        root_org: Existing root organisation, if any.
         config_root_organisation: Desired root organisation.
+
+    Returns:
+        Operation for the root organisation.
     """
-    logger.info("Ensuring root org", root_org=config_root_organisation)
-    root_org = await get_root_org(client)
+    logger.info("Planning root org", root_org=config_root_organisation)
     logger.debug("Existing root org", existing=root_org)
     if root_org is not None:
         if root_org.municipality_code != config_root_organisation.municipality_code:
@@ -44,9 +49,35 @@ async def ensure_root_organisation(
                 "Changing municipality code is not implemented in OS2mo."
             )
         logger.info("Root org already configured")
-        return
+        action = Action.NOOP
+    else:
+        action = Action.CREATE
+    return RootOrganisationOperation(
+        action=action,
+        municipality_code=config_root_organisation.municipality_code,
+    )
+
 
+async def apply_root_organisation(
+    client: GraphQLClient,
+    operation: RootOrganisationOperation,
+) -> RootOrgQueryOrg | None:
+    """
+    Apply the given root organisation operation.
+
+    Args:
+        client: MO GraphQL client.
+        operation: Planned root organisation operation.
+
+    Returns:
+        The created root organisation, if any.
+    """
+    if operation.action != Action.CREATE:
+        return None
     logger.info("Creating org org")
-    await client.root_org_create(
-        municipality_code=config_root_organisation.municipality_code,
+    result = await client.root_org_create(
+        municipality_code=operation.municipality_code,
+    )
+    return RootOrgQueryOrg(
+        uuid=result.uuid, municipality_code=operation.municipality_code
     )
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.stdlib.get_logger()
+
+
+class DependencyError(Exception):
+    """An operation was skipped, since one of its dependencies failed."""
+
+
+@dataclass
+class Node:
+    operation: Callable[[], Awaitable[Any]]
+    dependencies: frozenset[Hashable]
+
+
+class Scheduler:
+    """Run operations as soon as the operations they depend on have completed.
+
+    The operations and their dependencies form a directed acyclic graph. Operations
+    which do not depend on each other run concurrently; any limit on the actual
+    number of requests against MO is enforced further down, by the executor.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[Hashable, Node] = {}
+
+    def add(
+        self,
+        key: Hashable,
+        operation: Callable[[], Awaitable[Any]],
+        dependencies: Iterable[Hashable] = (),
+    ) -> None:
+        """Add an operation to the graph.
+
+        Args:
+            key: Key uniquely identifying the operation, e.g. `("facet", user_key)`.
+            operation: The operation itself.
+            dependencies: Keys of the operations which must complete successfully
+                before this operation can start. Keys which are not part of the
+                graph, e.g. because the object already exists in MO, are ignored.
+        """
+        if key in self.nodes:
+            raise ValueError(f"Operation '{key}' already scheduled")
+        self.nodes[key] = Node(operation, frozenset(dependencies))
+
+    async def run(self) -> None:
+        """Run all operations in the graph and wait for them to finish.
+
+        Raises:
+            ExceptionGroup: If one or more operations failed.
+        """
+        if not self.nodes:
+            return
+        logger.info("Running operations", operations=len(self.nodes))
+        tasks: dict[Hashable, asyncio.Task] = {}
+
+        async def run_node(key: Hashable, node: Node) -> Any:
+            for dependency in node.dependencies:
+                if dependency not in tasks:
+                    continue
+                try:
+                    await asyncio.shield(tasks[dependency])
+                except Exception as e:
+                    raise DependencyError(
+                        f"{key}: dependency '{dependency}' failed"
+                    ) from e
+            return await node.operation()
+
+        for key, node in self.nodes.items():
+            tasks[key] = asyncio.create_task(run_node(key, node))
+        try:
+            await asyncio.wait(tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        errors = {
+            key: task.exception()
+            for key, task in tasks.items()
+            if task.exception() is not None
+        }
+        logger.info(
+            "Operations finished",
+            succeeded=len(tasks) - len(errors),
+            failed=len(errors),
+        )
+        if errors:
+            for key, error in errors.items():
+                logger.error("Operation failed", key=key, error=error)
+            raise ExceptionGroup(
+                f"{len(errors)} operation(s) failed",
+                [e for e in errors.values() if isinstance(e, Exception)],
+            )
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timezone
+from uuid import UUID
+
+import structlog
+import uvicorn
+from fastapi import APIRouter
+from fastapi import FastAPI
+from fastapi import Request
+from fastramqpi.app import FastAPIIntegrationSystem
+from pydantic import BaseModel
+
+from os2mo_init.app import create_clients
+from os2mo_init.app import init
+from os2mo_init.app import plan
+from os2mo_init.app import snapshot_scope
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.cache import MemorySnapshotCache
+from os2mo_init.cache import class_scope
+from os2mo_init.cache import load_cached_snapshot
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Mode
+from os2mo_init.config import Settings
+from os2mo_init.config import get_config_file
+from os2mo_init.events import add_event_listener
+from os2mo_init.events import ensure
+from os2mo_init.executor import Executor
+from os2mo_init.plan import Plan
+from os2mo_init.watch import FileVersion
+from os2mo_init.watch import file_version
+
+logger = structlog.stdlib.get_logger()
+
+router = APIRouter()
+
+
+class Status(BaseModel):
+    running: bool = False
+    # Start and end of the last reconciliation
+    started: datetime | None = None
+    finished: datetime | None = None
+    # Error of the last reconciliation, if it failed
+    error: str | None = None
+    # Plan applied by the last reconciliation. `None` if it was skipped, since
+    # nothing changed.
+    plan: Plan | None = None
+
+
+class Service:
+    """Clients and state kept alive across requests."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.graphql_client: GraphQLClient | None = None
+        self.batcher: MutationBatcher | None = None
+        self.cache = MemorySnapshotCache()
+        self.scope = snapshot_scope(settings)
+        # Parsed config file, the version of the file it was parsed from, and its
+        # class scope. Kept across requests, and refreshed when the file changes.
+        self.config: ConfigFile | None = None
+        self.config_version: FileVersion | None = None
+        self.class_scope = ""
+        self.status = Status()
+        # Reconciliations are serialised, as they share the snapshot cache
+        self.lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        mo_client, graphql_client = create_clients(self.settings)
+        executor = Executor(concurrency=self.settings.concurrency)
+        self.graphql_client = graphql_client
+        self.batcher = MutationBatcher(
+            graphql_client, executor, batch_size=self.settings.mutation_batch_size
+        )
+        async with mo_client, graphql_client:
+            yield
+
+    async def get_config(self) -> ConfigFile:
+        """Get the config file, only reading it again if it changed."""
+        version = file_version(self.settings.config_file)
+        if self.config is None or version is None or version != self.config_version:
+            config = await asyncio.to_thread(
+                get_config_file, self.settings.config_file, self.settings.cache_dir
+            )
+            self.config = config
+            self.config_version = version
+            self.class_scope = class_scope(config)
+        return self.config
+
+    async def reconcile(self) -> Status:
+        assert self.graphql_client is not None and self.batcher is not None
+        async with self.lock:
+            self.status = Status(running=True, started=datetime.now(timezone.utc))
+            try:
+                config = await self.get_config()
+                applied = await init(
+                    self.settings,
+                    config,
+                    self.graphql_client,
+                    self.batcher,
+                    cache=self.cache,
+                )
+            except Exception as e:
+                logger.exception("Reconciliation failed")
+                self.status.error = str(e)
+            else:
+                self.status.plan = applied
+            finally:
+                self.status.running = False
+                self.status.finished = datetime.now(timezone.utc)
+            return self.status
+
+    async def ensure(self, model: str, uuid: UUID) -> Plan | None:
+        assert self.graphql_client is not None and self.batcher is not None
+        async with self.lock:
+            config = await self.get_config()
+            return await ensure(
+                self.settings,
+                config,
+                self.graphql_client,
+                self.batcher,
+                self.cache,
+                model,
+                uuid,
+                scope=self.scope,
+                classes=self.class_scope,
+            )
+
+    async def plan(self) -> Plan:
+        assert self.graphql_client is not None
+        config = await self.get_config()
+        cached = await load_cached_snapshot(
+            self.graphql_client,
+            config,
+            self.settings.page_size,
+            self.cache,
+            self.scope,
+            raw=self.settings.raw_decoding,
+            classes=self.class_scope,
+        )
+        return plan(config, cached.snapshot, self.settings.uuid_namespace)
+
+
+def get_service(request: Request) -> Service:
+    return request.app.state.context["user_context"]["service"]
+
+
+@router.post("/reconcile")
+async def reconcile(request: Request) -> Status:
+    """Reconcile MO with the config file, returning the outcome."""
+    return await get_service(request).reconcile()
+
+
+@router.post("/plan")
+async def plan_endpoint(request: Request) -> Plan:
+    """Compute the operations needed to reconcile MO, without applying them."""
+    return await get_service(request).plan()
+
+
+@router.get("/status")
+async def status(request: Request) -> Status:
+    """Outcome of the last, or currently running, reconciliation."""
+    return get_service(request).status
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Create the FastAPI application of the service and events modes.
+
+    Args:
+        settings: Settings. Read from the environment if not given.
+
+    Returns:
+        FastAPI application.
+    """
+    if settings is None:
+        settings = Settings()
+    service = Service(settings)
+    integration = FastAPIIntegrationSystem("os2mo-init", settings)
+    integration.add_context(service=service)
+    integration.add_lifespan_manager(service.lifespan(), priority=100)
+    if settings.mode == Mode.EVENTS:
+        if settings.amqp is None:
+            raise ValueError("AMQP__URL must be set to listen for events")
+        add_event_listener(integration, settings.amqp)
+    app = integration.get_app()
+    app.include_router(router)
+    return app
+
+
+async def serve(settings: Settings) -> None:
+    """Run the service until terminated."""
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(settings), host="0.0.0.0", port=8000)
+    )
+    await server.serve()
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from uuid import UUID
+
+import structlog
+
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import RootOrgQueryOrg
+from os2mo_init.config import ConfigFile
+from os2mo_init.pagination import consume
+from os2mo_init.pagination import iter_classes
+from os2mo_init.pagination import iter_facets
+from os2mo_init.pagination import iter_it_systems
+from os2mo_init.records import ClassRecord
+from os2mo_init.records import FacetRecord
+from os2mo_init.records import ITSystemRecord
+from os2mo_init.records import snapshot_pages
+from os2mo_init.root_org import get_root_org
+
+logger = structlog.stdlib.get_logger()
+
+ClassKey = tuple[str, str]
+
+
+@dataclass
+class ITSystem:
+    uuid: UUID
+    user_key: str
+    name: str
+
+
+@dataclass
+class Class:
+    uuid: UUID
+    facet: str
+    user_key: str
+    name: str
+    scope: str | None
+    it_system: str | None
+
+    @classmethod
+    def from_record(cls, record: ClassRecord) -> "Class":
+        return cls(*record)
+
+
+@dataclass
+class Snapshot:
+    """The state of the objects in MO managed by os2mo-init.
+
+    The snapshot is loaded once at the start of a run, after which each stage keeps
+    it up to date with the objects it writes, so MO never has to be queried again.
+    """
+
+    root_organisation: RootOrgQueryOrg | None = None
+    # Facet user key to UUID
+    facets: dict[str, UUID] = field(default_factory=dict)
+    it_systems: dict[str, ITSystem] = field(default_factory=dict)
+    # (facet user key, class user key) to class
+    classes: dict[ClassKey, Class] = field(default_factory=dict)
+
+
+def class_filter(config: ConfigFile) -> tuple[list[str], list[str]]:
+    """User keys of the facets and classes in MO relevant for the configuration.
+
+    Returns:
+        Tuple of facet user keys and class user keys, each sorted, such that the
+        filter is the same in every process.
+    """
+    config_classes = config.facets or {}
+    facet_user_keys = sorted(config_classes.keys())
+    class_user_keys = sorted(
+        {
+            user_key
+            for classes in config_classes.values()
+            for user_key, _ in classes.items()
+        }
+    )
+    return facet_user_keys, class_user_keys
+
+
+async def load_snapshot(
+    client: GraphQLClient,
+    config: ConfigFile | Awaitable[ConfigFile],
+    page_size: int,
+    raw: bool = False,
+) -> Snapshot:
+    """Load the state of MO relevant for the given configuration.
+
+    The first page of facets, IT systems and classes are fetched in a single
+    GraphQL document. The root organisation is fetched in a concurrent request,
+    since `org` is non-nullable in the schema; an unconfigured root organisation
+    would otherwise null the entire response. The remaining pages, if any, are
+    then streamed concurrently, one page at a time.
+
+    If the configuration is not ready yet, e.g. since it is still being parsed,
+    the root organisation, facets and IT systems are instead streamed while waiting
+    for it, and the classes, which are filtered by it, as soon as it is ready.
+
+    Args:
+        client: MO GraphQL client.
+        config: Desired state, used to filter the classes, or an awaitable of it.
+        page_size: Maximum number of objects fetched per request.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Returns:
+        Snapshot of MO.
+    """
+    logger.info("Loading snapshot of MO")
+    snapshot = Snapshot()
+
+    def add_facets(facets: Iterable[FacetRecord]) -> None:
+        for facet in facets:
+            snapshot.facets[facet.user_key] = facet.uuid
+
+    def add_it_systems(it_systems: Iterable[ITSystemRecord]) -> None:
+        for it_system in it_systems:
+            snapshot.it_systems[it_system.user_key] = ITSystem(
+                uuid=it_system.uuid,
+                user_key=it_system.user_key,
+                name=it_system.name,
+            )
+
+    def add_classes(classes: Iterable[ClassRecord]) -> None:
+        for record in classes:
+            # TODO: fail if more than one class?
+            class_ = Class.from_record(record)
+            snapshot.classes[(class_.facet, class_.user_key)] = class_
+
+    async def load_root_org() -> None:
+        snapshot.root_organisation = await get_root_org(client)
+
+    async def load_classes(cursor: str | None = None) -> None:
+        facet_user_keys, class_user_keys = class_filter(
+            config if isinstance(config, ConfigFile) else await config
+        )
+        await consume(
+            iter_classes(
+                client,
+                page_size,
+                facet_user_keys=facet_user_keys,
+                class_user_keys=class_user_keys,
+                cursor=cursor,
+                raw=raw,
+            ),
+            add_classes,
+        )
+
+    if not isinstance(config, ConfigFile):
+        await asyncio.gather(
+            load_root_org(),
+            consume(iter_facets(client, page_size, raw=raw), add_facets),
+            consume(iter_it_systems(client, page_size, raw=raw), add_it_systems),
+            load_classes(),
+        )
+    else:
+        facet_user_keys, class_user_keys = class_filter(config)
+        _, (first_facets, first_it_systems, first_classes) = await asyncio.gather(
+            load_root_org(),
+            snapshot_pages(
+                client,
+                page_size,
+                facet_user_keys=facet_user_keys,
+                class_user_keys=class_user_keys,
+                raw=raw,
+            ),
+        )
+        add_facets(first_facets.objects)
+        add_it_systems(first_it_systems.objects)
+        add_classes(first_classes.objects)
+
+        remaining = []
+        if (cursor := first_facets.next_cursor) is not None:
+            remaining.append(
+                consume(
+                    iter_facets(client, page_size, cursor=cursor, raw=raw), add_facets
+                )
+            )
+        if (cursor := first_it_systems.next_cursor) is not None:
+            remaining.append(
+                consume(
+                    iter_it_systems(client, page_size, cursor=cursor, raw=raw),
+                    add_it_systems,
+                )
+            )
+        if (cursor := first_classes.next_cursor) is not None:
+            remaining.append(load_classes(cursor))
+        await asyncio.gather(*remaining)
+
+    logger.debug(
+        "Loaded snapshot",
+        facets=len(snapshot.facets),
+        it_systems=len(snapshot.it_systems),
+        classes=len(snapshot.classes),
+    )
+    return snapshot
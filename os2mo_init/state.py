@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import hashlib
+import json
+from collections import Counter
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import structlog
+from pydantic import BaseModel
+from pydantic import ValidationError
+
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.pagination import iter_registrations
+from os2mo_init.plan import Action
+from os2mo_init.plan import Plan
+from os2mo_init.snapshot import Snapshot
+
+logger = structlog.stdlib.get_logger()
+
+# Models of the objects managed by os2mo-init, as named in MO's registrations
+MODELS = ["class", "facet", "itsystem"]
+
+
+class State(BaseModel):
+    """The outcome of the last successful run, persisted between runs."""
+
+    # Fingerprint of everything the plan was computed from, except MO itself
+    fingerprint: str
+    # Start of the latest registration of a managed object in MO, after the run.
+    # `None` if MO had no such registrations.
+    watermark: datetime | None
+
+
+def fingerprint(*parts: Any) -> str:
+    """Compute a stable hash of the given JSON-serialisable parts."""
+
+    def default(o: Any) -> Any:
+        if isinstance(o, BaseModel):
+            return o.dict()
+        if isinstance(o, set):
+            return sorted(o)
+        return str(o)
+
+    data = json.dumps(parts, sort_keys=True, default=default)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def load_state(path: Path) -> State | None:
+    """Load the state of the last successful run, if any."""
+    if not path.exists():
+        return None
+    try:
+        return State.parse_file(path)
+    except (ValidationError, ValueError) as e:
+        logger.warning("Ignoring invalid state file", path=path, error=e)
+        return None
+
+
+def save_state(path: Path, state: State) -> None:
+    """Save the state of a successful run, atomically replacing the old state."""
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(state.json())
+    tmp.replace(path)
+
+
+async def latest_registration(
+    client: GraphQLClient,
+    page_size: int,
+    since: datetime | None,
+    raw: bool = False,
+) -> datetime | None:
+    """Find the start of the latest registration of a managed object in MO.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of registrations fetched per request.
+        since: Only consider registrations starting at or after this time.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Returns:
+        Start of the latest registration, or `since` if there are none.
+    """
+    latest = since
+    async for page in iter_registrations(
+        client, page_size, models=MODELS, start=since, raw=raw
+    ):
+        for registration in page:
+            if latest is None or registration.start > latest:
+                latest = registration.start
+    return latest
+
+
+async def advance_watermark(
+    client: GraphQLClient,
+    page_size: int,
+    watermark: datetime | None,
+    written: list[UUID],
+    raw: bool = False,
+) -> datetime | None:
+    """Move the watermark past the registrations of our own writes.
+
+    Each write registers its object once. If any other registration of a managed
+    object started after the watermark, MO was changed by others during the run, so
+    the watermark is kept, such that the next run picks up their changes.
+
+    Args:
+        client: MO GraphQL client.
+        page_size: Maximum number of registrations fetched per request.
+        watermark: Watermark taken before writing anything.
+        written: UUIDs of the objects written, as returned by `written_uuids`.
+        raw: Decode the responses directly from the JSON, bypassing the models of
+            the generated client.
+
+    Returns:
+        Start of the latest of our registrations, or `watermark` if MO was changed
+        by others after it.
+    """
+    if not written:
+        return watermark
+    remaining = Counter(written)
+    latest = watermark
+    start = watermark + timedelta(microseconds=1) if watermark is not None else None
+    async for page in iter_registrations(
+        client, page_size, models=MODELS, start=start, raw=raw
+    ):
+        for registration in page:
+            if remaining[registration.uuid] <= 0:
+                logger.info(
+                    "MO was changed during the run",
+                    model=registration.model,
+                    uuid=registration.uuid,
+                )
+                return watermark
+            remaining[registration.uuid] -= 1
+            if latest is None or registration.start > latest:
+                latest = registration.start
+    return latest
+
+
+async def changed_since(
+    client: GraphQLClient, watermark: datetime, raw: bool = False
+) -> bool:
+    """Check whether any managed object in MO was registered after the watermark."""
+    # The registration filter is inclusive, and MO's timestamps have microsecond
+    # resolution.
+    start = watermark + timedelta(microseconds=1)
+    async for page in iter_registrations(
+        client, page_size=1, models=MODELS, start=start, raw=raw
+    ):
+        if page:
+            return True
+    return False
+
+
+def written_uuids(plan: Plan, snapshot: Snapshot) -> list[UUID]:
+    """UUIDs of the managed objects written by applying the plan."""
+    uuids = [
+        snapshot.it_systems[o.user_key].uuid
+        for o in plan.it_systems
+        if o.action != Action.NOOP
+    ]
+    uuids += [
+        snapshot.facets[o.user_key] for o in plan.facets if o.action != Action.NOOP
+    ]
+    uuids += [
+        snapshot.classes[(o.facet, o.user_key)].uuid
+        for o in plan.classes
+        if o.action != Action.NOOP
+    ]
+    return uuids
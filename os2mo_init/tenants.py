@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+
+import structlog
+from pydantic import BaseModel
+
+from os2mo_init.app import create_clients
+from os2mo_init.app import init
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.config import Tenant
+from os2mo_init.executor import Executor
+from os2mo_init.plan import Action
+from os2mo_init.plan import Plan
+
+logger = structlog.stdlib.get_logger()
+
+
+class TenantResult(BaseModel):
+    name: str
+    # Whether the run was skipped, since nothing changed
+    skipped: bool = False
+    # Number of objects created and updated in MO
+    created: int = 0
+    updated: int = 0
+    # Error of the run, if it failed
+    error: str | None = None
+
+
+class Summary(BaseModel):
+    tenants: list[TenantResult]
+
+    @property
+    def failed(self) -> list[str]:
+        return [t.name for t in self.tenants if t.error is not None]
+
+
+def count(plan: Plan, action: Action) -> int:
+    """Count the operations of the plan with the given action."""
+    actions = [o.action for o in plan.it_systems]
+    actions += [o.action for o in plan.facets]
+    actions += [o.action for o in plan.classes]
+    if plan.root_organisation is not None:
+        actions.append(plan.root_organisation.action)
+    return actions.count(action)
+
+
+def tenant_settings(settings: Settings, tenant: Tenant) -> Settings:
+    """Derive the settings of a single tenant.
+
+    The state file and cache of each tenant are kept in a directory named after the
+    tenant, next to where they would otherwise be.
+    """
+    update = {
+        "mo_url": tenant.mo_url,
+        "client_id": tenant.client_id,
+        "client_secret": tenant.client_secret,
+        "auth_realm": tenant.auth_realm,
+    }
+    if tenant.auth_server is not None:
+        update["auth_server"] = tenant.auth_server
+    if settings.state_file is not None:
+        update["state_file"] = (
+            settings.state_file.parent / tenant.name / settings.state_file.name
+        )
+    if settings.cache_dir is not None:
+        update["cache_dir"] = settings.cache_dir / tenant.name
+    return settings.copy(update=update)
+
+
+async def reconcile_tenants(
+    settings: Settings, config: ConfigFile, tenants: list[Tenant]
+) -> Summary:
+    """Reconcile each of the given MO instances with the config.
+
+    Each tenant has its own clients, and thereby connection pool and token, while
+    the executor, capping the number of concurrent mutations, is shared. A failing
+    tenant does not affect the others.
+
+    Args:
+        settings: Settings, shared by all tenants.
+        config: Desired state, shared by all tenants.
+        tenants: MO instances to reconcile.
+
+    Returns:
+        Outcome of each tenant.
+    """
+    executor = Executor(concurrency=settings.concurrency)
+    semaphore = asyncio.Semaphore(settings.tenant_concurrency)
+
+    async def reconcile(tenant: Tenant) -> TenantResult:
+        result = TenantResult(name=tenant.name)
+        log = logger.bind(tenant=tenant.name)
+        async with semaphore:
+            log.info("Reconciling tenant", mo_url=tenant.mo_url)
+            settings_ = tenant_settings(settings, tenant)
+            if settings_.state_file is not None:
+                settings_.state_file.parent.mkdir(parents=True, exist_ok=True)
+            if settings_.cache_dir is not None:
+                settings_.cache_dir.mkdir(parents=True, exist_ok=True)
+            mo_client, graphql_client = create_clients(settings_)
+            batcher = MutationBatcher(
+                graphql_client, executor, batch_size=settings.mutation_batch_size
+            )
+            try:
+                async with mo_client, graphql_client:
+                    applied = await init(settings_, config, graphql_client, batcher)
+            except Exception as e:
+                log.exception("Failed to reconcile tenant")
+                result.error = str(e)
+                return result
+        if applied is None:
+            result.skipped = True
+        else:
+            result.created = count(applied, Action.CREATE)
+            result.updated = count(applied, Action.UPDATE)
+        log.info("Reconciled tenant", **result.dict(exclude={"name"}))
+        return result
+
+    results = await asyncio.gather(*(reconcile(t) for t in tenants))
+    return Summary(tenants=results)
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import json
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import ParamSpec
+from typing import TypeVar
+from weakref import WeakKeyDictionary
+
+import httpx
+import structlog
+
+from os2mo_init.metrics import operation_name
+
+logger = structlog.stdlib.get_logger()
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    name: str
+    # Lane of the span in the trace; one per asyncio task
+    lane: int
+    # Start and end, as given by `time.perf_counter`
+    start: float
+    end: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def finish(self) -> None:
+        self.end = time.perf_counter()
+
+
+class Tracer:
+    """Collect the spans of a run, for inspection as a waterfall afterwards."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        # Name of each lane
+        self.lanes: list[str] = []
+        # Lane of each live task which has run a span. Keyed by the task itself,
+        # as the ids of finished tasks are reused.
+        self.task_lanes: WeakKeyDictionary[asyncio.Task, int] = WeakKeyDictionary()
+        # Lane of spans run outside of any task
+        self.main_lane: int | None = None
+
+    def lane(self) -> int:
+        """Lane of the current task, allocating a new lane if it has none."""
+        task = asyncio.current_task()
+        lane = self.task_lanes.get(task) if task is not None else self.main_lane
+        if lane is None:
+            lane = len(self.lanes)
+            if task is not None:
+                self.lanes.append(task.get_name())
+                self.task_lanes[task] = lane
+            else:
+                self.lanes.append("main")
+                self.main_lane = lane
+        return lane
+
+    def start(self, name: str, **attributes: Any) -> Span:
+        lane = self.lane()
+        span = Span(
+            name=name, lane=lane, start=time.perf_counter(), attributes=attributes
+        )
+        self.spans.append(span)
+        return span
+
+    def export(self, path: Path) -> None:
+        """Write the finished spans to a file in the Chrome trace event format.
+
+        The file can be opened in e.g. https://ui.perfetto.dev.
+        """
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": lane,
+                "args": {"name": name},
+            }
+            for lane, name in enumerate(self.lanes)
+        ]
+        events += [
+            {
+                "name": s.name,
+                "ph": "X",
+                "pid": 1,
+                "tid": s.lane,
+                "ts": (s.start - self.origin) * 1e6,
+                "dur": (s.end - s.start) * 1e6,
+                "args": s.attributes,
+            }
+            for s in self.spans
+            if s.end is not None
+        ]
+        path.write_text(json.dumps({"traceEvents": events}, default=str))
+
+
+current_tracer: ContextVar[Tracer | None] = ContextVar("current_tracer", default=None)
+
+
+@contextmanager
+def record_trace(path: Path | None) -> Iterator[None]:
+    """Trace everything within the context, writing the trace to the file at exit.
+
+    Args:
+        path: File to write the trace to. Tracing is disabled if `None`.
+    """
+    if path is None:
+        yield
+        return
+    tracer = Tracer()
+    token = current_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        current_tracer.reset(token)
+        tracer.export(path)
+        logger.info("Trace written", path=path, spans=len(tracer.spans))
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Trace the code within the context as a span, if tracing is enabled.
+
+    Args:
+        name: Name of the span.
+        attributes: Attributes of the span. More can be added to the yielded span.
+
+    Yields:
+        The span, or `None` if tracing is disabled.
+    """
+    tracer = current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    s = tracer.start(name, **attributes)
+    try:
+        yield s
+    except BaseException as e:
+        s.attributes["error"] = repr(e)
+        raise
+    finally:
+        s.finish()
+
+
+def traced(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Trace each call of the decorated coroutine function as a span."""
+
+    def decorator(f: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @wraps(f)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(name):
+                return await f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def on_request(request: httpx.Request) -> None:
+    tracer = current_tracer.get()
+    if tracer is None:
+        return
+    operation = operation_name(request)
+    request.extensions["os2mo_init_span"] = tracer.start(
+        f"graphql {operation}" if operation else f"{request.method} {request.url.path}",
+        operation=operation,
+        request_bytes=len(request.content),
+    )
+
+
+async def on_response(response: httpx.Response) -> None:
+    s = response.request.extensions.get("os2mo_init_span")
+    if s is None:
+        return
+    await response.aread()
+    s.attributes["status_code"] = response.status_code
+    s.attributes["response_bytes"] = len(response.content)
+    s.finish()
+
+
+# Event hooks of the MO HTTPX client, tracing each request, including token requests
+EVENT_HOOKS: dict[str, list[Callable[..., Any]]] = {
+    "request": [on_request],
+    "response": [on_response],
+}
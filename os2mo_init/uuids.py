@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import json
+from uuid import UUID
+from uuid import uuid5
+
+
+def deterministic_uuid(
+    namespace: UUID | None, kind: str, *user_keys: str
+) -> UUID | None:
+    """Derive a stable UUID for an object from its kind and user key(s).
+
+    The same namespace, kind and user keys always yield the same UUID, so an object
+    created with it can be referenced, or created again, without looking it up.
+
+    Args:
+        namespace: Namespace of the UUIDs. If `None`, no UUID is derived.
+        kind: Kind of object, e.g. `"facet"`.
+        user_keys: User keys identifying the object within its kind, e.g. the facet
+            and class user keys of a class.
+
+    Returns:
+        UUIDv5 of the object, or `None` if deterministic UUIDs are disabled.
+    """
+    if namespace is None:
+        return None
+    # JSON-encode the name to keep it unambiguous if user keys contain separators
+    return uuid5(namespace, json.dumps([kind, *user_keys]))
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import structlog
+
+from os2mo_init.config import ConfigFacet
+from os2mo_init.config import ConfigFile
+
+logger = structlog.stdlib.get_logger()
+
+FileVersion = tuple[int, int, int, int]
+
+
+def file_version(path: Path) -> FileVersion | None:
+    """Identify the current version of a file.
+
+    Symlinks are followed, so atomically swapping a symlink, as Kubernetes does
+    when updating a mounted ConfigMap, yields a new version.
+
+    Returns:
+        Version of the file, or `None` if it does not exist.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+async def watch_file(
+    path: Path, interval: float, version: FileVersion | None
+) -> AsyncIterator[FileVersion]:
+    """Poll a file for changes.
+
+    Args:
+        path: File to watch.
+        interval: Seconds between each check.
+        version: Version of the file already seen.
+
+    Yields:
+        Version of the file, whenever it has changed.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        current = file_version(path)
+        # The file may briefly not exist while it is being replaced
+        if current is None or current == version:
+            continue
+        version = current
+        yield current
+
+
+def diff_config(old: ConfigFile, new: ConfigFile) -> ConfigFile | None:
+    """Compute the entries of a config which were added or changed since another.
+
+    Removed entries are ignored, as os2mo-init never deletes anything from MO. IT
+    systems referenced by changed classes are included, even if unchanged, since
+    the classes cannot be planned without them.
+
+    Args:
+        old: Previously applied config.
+        new: New config.
+
+    Returns:
+        Config with only the added or changed entries of the new config, or `None`
+        if nothing was added or changed.
+    """
+    root_organisation = None
+    if new.root_organisation != old.root_organisation:
+        root_organisation = new.root_organisation
+
+    old_facets = old.facets or {}
+    facets = {}
+    for facet_user_key, classes in (new.facets or {}).items():
+        old_classes = old_facets.get(facet_user_key)
+        old_class_data = old_classes.__root__ if old_classes is not None else {}
+        changed = {
+            user_key: class_data
+            for user_key, class_data in classes.items()
+            if old_class_data.get(user_key) != class_data
+        }
+        if changed:
+            facets[facet_user_key] = ConfigFacet(__root__=changed)
+
+    new_it_systems = new.it_systems or {}
+    old_it_systems = old.it_systems or {}
+    it_systems = {
+        user_key: name
+        for user_key, name in new_it_systems.items()
+        if old_it_systems.get(user_key) != name
+    }
+    for classes in facets.values():
+        for _, class_data in classes.items():
+            if class_data.it_system in new_it_systems:
+                it_systems[class_data.it_system] = new_it_systems[class_data.it_system]
+
+    if root_organisation is None and not facets and not it_systems:
+        return None
+    return ConfigFile(
+        root_organisation=root_organisation,
+        facets=facets or None,
+        it_systems=it_systems or None,
+    )
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Generate large synthetic configs, for scale and soak testing.
+
+Usage, e.g.:
+
+    python -m tests.benchmarks.generate --facets 20 --classes-per-facet 500 > big.yml
+    python -m tests.benchmarks.generate --facets 20 --classes-per-facet 500 \\
+        --mutated-percent 10 > big-mutated.yml
+
+The output is deterministic for a given seed, so a mutated config differs from the
+unmutated config generated with the same arguments only in the mutated classes.
+"""
+
+import argparse
+import random
+import sys
+from typing import Any
+
+import yaml
+
+from os2mo_init.app import FACETS
+from os2mo_init.config import ConfigClass
+from os2mo_init.config import ConfigFacet
+from os2mo_init.config import ConfigFile
+
+SCOPES = ["TEXT", "PHONE", "EMAIL", "DAR", "EAN", "PNUMBER", "WWW"]
+
+
+def generate_config(
+    facets: int = 10,
+    classes_per_facet: int = 100,
+    it_systems: int = 10,
+    it_system_fraction: float = 0.1,
+    seed: int = 0,
+) -> ConfigFile:
+    """Generate a valid config.
+
+    Args:
+        facets: Number of facets with classes. At most the number of facets always
+            created by os2mo-init, since classes cannot reference other facets.
+        classes_per_facet: Number of classes in each facet.
+        it_systems: Number of IT systems.
+        it_system_fraction: Fraction of the classes which reference an IT system.
+        seed: Seed of the random choices of scopes and IT systems.
+
+    Returns:
+        The generated config.
+    """
+    if facets > len(FACETS):
+        raise ValueError(f"At most {len(FACETS)} facets are supported")
+    if it_system_fraction > 0 and it_systems == 0:
+        raise ValueError("Classes cannot reference IT systems if there are none")
+    rng = random.Random(seed)
+    it_system_user_keys = [f"it-system-{i}" for i in range(it_systems)]
+    config_facets = {}
+    for facet in sorted(FACETS)[:facets]:
+        classes = {}
+        for i in range(classes_per_facet):
+            it_system = None
+            if rng.random() < it_system_fraction:
+                it_system = rng.choice(it_system_user_keys)
+            classes[f"{facet}-{i}"] = ConfigClass(
+                title=f"{facet} {i}", scope=rng.choice(SCOPES), it_system=it_system
+            )
+        config_facets[facet] = ConfigFacet(__root__=classes)
+    return ConfigFile.parse_obj(
+        {
+            "root_organisation": {"municipality_code": 123},
+            "facets": config_facets,
+            "it_systems": {k: f"IT System {k}" for k in it_system_user_keys},
+        }
+    )
+
+
+def mutate_config(config: ConfigFile, fraction: float, seed: int = 0) -> ConfigFile:
+    """Change the title and scope of a fraction of the classes of a config.
+
+    Args:
+        config: Config to mutate. It is not modified.
+        fraction: Fraction of the classes to change.
+        seed: Seed of the random choice of classes.
+
+    Returns:
+        The mutated config.
+    """
+    rng = random.Random(seed)
+    mutated = config.copy(deep=True)
+    facets = mutated.facets or {}
+    classes = [
+        (f, k) for f, facet_classes in facets.items() for k, _ in facet_classes.items()
+    ]
+    for facet, user_key in rng.sample(classes, round(len(classes) * fraction)):
+        class_data = facets[facet].__root__[user_key]
+        scope = SCOPES[0]
+        if class_data.scope in SCOPES:
+            scope = SCOPES[(SCOPES.index(class_data.scope) + 1) % len(SCOPES)]
+        facets[facet].__root__[user_key] = ConfigClass(
+            title=f"{class_data.title} (changed)",
+            scope=scope,
+            it_system=class_data.it_system,
+        )
+    return mutated
+
+
+def dump_config(config: ConfigFile) -> str:
+    """Serialise a config as YAML, as read by os2mo-init."""
+    data: dict[str, Any] = config.dict(exclude_none=True)
+    return yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--facets", type=int, default=10)
+    parser.add_argument("--classes-per-facet", type=int, default=100)
+    parser.add_argument("--it-systems", type=int, default=10)
+    parser.add_argument("--it-system-fraction", type=float, default=0.1)
+    parser.add_argument(
+        "--mutated-percent",
+        type=float,
+        default=0,
+        help="Percentage of classes with a changed title and scope",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    config = generate_config(
+        facets=args.facets,
+        classes_per_facet=args.classes_per_facet,
+        it_systems=args.it_systems,
+        it_system_fraction=args.it_system_fraction,
+        seed=args.seed,
+    )
+    if args.mutated_percent:
+        config = mutate_config(config, args.mutated_percent / 100, seed=args.seed)
+    sys.stdout.write(dump_config(config))
+
+
+if __name__ == "__main__":
+    main()
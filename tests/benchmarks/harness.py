@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Scaffolding shared by the benchmarks running os2mo-init against the fake MO."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+from os2mo_init.config import Settings
+
+# Seconds of simulated network latency and server processing time per request
+LATENCY = float(os.environ.get("BENCHMARK_LATENCY", "0.005"))
+PROCESSING_TIME = float(os.environ.get("BENCHMARK_PROCESSING_TIME", "0.001"))
+
+
+def benchmark_settings(config_file: Path, **kwargs: Any) -> Settings:
+    """Settings of os2mo-init, overridden by the given keyword arguments."""
+    return Settings(
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        config_file=config_file,
+        **kwargs,
+    )
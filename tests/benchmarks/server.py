@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Local HTTP server in front of an HTTPX transport, e.g. the fake MO.
+
+It speaks HTTP/1.1 and cleartext HTTP/2 with prior knowledge, such that the same
+backend can be benchmarked over real connections with either protocol.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import h2.config
+import h2.connection
+import h2.events
+import h11
+import httpx
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class Server:
+    """Serve the requests of HTTP connections with a transport.
+
+    Args:
+        transport: Transport handling each request, e.g. `FakeMO`.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+        # Set once serving
+        self.url = ""
+        # Number of connections accepted, by protocol
+        self.connections = {"HTTP/1.1": 0, "HTTP/2": 0}
+
+    async def respond(
+        self,
+        method: bytes,
+        target: bytes,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> httpx.Response:
+        request = httpx.Request(
+            method.decode(),
+            "http://mo" + target.decode(),
+            headers=headers,
+            content=body,
+        )
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        return response
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # Any HTTP/1.1 request is longer than the HTTP/2 preface
+            initial = await reader.readexactly(len(H2_PREFACE))
+            if initial == H2_PREFACE:
+                self.connections["HTTP/2"] += 1
+                await self.handle_h2(initial, reader, writer)
+            else:
+                self.connections["HTTP/1.1"] += 1
+                await self.handle_h11(initial, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_h11(
+        self,
+        initial: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        conn = h11.Connection(h11.SERVER)
+        conn.receive_data(initial)
+        request = None
+        body = b""
+        while True:
+            event = conn.next_event()
+            if event is h11.NEED_DATA:
+                conn.receive_data(await reader.read(65536))
+            elif isinstance(event, h11.Request):
+                request, body = event, b""
+            elif isinstance(event, h11.Data):
+                body += event.data
+            elif isinstance(event, h11.EndOfMessage):
+                assert request is not None
+                response = await self.respond(
+                    request.method, request.target, list(request.headers), body
+                )
+                writer.write(
+                    conn.send(
+                        h11.Response(
+                            status_code=response.status_code,
+                            headers=[
+                                ("content-type", "application/json"),
+                                ("content-length", str(len(response.content))),
+                            ],
+                        )
+                    )
+                    or b""
+                )
+                writer.write(conn.send(h11.Data(data=response.content)) or b"")
+                writer.write(conn.send(h11.EndOfMessage()) or b"")
+                await writer.drain()
+                conn.start_next_cycle()
+            else:
+                # The client closed the connection
+                return
+
+    async def handle_h2(
+        self,
+        initial: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        conn.initiate_connection()
+        # Requests being received, by stream
+        requests: dict[int, tuple[list[tuple[bytes, bytes]], bytearray]] = {}
+        # Set whenever the client opens its flow control window
+        window_updated = asyncio.Event()
+        tasks = set()
+
+        async def send(
+            stream_id: int, headers: list[tuple[bytes, bytes]], body: bytes
+        ) -> None:
+            pseudo = dict(headers)
+            response = await self.respond(
+                pseudo[b":method"],
+                pseudo[b":path"],
+                [(k, v) for k, v in headers if not k.startswith(b":")],
+                body,
+            )
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", str(response.status_code)),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(response.content))),
+                ],
+            )
+            data = memoryview(response.content)
+            while data:
+                window = min(
+                    conn.local_flow_control_window(stream_id),
+                    conn.max_outbound_frame_size,
+                )
+                if window <= 0:
+                    window_updated.clear()
+                    await window_updated.wait()
+                    continue
+                conn.send_data(stream_id, data[:window].tobytes())
+                data = data[window:]
+                writer.write(conn.data_to_send())
+            conn.end_stream(stream_id)
+            writer.write(conn.data_to_send())
+
+        data = initial
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = (list(event.headers), bytearray())
+                elif isinstance(event, h2.events.DataReceived):
+                    requests[event.stream_id][1].extend(event.data)
+                    conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers, body = requests.pop(event.stream_id)
+                    task = asyncio.create_task(
+                        send(event.stream_id, headers, bytes(body))
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.WindowUpdated):
+                    window_updated.set()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+@asynccontextmanager
+async def serve(transport: httpx.AsyncBaseTransport) -> AsyncIterator[Server]:
+    """Serve the transport on a random local port, available as `server.url`."""
+    server = Server(transport)
+    tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    host, port = tcp_server.sockets[0].getsockname()[:2]
+    server.url = f"http://{host}:{port}"
+    async with tcp_server:
+        yield server
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of loading the config file with the pure-Python and C YAML loaders,
+and from the cache of the validated config.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import get_config_file
+from tests.benchmarks.generate import dump_config
+from tests.benchmarks.generate import generate_config
+
+
+@pytest.mark.parametrize("classes", [1_000, 100_000])
+def test_config(tmp_path: Path, record_property: Any, classes: int) -> None:
+    """Benchmark loading a config of `classes` classes."""
+    if classes > 1_000 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(
+        dump_config(generate_config(facets=10, classes_per_facet=classes // 10))
+    )
+    cache_dir = tmp_path / "cache"
+
+    def pure_python() -> ConfigFile:
+        return ConfigFile.parse_obj(
+            yaml.load(config_file.read_bytes(), yaml.SafeLoader)
+        )
+
+    modes = {
+        "pure-python": pure_python,
+        "libyaml": lambda: get_config_file(config_file),
+        # Writes the cache
+        "cache miss": lambda: get_config_file(config_file, cache_dir),
+        "cache hit": lambda: get_config_file(config_file, cache_dir),
+    }
+    wall_times = {}
+    configs = {}
+    for mode, load in modes.items():
+        start = time.perf_counter()
+        configs[mode] = load()
+        wall_times[mode] = time.perf_counter() - start
+        record_property(f"{mode}_wall_time", wall_times[mode])
+
+    assert all(config == configs["pure-python"] for config in configs.values())
+    print(
+        f"\n{classes} classes: "
+        + ", ".join(
+            f"{mode} {t:.3f}s ({wall_times['pure-python'] / t:.1f}x)"
+            for mode, t in wall_times.items()
+        )
+    )
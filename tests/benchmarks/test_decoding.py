@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of raw decoding against the generated client's pydantic models.
+
+The snapshot of a fake MO is loaded through a transport which returns pre-encoded
+responses, such that only the client's own decoding is measured.
+"""
+
+import json
+import os
+import time
+from typing import Any
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from os2mo_init.config import ConfigFile
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.snapshot import load_snapshot
+from tests.benchmarks.generate import generate_config
+
+
+def snapshot_response(config: ConfigFile) -> bytes:
+    """Response to the snapshot query of MO converged with the config."""
+    it_systems = {
+        user_key: {"uuid": str(uuid4()), "user_key": user_key, "name": name}
+        for user_key, name in (config.it_systems or {}).items()
+    }
+    facets = config.facets or {}
+    return json.dumps(
+        {
+            "data": {
+                "facets": {
+                    "objects": [
+                        {"current": {"uuid": str(uuid4()), "user_key": facet}}
+                        for facet in facets
+                    ],
+                    "page_info": {"next_cursor": None},
+                },
+                "itsystems": {
+                    "objects": [{"current": i} for i in it_systems.values()],
+                    "page_info": {"next_cursor": None},
+                },
+                "classes": {
+                    "objects": [
+                        {
+                            "current": {
+                                "facet": {"user_key": facet},
+                                "uuid": str(uuid4()),
+                                "user_key": user_key,
+                                "name": class_.title,
+                                "scope": class_.scope,
+                                "it_system": (
+                                    it_systems[class_.it_system]
+                                    if class_.it_system
+                                    else None
+                                ),
+                            }
+                        }
+                        for facet, classes in facets.items()
+                        for user_key, class_ in classes.items()
+                    ],
+                    "page_info": {"next_cursor": None},
+                },
+            }
+        }
+    ).encode()
+
+
+@pytest.mark.parametrize("classes", [1_000, 100_000])
+async def test_decoding(record_property: Any, classes: int) -> None:
+    """Benchmark loading a snapshot of `classes` classes in a single page."""
+    if classes > 1_000 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    config = generate_config(facets=10, classes_per_facet=classes // 10)
+    response = snapshot_response(config)
+    org = json.dumps({"data": {"org": {"uuid": str(uuid4())}}}).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b"RootOrgQuery" in request.content:
+            return httpx.Response(200, content=org)
+        return httpx.Response(200, content=response)
+
+    client = FastJSONGraphQLClient(
+        url="http://mo/graphql",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    wall_times = {}
+    snapshots = {}
+    for mode, raw in (("pydantic", False), ("raw", True)):
+        start = time.perf_counter()
+        snapshots[mode] = await load_snapshot(client, config, classes, raw=raw)
+        wall_times[mode] = time.perf_counter() - start
+        record_property(f"{mode}_wall_time", wall_times[mode])
+
+    assert len(snapshots["raw"].classes) == classes
+    assert snapshots["raw"] == snapshots["pydantic"]
+    print(
+        f"\n{classes} classes: "
+        + ", ".join(
+            f"{mode} {t:.3f}s ({wall_times['pydantic'] / t:.1f}x)"
+            for mode, t in wall_times.items()
+        )
+    )
@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from pathlib import Path
+
+from os2mo_init.config import get_config_file
+from tests.benchmarks.generate import dump_config
+from tests.benchmarks.generate import generate_config
+from tests.benchmarks.generate import mutate_config
+
+
+def test_generate_config(tmp_path: Path) -> None:
+    config = generate_config(facets=3, classes_per_facet=10, it_system_fraction=0.5)
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(dump_config(config))
+    assert get_config_file(config_file) == config
+
+    assert config.facets is not None and len(config.facets) == 3
+    classes = [c for f in config.facets.values() for _, c in f.items()]
+    assert len(classes) == 30
+    assert any(c.it_system is not None for c in classes)
+
+
+def test_mutate_config() -> None:
+    config = generate_config(facets=2, classes_per_facet=10)
+    mutated = mutate_config(config, 0.25)
+    assert config.facets is not None and mutated.facets is not None
+    changed = [
+        (facet, user_key)
+        for facet, classes in config.facets.items()
+        for user_key, class_data in classes.items()
+        if mutated.facets[facet].__root__[user_key] != class_data
+    ]
+    assert len(changed) == 5
+    # The original is not modified
+    assert config == generate_config(facets=2, classes_per_facet=10)
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of `init` over HTTP/1.1 and HTTP/2 against a local fake MO server.
+
+Unlike the other benchmarks, requests go over real connections to a local server,
+so the results include the cost of the connection pool and the protocol.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from os2mo_init.app import init
+from os2mo_init.app import pool_limits
+from tests.benchmarks.generate import generate_config
+from tests.benchmarks.harness import LATENCY
+from tests.benchmarks.harness import PROCESSING_TIME
+from tests.benchmarks.harness import benchmark_settings
+from tests.benchmarks.server import serve
+from tests.fake_mo import FakeMO
+from tests.fake_mo import connect
+
+
+@pytest.mark.parametrize("protocol", ["HTTP/1.1", "HTTP/2"])
+@pytest.mark.parametrize("max_connections", [None, 1])
+@pytest.mark.parametrize("classes", [100, 10_000])
+async def test_http(
+    config_file: Path,
+    record_property: Any,
+    classes: int,
+    max_connections: int | None,
+    protocol: str,
+) -> None:
+    """Benchmark init against an empty MO with the default pool, and a single
+    connection.
+    """
+    if classes > 100 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    settings = benchmark_settings(
+        config_file,
+        max_connections=max_connections,
+        # Small batches, such that many mutation requests run concurrently
+        mutation_batch_size=10,
+    )
+    config = generate_config(facets=10, classes_per_facet=classes // 10)
+    mo = FakeMO(latency=LATENCY, processing_time=PROCESSING_TIME, workers=100)
+
+    async with serve(mo) as server:
+        # The local server does not speak TLS, so HTTP/2 is used with prior
+        # knowledge, rather than negotiated as with `HTTP2`.
+        http_client = httpx.AsyncClient(
+            base_url=server.url,
+            http1=protocol == "HTTP/1.1",
+            http2=protocol == "HTTP/2",
+            limits=pool_limits(settings),
+        )
+        start = time.perf_counter()
+        async with connect(settings, http_client) as (graphql_client, batcher):
+            await init(settings, config, graphql_client, batcher)
+        wall_time = time.perf_counter() - start
+
+    assert len(mo.classes) == classes
+    assert server.connections[protocol] > 0
+    requests = sum(mo.requests.values())
+    record_property("wall_time", wall_time)
+    record_property("requests_per_second", requests / wall_time)
+    record_property("connections", server.connections[protocol])
+    print(
+        f"\n{classes} classes, {protocol}, max_connections={max_connections}: "
+        f"{wall_time:.3f}s, {requests / wall_time:.0f} requests/s, "
+        f"{server.connections[protocol]} connections"
+    )
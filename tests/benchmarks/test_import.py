@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmark of the time it takes to import os2mo-init, as done by
+`python -m os2mo_init`, which is a considerable share of the runtime of a short run.
+
+The time budget, in seconds, can be set with BENCHMARK_IMPORT_BUDGET.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Any
+
+IMPORT_BUDGET = float(os.environ.get("BENCHMARK_IMPORT_BUDGET", "1.5"))
+
+# Modules which are slow to import, and not needed until they are used, if ever
+LAZY_MODULES = {
+    # The whole FastRAMQPI application, including its database and AMQP stacks
+    "fastramqpi.app",
+    "sqlalchemy",
+    # The input types of the generated client, only used when writing to MO
+    "os2mo_init.autogenerated_graphql_client.input_types",
+}
+
+
+def import_time() -> tuple[float, set[str]]:
+    """Import os2mo-init in a fresh interpreter.
+
+    Returns:
+        Seconds taken to import it, and the modules imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import os2mo_init.__main__"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # Each line is "import time: <self us> | <cumulative us> | <indented module>"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "[us]" not in line:
+            _, us, module = line.split("|")
+            cumulative[module.strip()] = int(us)
+    return cumulative["os2mo_init.__main__"] / 1_000_000, set(cumulative)
+
+
+def test_import_time(record_property: Any) -> None:
+    """Fail if importing os2mo-init takes longer than the budget."""
+    samples = [import_time() for _ in range(5 if os.environ.get("BENCHMARK") else 1)]
+    # The fastest sample is the least disturbed by whatever else the machine does
+    seconds = min(seconds for seconds, _ in samples)
+    _, modules = samples[0]
+    record_property("import_time", seconds)
+    print(f"\nimport os2mo_init.__main__: {seconds:.3f}s (budget {IMPORT_BUDGET}s)")
+
+    assert LAZY_MODULES.isdisjoint(modules), sorted(LAZY_MODULES & modules)
+    assert seconds < IMPORT_BUDGET
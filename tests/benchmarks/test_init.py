@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of `init` against an in-memory fake MO.
+
+Only the smallest configuration is run by default, as a smoke test. Run all of
+them with e.g.:
+
+    BENCHMARK=1 pytest tests/benchmarks -s
+
+The simulated network latency and server processing time per request can be set
+in seconds with BENCHMARK_LATENCY and BENCHMARK_PROCESSING_TIME. The fake MO runs in
+the same process, so the wall time includes its work, as well as the overhead of
+tracing memory allocations; compare results with each other, not with production.
+"""
+
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastramqpi.logging import configure_logging
+
+from os2mo_init.app import init
+from os2mo_init.config import ConfigFile
+from tests.benchmarks.generate import generate_config
+from tests.benchmarks.generate import mutate_config
+from tests.benchmarks.harness import LATENCY
+from tests.benchmarks.harness import PROCESSING_TIME
+from tests.benchmarks.harness import benchmark_settings
+from tests.fake_mo import FakeMO
+from tests.fake_mo import connect
+
+
+@pytest.mark.parametrize("mo_state", ["fresh", "converged", "updated"])
+@pytest.mark.parametrize("classes", [10, 1_000, 10_000, 100_000])
+async def test_init(
+    config_file: Path, record_property: Any, classes: int, mo_state: str
+) -> None:
+    """Benchmark init against an empty MO, one already converged with the config,
+    and one converged with a config of which 10% of the classes have since changed.
+    """
+    if classes > 10 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    settings = benchmark_settings(config_file)
+    # Logging is part of the cost of a run, so it is kept at the default level
+    configure_logging(settings.log_level)
+    config = generate_config(facets=10, classes_per_facet=classes // 10)
+    mo = FakeMO(latency=LATENCY, processing_time=PROCESSING_TIME)
+
+    async def run(config: ConfigFile) -> None:
+        http_client = httpx.AsyncClient(transport=mo, base_url="http://mo")
+        async with connect(settings, http_client) as (graphql_client, batcher):
+            await init(settings, config, graphql_client, batcher)
+
+    if mo_state in ("converged", "updated"):
+        await run(config)
+        mo.requests.clear()
+    if mo_state == "updated":
+        config = mutate_config(config, 0.1)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await run(config)
+    wall_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(mo.classes) == classes
+    if mo_state == "converged":
+        assert "BatchMutation" not in mo.requests
+    requests = sum(mo.requests.values())
+    record_property("wall_time", wall_time)
+    record_property("requests", requests)
+    record_property("peak_memory", peak_memory)
+    print(
+        f"\n{classes} classes, {mo_state}: "
+        f"{wall_time:.3f}s, {requests} requests, "
+        f"{peak_memory / 1024 / 1024:.1f} MiB peak ({dict(mo.requests)})"
+    )
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of the JSON backends against the generated client's stdlib path.
+
+Each run sends a batched mutation document and decodes a snapshot response
+through the client, against a transport which returns a pre-encoded response, such
+that only the client's own encoding and decoding is measured.
+"""
+
+import json
+import os
+import time
+from typing import Any
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from os2mo_init.autogenerated_graphql_client import ClassCreateInput
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import ValidityInput
+from os2mo_init.batch import Mutation
+from os2mo_init.batch import build_document
+from os2mo_init.json_backend import BACKENDS
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.json_backend import get_backend
+
+
+def snapshot_response(classes: int) -> bytes:
+    return json.dumps(
+        {
+            "data": {
+                "classes": {
+                    "objects": [
+                        {
+                            "current": {
+                                "facet": {"user_key": "engagement_type"},
+                                "uuid": str(uuid4()),
+                                "user_key": f"engagement_type-{i}",
+                                "name": f"Engagement type {i}",
+                                "scope": "TEXT",
+                                "it_system": None,
+                            }
+                        }
+                        for i in range(classes)
+                    ],
+                    "page_info": {"next_cursor": None},
+                }
+            }
+        }
+    ).encode()
+
+
+def batch_document(mutations: int) -> tuple[str, dict[str, Any]]:
+    facet_uuid = uuid4()
+    return build_document(
+        [
+            Mutation(
+                "class_create",
+                ClassCreateInput(
+                    uuid=uuid4(),
+                    facet_uuid=facet_uuid,
+                    user_key=f"engagement_type-{i}",
+                    name=f"Engagement type {i}",
+                    scope="TEXT",
+                    validity=ValidityInput(from_=None),
+                ),
+            )
+            for i in range(mutations)
+        ]
+    )
+
+
+@pytest.mark.parametrize("size", [1_000, 100_000])
+async def test_json(record_property: Any, size: int) -> None:
+    """Benchmark a request and response of `size` objects with each backend."""
+    if size > 1_000 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    response = snapshot_response(size)
+    query, variables = batch_document(size)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=response)
+
+    clients: dict[str, GraphQLClient] = {
+        "generated": GraphQLClient(
+            url="http://mo/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+    }
+    for name in BACKENDS:
+        clients[name] = FastJSONGraphQLClient(
+            url="http://mo/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            json_backend=get_backend(name),
+        )
+
+    wall_times = {}
+    for name, client in clients.items():
+        start = time.perf_counter()
+        data = client.get_data(await client.execute(query, variables))
+        wall_times[name] = time.perf_counter() - start
+        assert len(data["classes"]["objects"]) == size
+        record_property(f"{name}_wall_time", wall_times[name])
+
+    print(
+        f"\n{size} objects: "
+        + ", ".join(
+            f"{name} {t:.3f}s ({wall_times['generated'] / t:.1f}x)"
+            for name, t in wall_times.items()
+        )
+    )
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks of the time to the first mutation, with the config file parsed before
+MO is read, or while it is.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from os2mo_init.app import init
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import get_config_file
+from tests.benchmarks.generate import dump_config
+from tests.benchmarks.generate import generate_config
+from tests.benchmarks.harness import LATENCY
+from tests.benchmarks.harness import PROCESSING_TIME
+from tests.benchmarks.harness import benchmark_settings
+from tests.fake_mo import FakeMO
+from tests.fake_mo import connect
+
+
+class FirstMutation(FakeMO):
+    """Fake MO recording when the first mutation was received."""
+
+    first_mutation: float | None = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.first_mutation is None and b"mutation" in await request.aread():
+            self.first_mutation = time.perf_counter()
+        return await super().handle_async_request(request)
+
+
+@pytest.mark.parametrize("classes", [100, 10_000])
+async def test_startup(config_file: Path, record_property: Any, classes: int) -> None:
+    """Benchmark the time from reading the config file to the first mutation."""
+    if classes > 100 and not os.environ.get("BENCHMARK"):
+        pytest.skip("Set BENCHMARK=1 to run the larger benchmarks")
+    settings = benchmark_settings(config_file)
+    config_file.write_text(
+        dump_config(generate_config(facets=10, classes_per_facet=classes // 10))
+    )
+
+    times = {}
+    for mode in ("sequential", "overlapped"):
+        mo = FirstMutation(latency=LATENCY, processing_time=PROCESSING_TIME)
+        http_client = httpx.AsyncClient(transport=mo, base_url="http://mo")
+        async with connect(settings, http_client) as (graphql_client, batcher):
+            start = time.perf_counter()
+            parsing = asyncio.to_thread(get_config_file, config_file)
+            config: ConfigFile | asyncio.Future[ConfigFile]
+            if mode == "sequential":
+                config = await parsing
+            else:
+                config = asyncio.ensure_future(parsing)
+            await init(settings, config, graphql_client, batcher)
+        assert mo.first_mutation is not None
+        assert len(mo.classes) == classes
+        times[mode] = mo.first_mutation - start
+        record_property(f"{mode}_time_to_first_mutation", times[mode])
+
+    print(
+        f"\n{classes} classes, time to first mutation: "
+        + ", ".join(f"{mode} {t:.3f}s" for mode, t in times.items())
+    )
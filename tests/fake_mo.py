@@ -0,0 +1,289 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+"""In-memory fake of MO, shared by the tests and the benchmarks."""
+
+import asyncio
+import json
+import re
+from collections import Counter
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from uuid import uuid4
+
+import httpx
+
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.config import Settings
+from os2mo_init.executor import Executor
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.json_backend import get_backend
+
+OPERATION_NAME = re.compile(r"\b(?:query|mutation)\s+(\w+)")
+# Aliased mutations, as built by `os2mo_init.batch.build_document`
+BATCH_MUTATION = re.compile(r"(m\d+): (\w+)\(input: \$(i\d+)\)")
+
+
+def page(objects: list[Any], limit: int | None, cursor: str | None) -> dict:
+    """Paginate the objects, using the offset as the cursor."""
+    offset = int(cursor) if cursor is not None else 0
+    end = offset + limit if limit is not None else len(objects)
+    return {
+        "objects": objects[offset:end],
+        "page_info": {"next_cursor": str(end) if end < len(objects) else None},
+    }
+
+
+class FakeMO(httpx.AsyncBaseTransport):
+    """In-memory fake of the parts of MO's GraphQL API used by os2mo-init.
+
+    Args:
+        latency: Seconds of network round-trip time added to each request.
+        processing_time: Seconds each request occupies one of the server's workers.
+        workers: Number of requests processed concurrently by the server.
+    """
+
+    def __init__(
+        self, latency: float = 0, processing_time: float = 0, workers: int = 4
+    ) -> None:
+        self.latency = latency
+        self.processing_time = processing_time
+        self.workers = asyncio.Semaphore(workers)
+        # Number of requests, by operation name
+        self.requests: Counter[str] = Counter()
+
+        self.org: dict | None = None
+        self.facets: dict[str, dict] = {}
+        self.it_systems: dict[str, dict] = {}
+        self.classes: dict[str, dict] = {}
+        self.registrations: list[dict] = []
+        self.clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # Cache of filtered classes, invalidated by writes
+        self.class_filters: dict[tuple, list[dict]] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(await request.aread())
+        query, variables = body["query"], body.get("variables") or {}
+        match = OPERATION_NAME.search(query)
+        assert match is not None, query
+        operation = match.group(1)
+        self.requests[operation] += 1
+        await asyncio.sleep(self.latency)
+        async with self.workers:
+            await asyncio.sleep(self.processing_time)
+            handler: Callable[[str, dict], dict] = getattr(self, operation)
+            result = handler(query, variables)
+        return httpx.Response(200, json=result)
+
+    def register(self, model: str, uuid: str) -> None:
+        self.clock += timedelta(microseconds=1)
+        self.registrations.append({"start": self.clock, "model": model, "uuid": uuid})
+        self.class_filters.clear()
+
+    def class_fields(self, uuid: str) -> dict:
+        class_ = self.classes[uuid]
+        it_system = self.it_systems.get(class_["it_system_uuid"])
+        return {
+            "facet": {"user_key": self.facets[class_["facet_uuid"]]["user_key"]},
+            "uuid": uuid,
+            "user_key": class_["user_key"],
+            "name": class_["name"],
+            "scope": class_["scope"],
+            "it_system": (
+                {"uuid": it_system["uuid"], "user_key": it_system["user_key"]}
+                if it_system is not None
+                else None
+            ),
+        }
+
+    def filter_classes(
+        self,
+        facet_user_keys: list[str],
+        class_user_keys: list[str],
+        uuids: list[str] | None,
+    ) -> list[dict]:
+        key = (
+            tuple(facet_user_keys),
+            tuple(class_user_keys),
+            tuple(uuids) if uuids is not None else None,
+        )
+        if key not in self.class_filters:
+            facets = {
+                u for u, f in self.facets.items() if f["user_key"] in facet_user_keys
+            }
+            user_keys = set(class_user_keys)
+            uuid_set = set(uuids or ())
+            self.class_filters[key] = [
+                {"current": self.class_fields(uuid)}
+                for uuid, class_ in self.classes.items()
+                if class_["facet_uuid"] in facets
+                and class_["user_key"] in user_keys
+                and (uuids is None or uuid in uuid_set)
+            ]
+        return self.class_filters[key]
+
+    def filter(self, objects: dict[str, dict], uuids: list[str] | None) -> list[dict]:
+        if uuids is not None:
+            return [{"current": objects[u]} for u in uuids if u in objects]
+        return [{"current": o} for o in objects.values()]
+
+    # Queries
+
+    def RootOrgQuery(self, query: str, variables: dict) -> dict:
+        if self.org is None:
+            return {
+                "data": None,
+                "errors": [{"message": "ErrorCodes.E_ORG_UNCONFIGURED"}],
+            }
+        return {"data": {"org": self.org}}
+
+    def SnapshotQuery(self, query: str, variables: dict) -> dict:
+        limit = variables.get("limit")
+        return {
+            "data": {
+                "facets": page(self.filter(self.facets, None), limit, None),
+                "itsystems": page(self.filter(self.it_systems, None), limit, None),
+                "classes": page(
+                    self.filter_classes(
+                        variables["facet_user_keys"], variables["class_user_keys"], None
+                    ),
+                    limit,
+                    None,
+                ),
+            }
+        }
+
+    def FacetsQuery(self, query: str, variables: dict) -> dict:
+        objects = self.filter(self.facets, variables.get("uuids"))
+        return {
+            "data": {
+                "facets": page(objects, variables.get("limit"), variables.get("cursor"))
+            }
+        }
+
+    def ITSystemsQuery(self, query: str, variables: dict) -> dict:
+        objects = self.filter(self.it_systems, variables.get("uuids"))
+        return {
+            "data": {
+                "itsystems": page(
+                    objects, variables.get("limit"), variables.get("cursor")
+                )
+            }
+        }
+
+    def ClassesQuery(self, query: str, variables: dict) -> dict:
+        objects = self.filter_classes(
+            variables["facet_user_keys"],
+            variables["class_user_keys"],
+            variables.get("uuids"),
+        )
+        return {
+            "data": {
+                "classes": page(
+                    objects, variables.get("limit"), variables.get("cursor")
+                )
+            }
+        }
+
+    def RegistrationsQuery(self, query: str, variables: dict) -> dict:
+        start = variables.get("start")
+        start = datetime.fromisoformat(start) if start is not None else None
+        uuids = variables.get("uuids")
+        objects = [
+            {**r, "start": r["start"].isoformat()}
+            for r in self.registrations
+            if r["model"] in variables["models"]
+            and (uuids is None or r["uuid"] in uuids)
+            and (start is None or r["start"] >= start)
+        ]
+        return {
+            "data": {
+                "registrations": page(
+                    objects, variables.get("limit"), variables.get("cursor")
+                )
+            }
+        }
+
+    # Mutations
+
+    def RootOrgCreate(self, query: str, variables: dict) -> dict:
+        self.org = {
+            "uuid": str(uuid4()),
+            "municipality_code": variables.get("municipality_code"),
+        }
+        return {"data": {"org_create": {"uuid": self.org["uuid"]}}}
+
+    def BatchMutation(self, query: str, variables: dict) -> dict:
+        data = {}
+        for alias, field, variable in BATCH_MUTATION.findall(query):
+            input = variables[variable]
+            uuid = input.get("uuid") or str(uuid4())
+            if field == "facet_create":
+                self.facets[uuid] = {"uuid": uuid, "user_key": input["user_key"]}
+                self.register("facet", uuid)
+            elif field in ("itsystem_create", "itsystem_update"):
+                self.it_systems[uuid] = {
+                    "uuid": uuid,
+                    "user_key": input["user_key"],
+                    "name": input["name"],
+                }
+                self.register("itsystem", uuid)
+            elif field in ("class_create", "class_update"):
+                self.classes[uuid] = {
+                    "facet_uuid": input["facet_uuid"],
+                    "user_key": input["user_key"],
+                    "name": input["name"],
+                    "scope": input.get("scope"),
+                    "it_system_uuid": input.get("it_system_uuid"),
+                }
+                self.register("class", uuid)
+            else:
+                raise NotImplementedError(field)
+            data[alias] = {"uuid": uuid}
+        return {"data": data}
+
+
+class Drifting(FakeMO):
+    """Fake MO, in which another client renames a class during the next batch."""
+
+    drift: str | None = None
+
+    def BatchMutation(self, query: str, variables: dict) -> dict:
+        if self.drift is not None:
+            for uuid, class_ in self.classes.items():
+                if class_["user_key"] == self.drift:
+                    class_["name"] = "Drifted"
+                    self.register("class", uuid)
+            self.drift = None
+        return super().BatchMutation(query, variables)
+
+
+@asynccontextmanager
+async def connect(
+    settings: Settings, http_client: httpx.AsyncClient
+) -> AsyncIterator[tuple[FastJSONGraphQLClient, MutationBatcher]]:
+    """Connect os2mo-init to the fake MO, as `create_clients` does to MO.
+
+    Args:
+        settings: Settings.
+        http_client: HTTP client of the fake MO, with its base URL.
+
+    Yields:
+        GraphQL client and mutation batcher.
+    """
+    async with FastJSONGraphQLClient(
+        url=str(http_client.base_url.join("/graphql/v20")),
+        http_client=http_client,
+        json_backend=get_backend(settings.json_backend),
+    ) as graphql_client:
+        executor = Executor(concurrency=settings.concurrency)
+        yield (
+            graphql_client,
+            MutationBatcher(
+                graphql_client, executor, batch_size=settings.mutation_batch_size
+            ),
+        )
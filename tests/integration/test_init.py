@@ -7,7 +7,7 @@ from typing import AsyncIterator
 from unittest.mock import ANY
 
 import pytest
-from fastramqpi.app import configure_logging
+from fastramqpi.logging import configure_logging
 
 from os2mo_init.app import create_clients
 from os2mo_init.app import main
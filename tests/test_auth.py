@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from os2mo_init import auth
+from os2mo_init.auth import TokenManagedOAuth2Client
+
+
+def create_client(expires_in: int) -> tuple[TokenManagedOAuth2Client, Counter[str]]:
+    requests: Counter[str] = Counter()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests[request.url.path] += 1
+        if request.url.path == "/token":
+            # Slow enough for concurrent requests to pile up
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200,
+                json={
+                    "access_token": f"token{requests['/token']}",
+                    "token_type": "Bearer",
+                    "expires_in": expires_in,
+                },
+            )
+        return httpx.Response(200, json={"auth": request.headers["Authorization"]})
+
+    client = TokenManagedOAuth2Client(
+        base_url="http://mo",
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        token_endpoint="http://keycloak/token",
+        transport=httpx.MockTransport(handler),
+    )
+    return client, requests
+
+
+async def test_single_flight() -> None:
+    client, requests = create_client(expires_in=300)
+    async with client:
+        responses = await asyncio.gather(*(client.post("/graphql") for _ in range(10)))
+    assert {r.json()["auth"] for r in responses} == {"Bearer token1"}
+    assert requests == {"/token": 1, "/graphql": 10}
+
+
+async def test_initial_token_fetched_on_enter() -> None:
+    client, requests = create_client(expires_in=300)
+    async with client:
+        await asyncio.sleep(0.05)
+        assert requests == {"/token": 1}
+
+
+async def test_refresh_in_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "LEEWAY", 0)
+    monkeypatch.setattr(auth, "RETRY_DELAY", 0.1)
+    client, requests = create_client(expires_in=1)
+    async with client:
+        response = await client.post("/graphql")
+        assert response.json()["auth"] == "Bearer token1"
+        # Refreshed halfway through the lifetime of the token, at the latest
+        await asyncio.sleep(0.6)
+        assert requests["/token"] >= 2
+        response = await client.post("/graphql")
+        assert response.json()["auth"] != "Bearer token1"
+    assert requests["/graphql"] == 2
+
+
+async def test_refresh_expired_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "RETRY_DELAY", 0.1)
+    # Expired as soon as it is issued, e.g. due to clock skew
+    client, requests = create_client(expires_in=-1)
+    async with client:
+        await asyncio.sleep(0.35)
+    # Refetched after the retry delay, rather than in a busy loop
+    assert 2 <= requests["/token"] <= 4
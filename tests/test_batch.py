@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+
+from os2mo_init.autogenerated_graphql_client import FacetCreateInput
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import ValidityInput
+from os2mo_init.batch import Mutation
+from os2mo_init.batch import MutationBatcher
+from os2mo_init.batch import MutationError
+from os2mo_init.batch import build_document
+from os2mo_init.executor import Executor
+
+
+def facet_create(user_key: str) -> Mutation:
+    return Mutation(
+        "facet_create",
+        FacetCreateInput(user_key=user_key, validity=ValidityInput(from_=None)),
+    )
+
+
+def test_build_document() -> None:
+    query, variables = build_document([facet_create("a"), facet_create("b")])
+    assert query == (
+        "mutation BatchMutation($i0: FacetCreateInput!, $i1: FacetCreateInput!) {\n"
+        "  m0: facet_create(input: $i0) { uuid }\n"
+        "  m1: facet_create(input: $i1) { uuid }\n"
+        "}"
+    )
+    assert list(variables) == ["i0", "i1"]
+
+
+async def test_batcher() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    f"m{i}": {"uuid": str(uuid4())}
+                    for i in range(len(payload["variables"]))
+                }
+            },
+        )
+
+    client = GraphQLClient(
+        url="http://mo/graphql",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    batcher = MutationBatcher(client, Executor(concurrency=2), batch_size=2)
+
+    result = await asyncio.gather(
+        *(batcher.submit(user_key, facet_create(user_key)) for user_key in "abcde")
+    )
+
+    # Mutations submitted together are coalesced into batches
+    assert len(set(result)) == 5
+    assert len(requests) == 3
+    assert requests[0]["variables"]["i1"] == {
+        "user_key": "b",
+        "validity": {"from": None},
+    }
+
+
+async def test_batcher_maps_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "data": None,
+                "errors": [{"message": "Invalid user_key", "path": ["m1"]}],
+            },
+        )
+
+    client = GraphQLClient(
+        url="http://mo/graphql",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    batcher = MutationBatcher(client, Executor(concurrency=1), batch_size=10)
+
+    a, b = await asyncio.gather(
+        batcher.submit("a", facet_create("a")),
+        batcher.submit("b", facet_create("b")),
+        return_exceptions=True,
+    )
+
+    assert isinstance(b, MutationError)
+    assert b.key == "b"
+    assert b.message == "Invalid user_key"
+    # The outcome of the other mutation in the failed batch is unknown
+    assert isinstance(a, MutationError)
+    assert a.message.startswith("Outcome unknown")
+
+
+async def test_batcher_cancelled() -> None:
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    client = GraphQLClient(
+        url="http://mo/graphql",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    # The second batch waits for the first, as only one runs at a time
+    batcher = MutationBatcher(client, Executor(concurrency=1), batch_size=1)
+    submits = [
+        asyncio.ensure_future(batcher.submit(user_key, facet_create(user_key)))
+        for user_key in "ab"
+    ]
+    await started.wait()
+
+    # E.g. on shutdown
+    for flush in list(batcher.flushes):
+        flush.cancel()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*submits, return_exceptions=True), timeout=5
+    )
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
@@ -0,0 +1,252 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from pathlib import Path
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import httpx
+
+from os2mo_init.app import init
+from os2mo_init.autogenerated_graphql_client import ClassesQueryClasses
+from os2mo_init.autogenerated_graphql_client import FacetsQueryFacets
+from os2mo_init.autogenerated_graphql_client import RegistrationsQueryRegistrations
+from os2mo_init.autogenerated_graphql_client import RootOrgQueryOrg
+from os2mo_init.cache import CachedSnapshot
+from os2mo_init.cache import SnapshotCache
+from os2mo_init.cache import class_scope
+from os2mo_init.cache import load_cached_snapshot
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.plan import Action
+from os2mo_init.snapshot import Class
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.snapshot import Snapshot
+from tests.fake_mo import Drifting
+from tests.fake_mo import connect
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def cached_snapshot() -> CachedSnapshot:
+    snapshot = Snapshot(
+        facets={"visibility": uuid4(), "role": uuid4()},
+        it_systems={"AD": ITSystem(uuid=uuid4(), user_key="AD", name="AD")},
+        classes={
+            ("visibility", "Public"): Class(
+                uuid=uuid4(),
+                facet="visibility",
+                user_key="Public",
+                name="Public",
+                scope=None,
+                it_system="AD",
+            )
+        },
+    )
+    return CachedSnapshot(snapshot=snapshot, watermark=NOW, class_scope="classes")
+
+
+def test_snapshot_cache(tmp_path: Path) -> None:
+    # The directory is created when the cache is first saved
+    cache = SnapshotCache(tmp_path / "cache" / "snapshot.sqlite")
+    assert cache.load("scope") is None
+
+    cached = cached_snapshot()
+    cache.save("scope", cached)
+
+    assert cache.load("scope") == cached
+    assert cache.load("other scope") is None
+
+
+async def test_load_cached_snapshot(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path / "snapshot.sqlite")
+    cached = cached_snapshot()
+    cache.save("scope", cached)
+    public = cached.snapshot.classes[("visibility", "Public")]
+    role = cached.snapshot.facets["role"]
+
+    client = AsyncMock()
+    client.root_org_query.return_value = RootOrgQueryOrg(
+        uuid=uuid4(), municipality_code=None
+    )
+    client.registrations_query.return_value = RegistrationsQueryRegistrations.parse_obj(
+        {
+            "objects": [
+                {
+                    "start": NOW + timedelta(days=1),
+                    "model": "class",
+                    "uuid": public.uuid,
+                },
+                {"start": NOW + timedelta(days=2), "model": "facet", "uuid": role},
+            ],
+            "page_info": {"next_cursor": None},
+        }
+    )
+    # The class was renamed, and the facet terminated
+    client.classes_query.return_value = ClassesQueryClasses.parse_obj(
+        {
+            "objects": [
+                {
+                    "current": {
+                        "facet": {"user_key": "visibility"},
+                        "uuid": public.uuid,
+                        "user_key": "Public",
+                        "name": "Offentlig",
+                        "scope": None,
+                        "it_system": None,
+                    }
+                }
+            ],
+            "page_info": {"next_cursor": None},
+        }
+    )
+    client.facets_query.return_value = FacetsQueryFacets.parse_obj(
+        {"objects": [{"current": None}], "page_info": {"next_cursor": None}}
+    )
+    config = ConfigFile.parse_obj(
+        {"facets": {"visibility": {"Public": {"title": "Offentlig"}}}}
+    )
+
+    result = await load_cached_snapshot(
+        client, config, 10, cache, "scope", classes="classes"
+    )
+
+    assert result.watermark == NOW + timedelta(days=2)
+    assert result.snapshot.root_organisation is not None
+    assert set(result.snapshot.facets) == {"visibility"}
+    assert result.snapshot.classes[("visibility", "Public")].name == "Offentlig"
+    assert result.snapshot.it_systems == cached.snapshot.it_systems
+    assert client.registrations_query.await_args.kwargs["start"] == NOW + timedelta(
+        microseconds=1
+    )
+    assert client.classes_query.await_args.kwargs["uuids"] == [public.uuid]
+    client.i_t_systems_query.assert_not_awaited()
+    client.snapshot_query.assert_not_awaited()
+
+
+async def test_load_cached_snapshot_classes_changed(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path / "snapshot.sqlite")
+    cached = cached_snapshot()
+    cache.save("scope", cached)
+
+    client = AsyncMock()
+    client.root_org_query.return_value = RootOrgQueryOrg(
+        uuid=uuid4(), municipality_code=None
+    )
+    client.registrations_query.return_value = RegistrationsQueryRegistrations.parse_obj(
+        {"objects": [], "page_info": {"next_cursor": None}}
+    )
+    client.classes_query.return_value = ClassesQueryClasses.parse_obj(
+        {
+            "objects": [
+                {
+                    "current": {
+                        "facet": {"user_key": "visibility"},
+                        "uuid": uuid4(),
+                        "user_key": "Secret",
+                        "name": "Hemmelig",
+                        "scope": None,
+                        "it_system": None,
+                    }
+                }
+            ],
+            "page_info": {"next_cursor": None},
+        }
+    )
+    # A class was added to the config
+    config = ConfigFile.parse_obj(
+        {
+            "facets": {
+                "visibility": {
+                    "Public": {"title": "Public"},
+                    "Secret": {"title": "Hemmelig"},
+                }
+            }
+        }
+    )
+
+    result = await load_cached_snapshot(client, config, 10, cache, "scope")
+
+    # Only the classes are reloaded, and only the registrations since the
+    # watermark are read
+    assert result.class_scope == class_scope(config)
+    assert set(result.snapshot.classes) == {("visibility", "Secret")}
+    assert result.snapshot.facets == cached.snapshot.facets
+    assert result.snapshot.it_systems == cached.snapshot.it_systems
+    assert result.watermark == NOW
+    assert client.classes_query.await_args.kwargs["uuids"] is None
+    assert client.classes_query.await_args.kwargs["class_user_keys"] == [
+        "Public",
+        "Secret",
+    ]
+    assert client.registrations_query.await_args.kwargs["start"] == NOW + timedelta(
+        microseconds=1
+    )
+    client.facets_query.assert_not_awaited()
+    client.i_t_systems_query.assert_not_awaited()
+
+
+def test_class_scope_is_stable() -> None:
+    """The scope is the same in every process, regardless of hash randomisation."""
+    config = {
+        "facets": {
+            "visibility": {f"class{i}": {"title": f"Class {i}"} for i in range(20)},
+            "role": {f"class{i}": {"title": f"Class {i}"} for i in range(5)},
+        }
+    }
+    code = (
+        "import json, sys\n"
+        "from os2mo_init.cache import class_scope\n"
+        "from os2mo_init.config import ConfigFile\n"
+        "print(class_scope(ConfigFile.parse_obj(json.loads(sys.argv[1]))))\n"
+    )
+    scopes = {
+        subprocess.run(
+            [sys.executable, "-c", code, json.dumps(config)],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+        ).stdout.strip()
+        for seed in range(2)
+    }
+    assert scopes == {class_scope(ConfigFile.parse_obj(config))}
+
+
+async def test_init_cache_changed_during_run(tmp_path: Path, config_file: Path) -> None:
+    settings = Settings(
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        config_file=config_file,
+        cache_dir=tmp_path,
+    )
+    mo = Drifting()
+
+    async def run(classes: list[str]) -> dict[str, Action]:
+        config = ConfigFile.parse_obj(
+            {"facets": {"visibility": {c: {"title": c} for c in classes}}}
+        )
+        http_client = httpx.AsyncClient(transport=mo, base_url="http://mo")
+        async with connect(settings, http_client) as (graphql_client, batcher):
+            applied = await init(settings, config, graphql_client, batcher)
+        assert applied is not None
+        return {o.user_key: o.action for o in applied.classes}
+
+    await run(["Public"])
+    # Public is renamed by another client while Secret is being created
+    mo.drift = "Public"
+    await run(["Public", "Secret"])
+
+    # The cached snapshot is refreshed with the rename, rather than planned as
+    # unchanged
+    assert await run(["Public", "Secret"]) == {
+        "Public": Action.UPDATE,
+        "Secret": Action.NOOP,
+    }
+    assert {c["name"] for c in mo.classes.values()} == {"Public", "Secret"}
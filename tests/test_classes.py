@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from unittest.mock import AsyncMock
+from uuid import UUID
+from uuid import uuid4
+
+import pytest
+
+from os2mo_init.app import FACETS
+from os2mo_init.app import apply
+from os2mo_init.app import plan
+from os2mo_init.classes import plan_classes
+from os2mo_init.config import ConfigFacet
+from os2mo_init.config import ConfigFile
+from os2mo_init.plan import Action
+from os2mo_init.plan import Plan
+from os2mo_init.snapshot import Class
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.snapshot import Snapshot
+from os2mo_init.uuids import deterministic_uuid
+
+
+def existing_class(facet: str, user_key: str, it_system: str | None = None) -> Class:
+    return Class(
+        uuid=uuid4(),
+        facet=facet,
+        user_key=user_key,
+        name=user_key,
+        scope=None,
+        it_system=it_system,
+    )
+
+
+def test_plan_classes() -> None:
+    existing_classes = {
+        ("visibility", "Public"): existing_class("visibility", "Public"),
+        ("visibility", "Intern"): existing_class("visibility", "Intern"),
+        ("visibility", "Hidden"): existing_class("visibility", "Hidden", "AD"),
+    }
+    config_classes = {
+        "visibility": ConfigFacet.parse_obj(
+            {
+                "Public": {"title": "Public"},
+                "Intern": {"title": "Internal"},
+                "Hidden": {"title": "Hidden", "it_system": "AD"},
+                "Secret": {"title": "Secret", "it_system": "AD"},
+            }
+        ),
+    }
+
+    operations = plan_classes(
+        existing_classes, config_classes, facets={"visibility"}, it_systems={"AD"}
+    )
+
+    assert {o.user_key: o.action for o in operations} == {
+        "Public": Action.NOOP,
+        "Intern": Action.UPDATE,
+        "Hidden": Action.NOOP,
+        "Secret": Action.CREATE,
+    }
+
+
+def test_plan_classes_non_existent_it_system() -> None:
+    config_classes = {
+        "visibility": ConfigFacet.parse_obj(
+            {"Secret": {"title": "Secret", "it_system": "AD"}}
+        ),
+    }
+
+    with pytest.raises(ValueError, match="non-existent it-system 'AD'"):
+        plan_classes({}, config_classes, facets={"visibility"}, it_systems=set())
+
+
+async def test_plan_unmanaged_facet_and_it_system() -> None:
+    """Classes can reference facets and IT systems which only exist in MO."""
+    ad = ITSystem(uuid=uuid4(), user_key="AD", name="Active Directory")
+    custom = uuid4()
+    snapshot = Snapshot(
+        facets={"custom": custom, **{f: uuid4() for f in FACETS}},
+        it_systems={"AD": ad},
+    )
+    config = ConfigFile.parse_obj(
+        {"facets": {"custom": {"Secret": {"title": "Secret", "it_system": "AD"}}}}
+    )
+
+    init_plan = plan(config, snapshot)
+
+    assert [(o.action, o.user_key) for o in init_plan.classes] == [
+        (Action.CREATE, "Secret")
+    ]
+    assert [(o.action, o.uuid) for o in init_plan.facets if o.user_key == "custom"] == [
+        (Action.NOOP, custom)
+    ]
+    assert [(o.action, o.uuid) for o in init_plan.it_systems] == [
+        (Action.NOOP, ad.uuid)
+    ]
+
+    # The plan can be applied without a snapshot, e.g. in apply mode
+    batcher = AsyncMock()
+    batcher.submit.return_value = uuid4()
+    await apply(Plan.parse_raw(init_plan.json()), AsyncMock(), batcher, Snapshot())
+    [[_, mutation]] = [c.args for c in batcher.submit.await_args_list]
+    assert mutation.input.facet_uuid == custom
+    assert mutation.input.it_system_uuid == ad.uuid
+
+
+def test_plan_non_existent_facet() -> None:
+    config = ConfigFile.parse_obj({"facets": {"custom": {"Secret": {"title": "S"}}}})
+    with pytest.raises(ValueError, match="non-existent facet 'custom'"):
+        plan(config, Snapshot())
+
+
+def test_plan_classes_deterministic_uuids() -> None:
+    existing = existing_class("visibility", "Public")
+    config_classes = {
+        "visibility": ConfigFacet.parse_obj(
+            {"Public": {"title": "Public"}, "Secret": {"title": "Secret"}}
+        ),
+    }
+    namespace = uuid4()
+
+    def plan() -> dict[str, UUID | None]:
+        operations = plan_classes(
+            {("visibility", "Public"): existing},
+            config_classes,
+            facets={"visibility"},
+            it_systems=set(),
+            uuid_namespace=namespace,
+        )
+        return {o.user_key: o.uuid for o in operations}
+
+    uuids = plan()
+
+    # Existing classes keep their UUID, while new ones get a stable one
+    assert uuids["Public"] == existing.uuid
+    assert uuids["Secret"] == deterministic_uuid(
+        namespace, "class", "visibility", "Secret"
+    )
+    assert plan() == uuids
+    assert deterministic_uuid(namespace, "facet", "visibility") != deterministic_uuid(
+        namespace, "itsystem", "visibility"
+    )
+    assert deterministic_uuid(None, "class", "visibility", "Secret") is None
@@ -3,6 +3,11 @@
 from pathlib import Path
 from textwrap import dedent
 
+import pytest
+
+from os2mo_init import config as config_module
+from os2mo_init.config import ConfigClass
+from os2mo_init.config import ConfigRootOrganisation
 from os2mo_init.config import get_config_file
 
 
@@ -42,5 +47,58 @@ def test_get_config_file(config_file: Path) -> None:
     }
 
 
+def test_config_cache(
+    config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    config_file.write_text(
+        "root_organisation:\n  municipality_code: 101\n"
+        "facets:\n  visibility:\n    Public:\n      title: Public\n"
+        "it_systems:\n  AD: Active Directory\n"
+    )
+    config = get_config_file(config_file, cache_dir)
+    assert (cache_dir / "config.json").exists()
+
+    def load_yaml(content: bytes) -> None:
+        raise AssertionError("Unchanged config parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr(config_module, "load_yaml", load_yaml)
+        cached = get_config_file(config_file, cache_dir)
+    assert cached == config
+    assert cached.root_organisation == ConfigRootOrganisation(municipality_code=101)
+    assert cached.facets is not None
+    assert cached.facets["visibility"].__root__["Public"] == ConfigClass(
+        title="Public", scope=None, it_system=None
+    )
+
+    # A changed config file is parsed, and replaces the cached config
+    config_file.write_text("it_systems:\n  SD: SD-Løn\n")
+    changed = get_config_file(config_file, cache_dir)
+    assert changed.it_systems == {"SD": "SD-Løn"}
+    with monkeypatch.context() as m:
+        m.setattr(config_module, "load_yaml", load_yaml)
+        assert get_config_file(config_file, cache_dir) == changed
+
+
+def test_invalid_config_cache(config_file: Path, tmp_path: Path) -> None:
+    config_file.write_text("it_systems:\n  AD: Active Directory\n")
+    get_config_file(config_file, tmp_path)
+    cache = tmp_path / "config.json"
+    # Truncated, e.g. by a full disk
+    cache.write_bytes(cache.read_bytes()[:40])
+    config = get_config_file(config_file, tmp_path)
+    assert config.it_systems == {"AD": "Active Directory"}
+
+
+def test_config_cache_read_only(config_file: Path, tmp_path: Path) -> None:
+    config_file.write_text("it_systems:\n  AD: Active Directory\n")
+    # The cache cannot be written, since its directory is a file
+    cache_dir = tmp_path / "cache"
+    cache_dir.touch()
+    config = get_config_file(config_file, cache_dir)
+    assert config.it_systems == {"AD": "Active Directory"}
+
+
 def test_nothing() -> None:
     """Our CI templates requires at least two unittests."""
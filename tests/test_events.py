@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from pathlib import Path
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from os2mo_init.app import FACETS
+from os2mo_init.app import snapshot_scope
+from os2mo_init.autogenerated_graphql_client import ClassesQueryClasses
+from os2mo_init.autogenerated_graphql_client import RegistrationsQueryRegistrations
+from os2mo_init.autogenerated_graphql_client import RootOrgQueryOrg
+from os2mo_init.cache import CachedSnapshot
+from os2mo_init.cache import MemorySnapshotCache
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.events import ensure
+from os2mo_init.events import touched_config
+from os2mo_init.plan import Action
+from os2mo_init.snapshot import Class
+from os2mo_init.snapshot import ITSystem
+from os2mo_init.snapshot import Snapshot
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+CONFIG = ConfigFile.parse_obj(
+    {
+        "facets": {
+            "visibility": {
+                "Public": {"title": "Public", "it_system": "AD"},
+                "Secret": {"title": "Secret"},
+            }
+        },
+        "it_systems": {"AD": "Active Directory", "SD": "Silkeborg Data"},
+    }
+)
+
+
+def test_touched_config() -> None:
+    assert touched_config(
+        CONFIG, "class", {("visibility", "Public")}
+    ) == ConfigFile.parse_obj(
+        {
+            "facets": {
+                "visibility": {"Public": {"title": "Public", "it_system": "AD"}}
+            },
+            "it_systems": {"AD": "Active Directory"},
+        }
+    )
+    assert touched_config(CONFIG, "itsystem", {("SD",)}) == ConfigFile.parse_obj(
+        {"it_systems": {"SD": "Silkeborg Data"}}
+    )
+    assert touched_config(CONFIG, "facet", {("visibility",)}) == ConfigFile.parse_obj(
+        {}
+    )
+    assert touched_config(CONFIG, "class", {("visibility", "Private")}) is None
+    assert touched_config(CONFIG, "itsystem", set()) is None
+    assert touched_config(CONFIG, "facet", {("custom",)}) is None
+
+
+async def test_ensure_terminated_class(config_file: Path) -> None:
+    settings = Settings(
+        client_id="os2mo-init", client_secret="hunter2", config_file=config_file
+    )
+    public = Class(
+        uuid=uuid4(),
+        facet="visibility",
+        user_key="Public",
+        name="Public",
+        scope=None,
+        it_system="AD",
+    )
+    snapshot = Snapshot(
+        facets={f: uuid4() for f in FACETS},
+        it_systems={
+            "AD": ITSystem(uuid=uuid4(), user_key="AD", name="Active Directory"),
+            "SD": ITSystem(uuid=uuid4(), user_key="SD", name="Silkeborg Data"),
+        },
+        classes={("visibility", "Public"): public},
+    )
+    cache = MemorySnapshotCache()
+    scope = snapshot_scope(settings)
+    cache.save(scope, CachedSnapshot(snapshot=snapshot, watermark=NOW))
+
+    client = AsyncMock()
+    client.root_org_query.return_value = RootOrgQueryOrg(
+        uuid=uuid4(), municipality_code=None
+    )
+    client.registrations_query.return_value = RegistrationsQueryRegistrations.parse_obj(
+        {
+            "objects": [
+                {
+                    "start": NOW + timedelta(days=1),
+                    "model": "class",
+                    "uuid": public.uuid,
+                }
+            ],
+            "page_info": {"next_cursor": None},
+        }
+    )
+    # The class was terminated
+    client.classes_query.return_value = ClassesQueryClasses.parse_obj(
+        {"objects": [{"current": None}], "page_info": {"next_cursor": None}}
+    )
+    batcher = AsyncMock()
+    batcher.submit.return_value = uuid4()
+
+    result = await ensure(
+        settings, CONFIG, client, batcher, cache, "class", public.uuid
+    )
+
+    # Only the terminated class is recreated; the unchanged Secret class is not
+    # even planned.
+    assert result is not None
+    assert [(o.action, o.user_key) for o in result.classes] == [
+        (Action.CREATE, "Public")
+    ]
+    assert [o.user_key for o in result.it_systems] == ["AD"]
+    batcher.submit.assert_awaited_once()
+    cached = cache.load(scope)
+    assert cached is not None
+    assert ("visibility", "Public") in cached.snapshot.classes
+    assert cached.watermark == NOW + timedelta(days=1)
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from functools import partial
+
+from os2mo_init.executor import Executor
+
+
+async def test_executor_bounds_concurrency() -> None:
+    running = 0
+    max_running = 0
+
+    async def operation(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i * 2
+
+    executor = Executor(concurrency=3)
+    results = await asyncio.gather(
+        *(executor.execute(partial(operation, i)) for i in range(10))
+    )
+
+    assert results == [i * 2 for i in range(10)]
+    assert max_running == 3
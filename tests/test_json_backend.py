@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import json
+from datetime import datetime
+from datetime import timezone
+from uuid import UUID
+
+import httpx
+import pytest
+
+from os2mo_init.autogenerated_graphql_client import ClassCreateInput
+from os2mo_init.autogenerated_graphql_client import GraphQLClient
+from os2mo_init.autogenerated_graphql_client import GraphQLClientGraphQLMultiError
+from os2mo_init.autogenerated_graphql_client import GraphQlClientInvalidResponseError
+from os2mo_init.autogenerated_graphql_client import ValidityInput
+from os2mo_init.json_backend import BACKENDS
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.json_backend import get_backend
+
+CLASS_INPUT = ClassCreateInput(
+    uuid=UUID("f2a7ea6c-1b54-4fa6-b3c2-2a5fbd3c7a80"),
+    facet_uuid=UUID("5b3a55b1-958c-416e-9054-606b2c9e4fcd"),
+    user_key="Public",
+    name="Public",
+    validity=ValidityInput(from_=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+async def test_requests_match_generated_client(name: str) -> None:
+    requests: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.content)
+        return httpx.Response(200, json={"data": {"m0": {"uuid": str(UUID(int=1))}}})
+
+    variables = {"i0": CLASS_INPUT, "limit": None}
+    for client in (
+        GraphQLClient(
+            url="http://mo/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ),
+        FastJSONGraphQLClient(
+            url="http://mo/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            json_backend=get_backend(name),
+        ),
+    ):
+        response = await client.execute("mutation BatchMutation { m0 }", variables)
+        assert client.get_data(response) == {"m0": {"uuid": str(UUID(int=1))}}
+
+    expected, actual = (json.loads(r) for r in requests)
+    assert actual == expected
+    assert actual["variables"]["i0"]["validity"] == {
+        "from": "2024-01-01T00:00:00+00:00"
+    }
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_get_data_errors(name: str) -> None:
+    client = FastJSONGraphQLClient(
+        url="http://mo/graphql", json_backend=get_backend(name)
+    )
+    with pytest.raises(GraphQlClientInvalidResponseError):
+        client.get_data(httpx.Response(200, content=b"<html>"))
+    with pytest.raises(GraphQlClientInvalidResponseError):
+        client.get_data(httpx.Response(200, content=b"[]"))
+    with pytest.raises(GraphQLClientGraphQLMultiError):
+        client.get_data(
+            httpx.Response(200, content=b'{"data": null, "errors": [{"message": "!"}]}')
+        )
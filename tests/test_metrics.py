@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from pathlib import Path
+
+import httpx
+from prometheus_client import REGISTRY
+
+from os2mo_init.metrics import EVENT_HOOKS
+from os2mo_init.metrics import count_operations
+from os2mo_init.metrics import write_metrics
+from os2mo_init.plan import Action
+from os2mo_init.plan import FacetOperation
+from os2mo_init.plan import Plan
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def test_graphql_metrics() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": {}})
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), event_hooks=EVENT_HOOKS
+    ) as client:
+        before = sample(
+            "os2mo_init_graphql_request_duration_seconds_count",
+            operation="MetricsQuery",
+        )
+        content = b'{"query": "query MetricsQuery { org { uuid } }"}'
+        await client.post("http://mo/graphql/v20", content=content)
+        # Not a GraphQL request, e.g. fetching a token
+        await client.post("http://keycloak/token", content=b"grant_type=x")
+
+    assert (
+        sample(
+            "os2mo_init_graphql_request_duration_seconds_count",
+            operation="MetricsQuery",
+        )
+        == before + 1
+    )
+    assert sample(
+        "os2mo_init_graphql_request_bytes_total", operation="MetricsQuery"
+    ) >= len(content)
+    assert (
+        sample("os2mo_init_graphql_response_bytes_total", operation="MetricsQuery") > 0
+    )
+
+
+def test_count_operations(tmp_path: Path) -> None:
+    before = sample("os2mo_init_operations_total", kind="facet", action="create")
+    count_operations(
+        Plan(
+            root_organisation=None,
+            facets=[
+                FacetOperation(action=Action.CREATE, uuid=None, user_key="role"),
+                FacetOperation(action=Action.NOOP, uuid=None, user_key="visibility"),
+            ],
+        )
+    )
+    assert sample("os2mo_init_operations_total", kind="facet", action="create") == (
+        before + 1
+    )
+
+    metrics_file = tmp_path / "os2mo_init.prom"
+    write_metrics(metrics_file)
+    assert 'os2mo_init_operations_total{action="create",kind="facet"}' in (
+        metrics_file.read_text()
+    )
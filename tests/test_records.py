@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import json
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import httpx
+import pytest
+from graphql import ExecutableDefinitionNode
+from graphql import parse
+from graphql import print_ast
+
+from os2mo_init.json_backend import FastJSONGraphQLClient
+from os2mo_init.records import CLASSES_QUERY
+from os2mo_init.records import FACETS_QUERY
+from os2mo_init.records import IT_SYSTEMS_QUERY
+from os2mo_init.records import REGISTRATIONS_QUERY
+from os2mo_init.records import SNAPSHOT_QUERY
+from os2mo_init.records import ClassRecord
+from os2mo_init.records import RegistrationRecord
+from os2mo_init.records import classes_page
+from os2mo_init.records import facets_page
+from os2mo_init.records import it_systems_page
+from os2mo_init.records import registrations_page
+from os2mo_init.records import snapshot_pages
+
+FACET_UUID = "5b3a55b1-958c-416e-9054-606b2c9e4fcd"
+IT_SYSTEM_UUID = "96c95d04-31c7-4c6a-a7ec-3ff75bb8d5b1"
+CLASS_UUID = "f2a7ea6c-1b54-4fa6-b3c2-2a5fbd3c7a80"
+
+FACETS = {
+    "objects": [
+        {"current": {"uuid": FACET_UUID, "user_key": "visibility"}},
+        {"current": None},
+    ],
+    "page_info": {"next_cursor": "MQ=="},
+}
+IT_SYSTEMS = {
+    "objects": [
+        {"current": {"uuid": IT_SYSTEM_UUID, "user_key": "AD", "name": "AD"}},
+    ],
+    "page_info": {"next_cursor": None},
+}
+CLASSES = {
+    "objects": [
+        {
+            "current": {
+                "facet": {"user_key": "visibility"},
+                "uuid": CLASS_UUID,
+                "user_key": "Public",
+                "name": "Public",
+                "scope": None,
+                "it_system": {"uuid": IT_SYSTEM_UUID, "user_key": "AD"},
+            }
+        },
+        {"current": None},
+    ],
+    "page_info": {"next_cursor": None},
+}
+REGISTRATIONS = {
+    "objects": [
+        {
+            "start": "2024-01-01T00:00:00.000001+00:00",
+            "model": "class",
+            "uuid": CLASS_UUID,
+        },
+    ],
+    "page_info": {"next_cursor": None},
+}
+
+
+def normalise(document: str) -> list[str]:
+    """The definitions of a GraphQL document, independent of formatting and order."""
+    return sorted(print_ast(d) for d in parse(document).definitions)
+
+
+def definitions(document: str) -> dict[str, str]:
+    """The definitions of a GraphQL document by name, independent of formatting."""
+    return {
+        d.name.value: print_ast(d)
+        for d in parse(document).definitions
+        if isinstance(d, ExecutableDefinitionNode) and d.name is not None
+    }
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        FACETS_QUERY,
+        IT_SYSTEMS_QUERY,
+        CLASSES_QUERY,
+        SNAPSHOT_QUERY,
+        REGISTRATIONS_QUERY,
+    ],
+)
+def test_documents_match_queries(document: str) -> None:
+    """The documents of the raw reads are those of queries.graphql."""
+    queries = definitions(
+        (Path(__file__).parent.parent / "queries.graphql").read_text()
+    )
+    for name, definition in definitions(document).items():
+        assert definition == queries[name]
+
+
+async def read_both(read: Any, data: dict[str, Any], **kwargs: Any) -> Any:
+    """Read through both the generated client and raw decoding.
+
+    Asserts that both send the same request, and decode to the same result.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"data": data})
+
+    client = FastJSONGraphQLClient(
+        url="http://mo/graphql",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    result = await read(client, raw=False, **kwargs)
+    assert await read(client, raw=True, **kwargs) == result
+
+    generated, raw = requests
+    assert normalise(raw["query"]) == normalise(generated["query"])
+    assert raw["variables"] == generated["variables"]
+    return result
+
+
+async def test_facets_page() -> None:
+    page = await read_both(facets_page, {"facets": FACETS}, limit=2, uuids=None)
+    assert page.objects == [(UUID(FACET_UUID), "visibility")]
+    assert page.next_cursor == "MQ=="
+
+
+async def test_it_systems_page() -> None:
+    page = await read_both(
+        it_systems_page,
+        {"itsystems": IT_SYSTEMS},
+        limit=2,
+        cursor="MQ==",
+        uuids=[UUID(IT_SYSTEM_UUID)],
+    )
+    assert page.objects == [(UUID(IT_SYSTEM_UUID), "AD", "AD")]
+    assert page.next_cursor is None
+
+
+async def test_classes_page() -> None:
+    page = await read_both(
+        classes_page,
+        {"classes": CLASSES},
+        limit=2,
+        facet_user_keys=["visibility"],
+        class_user_keys=["Public"],
+    )
+    assert page.objects == [
+        ClassRecord(UUID(CLASS_UUID), "visibility", "Public", "Public", None, "AD")
+    ]
+
+
+async def test_registrations_page() -> None:
+    page = await read_both(
+        registrations_page,
+        {"registrations": REGISTRATIONS},
+        limit=2,
+        models=["class"],
+        start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    assert page.objects == [
+        RegistrationRecord(
+            datetime(2024, 1, 1, 0, 0, 0, 1, tzinfo=timezone.utc),
+            "class",
+            UUID(CLASS_UUID),
+        )
+    ]
+
+
+async def test_snapshot_pages() -> None:
+    facets, it_systems, classes = await read_both(
+        snapshot_pages,
+        {"facets": FACETS, "itsystems": IT_SYSTEMS, "classes": CLASSES},
+        limit=2,
+        facet_user_keys=["visibility"],
+        class_user_keys=["Public"],
+    )
+    assert len(facets.objects) == len(it_systems.objects) == len(classes.objects) == 1
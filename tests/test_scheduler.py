@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+
+import pytest
+
+from os2mo_init.scheduler import DependencyError
+from os2mo_init.scheduler import Scheduler
+
+
+async def test_scheduler_respects_dependencies() -> None:
+    events: list[tuple[str, Hashable]] = []
+
+    def operation(key: Hashable, delay: float) -> Callable[[], Awaitable[None]]:
+        async def run() -> None:
+            events.append(("start", key))
+            await asyncio.sleep(delay)
+            events.append(("end", key))
+
+        return run
+
+    scheduler = Scheduler()
+    scheduler.add("slow", operation("slow", 0.02))
+    scheduler.add("fast", operation("fast", 0.01))
+    scheduler.add("child", operation("child", 0), dependencies=["fast", "missing"])
+    await scheduler.run()
+
+    # Independent operations start together
+    assert events[:2] == [("start", "slow"), ("start", "fast")]
+    # Dependent operations start as soon as their own dependencies are done
+    assert events.index(("start", "child")) == events.index(("end", "fast")) + 1
+    assert events.index(("end", "child")) < events.index(("end", "slow"))
+
+
+async def test_scheduler_collects_errors() -> None:
+    completed = []
+
+    async def fail() -> None:
+        raise ValueError("fail")
+
+    async def succeed() -> None:
+        completed.append("succeed")
+
+    async def child() -> None:
+        completed.append("child")  # pragma: no cover
+
+    scheduler = Scheduler()
+    scheduler.add("fail", fail)
+    scheduler.add("succeed", succeed)
+    scheduler.add("child", child, dependencies=["fail"])
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await scheduler.run()
+
+    # Independent operations run, even though some failed
+    assert completed == ["succeed"]
+    errors = exc_info.value.exceptions
+    assert len(errors) == 2
+    assert isinstance(errors[0], ValueError)
+    assert isinstance(errors[1], DependencyError)
+
+
+def test_scheduler_rejects_duplicates() -> None:
+    async def operation() -> None:
+        pass  # pragma: no cover
+
+    scheduler = Scheduler()
+    scheduler.add("a", operation)
+    with pytest.raises(ValueError):
+        scheduler.add("a", operation)
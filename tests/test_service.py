@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+
+from os2mo_init import service
+from os2mo_init.config import Settings
+from os2mo_init.plan import Plan
+
+
+def test_service_reconcile(config_file: Path, monkeypatch: MonkeyPatch) -> None:
+    calls: list[Any] = []
+
+    async def init(*args: Any, cache: Any) -> Plan:
+        calls.append(cache)
+        return Plan(root_organisation=None)
+
+    monkeypatch.setattr(service, "init", init)
+    config_file.write_text("{}")
+    settings = Settings(
+        client_id="os2mo-init", client_secret="hunter2", config_file=config_file
+    )
+
+    with TestClient(service.create_app(settings)) as client:
+        assert client.get("/status").json()["started"] is None
+
+        response = client.post("/reconcile")
+        assert response.status_code == 200
+        assert response.json()["plan"] == {
+            "root_organisation": None,
+            "it_systems": [],
+            "facets": [],
+            "classes": [],
+        }
+        assert client.get("/status").json()["finished"] is not None
+
+        client.post("/reconcile")
+
+    # The same in-memory cache is used across requests
+    assert len(calls) == 2
+    assert calls[0] is calls[1]
+
+
+async def test_service_get_config(config_file: Path) -> None:
+    config_file.write_text("{}")
+    settings = Settings(
+        client_id="os2mo-init", client_secret="hunter2", config_file=config_file
+    )
+    service_ = service.Service(settings)
+
+    config = await service_.get_config()
+    scope = service_.class_scope
+    # The config is only read again once the file changes
+    assert await service_.get_config() is config
+    config_file.write_text("facets:\n  visibility:\n    Public:\n      title: Public\n")
+    changed = await service_.get_config()
+    assert changed is not config
+    assert changed.facets is not None
+    assert service_.class_scope != scope
@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+from unittest.mock import call
+from uuid import uuid4
+
+from os2mo_init.autogenerated_graphql_client import ClassesQueryClasses
+from os2mo_init.autogenerated_graphql_client import FacetsQueryFacets
+from os2mo_init.autogenerated_graphql_client import GraphQLClientGraphQLMultiError
+from os2mo_init.autogenerated_graphql_client import ITSystemsQueryItsystems
+from os2mo_init.autogenerated_graphql_client import SnapshotQuery
+from os2mo_init.config import ConfigFile
+from os2mo_init.pagination import iter_it_systems
+from os2mo_init.snapshot import load_snapshot
+
+
+def classes_page(
+    classes: list[tuple[str, str]], next_cursor: str | None
+) -> dict[str, Any]:
+    return {
+        "objects": [
+            {
+                "current": {
+                    "facet": {"user_key": facet_user_key},
+                    "uuid": uuid4(),
+                    "user_key": class_user_key,
+                    "name": class_user_key,
+                    "scope": None,
+                    "it_system": None,
+                }
+            }
+            for facet_user_key, class_user_key in classes
+        ],
+        "page_info": {"next_cursor": next_cursor},
+    }
+
+
+def it_systems_page(user_keys: list[str], next_cursor: str | None) -> dict[str, Any]:
+    return {
+        "objects": [
+            {"current": {"uuid": uuid4(), "user_key": user_key, "name": user_key}}
+            for user_key in user_keys
+        ],
+        "page_info": {"next_cursor": next_cursor},
+    }
+
+
+async def test_load_snapshot() -> None:
+    client = AsyncMock()
+    client.root_org_query.side_effect = (
+        GraphQLClientGraphQLMultiError.from_errors_dicts(
+            [{"message": "ErrorCodes.E_ORG_UNCONFIGURED"}], data={}
+        )
+    )
+    client.snapshot_query.return_value = SnapshotQuery.parse_obj(
+        {
+            "facets": {
+                "objects": [{"current": {"uuid": uuid4(), "user_key": "visibility"}}],
+                "page_info": {"next_cursor": None},
+            },
+            "itsystems": it_systems_page(["AD"], next_cursor=None),
+            "classes": classes_page([("visibility", "Public")], next_cursor="MQ=="),
+        }
+    )
+    client.classes_query.return_value = ClassesQueryClasses.parse_obj(
+        classes_page([("visibility", "Intern"), ("role", "Public")], next_cursor=None)
+    )
+    config = ConfigFile.parse_obj(
+        {
+            "facets": {
+                "visibility": {
+                    "Public": {"title": "Public"},
+                    "Intern": {"title": "Intern"},
+                }
+            }
+        }
+    )
+
+    snapshot = await load_snapshot(client, config, page_size=2)
+
+    assert snapshot.root_organisation is None
+    assert set(snapshot.facets) == {"visibility"}
+    assert set(snapshot.it_systems) == {"AD"}
+    assert set(snapshot.classes) == {
+        ("visibility", "Public"),
+        ("visibility", "Intern"),
+        ("role", "Public"),
+    }
+    client.snapshot_query.assert_awaited_once()
+    last_call = client.classes_query.await_args
+    assert last_call == call(
+        facet_user_keys=["visibility"],
+        class_user_keys=last_call.kwargs["class_user_keys"],
+        uuids=None,
+        limit=2,
+        cursor="MQ==",
+    )
+    assert sorted(last_call.kwargs["class_user_keys"]) == ["Intern", "Public"]
+    client.facets_query.assert_not_awaited()
+    client.i_t_systems_query.assert_not_awaited()
+
+
+async def test_load_snapshot_while_parsing() -> None:
+    client = AsyncMock()
+    client.root_org_query.side_effect = (
+        GraphQLClientGraphQLMultiError.from_errors_dicts(
+            [{"message": "ErrorCodes.E_ORG_UNCONFIGURED"}], data={}
+        )
+    )
+    client.facets_query.return_value = FacetsQueryFacets.parse_obj(
+        {
+            "objects": [{"current": {"uuid": uuid4(), "user_key": "visibility"}}],
+            "page_info": {"next_cursor": None},
+        }
+    )
+    client.i_t_systems_query.return_value = ITSystemsQueryItsystems.parse_obj(
+        it_systems_page(["AD"], next_cursor=None)
+    )
+    client.classes_query.return_value = ClassesQueryClasses.parse_obj(
+        classes_page([("visibility", "Public")], next_cursor=None)
+    )
+    parsing: asyncio.Future[ConfigFile] = asyncio.Future()
+
+    loading = asyncio.create_task(load_snapshot(client, parsing, page_size=2))
+    await asyncio.sleep(0.01)
+    # Everything but the classes is read before the config is ready
+    client.root_org_query.assert_awaited_once()
+    client.facets_query.assert_awaited_once()
+    client.i_t_systems_query.assert_awaited_once()
+    client.classes_query.assert_not_awaited()
+
+    parsing.set_result(
+        ConfigFile.parse_obj({"facets": {"visibility": {"Public": {"title": "P"}}}})
+    )
+    snapshot = await loading
+
+    assert set(snapshot.facets) == {"visibility"}
+    assert set(snapshot.it_systems) == {"AD"}
+    assert set(snapshot.classes) == {("visibility", "Public")}
+    client.classes_query.assert_awaited_once_with(
+        facet_user_keys=["visibility"],
+        class_user_keys=["Public"],
+        uuids=None,
+        limit=2,
+        cursor=None,
+    )
+    client.snapshot_query.assert_not_awaited()
+
+
+async def test_iter_it_systems() -> None:
+    client = AsyncMock()
+    client.i_t_systems_query.side_effect = [
+        ITSystemsQueryItsystems.parse_obj(it_systems_page(["AD"], next_cursor="MQ==")),
+        ITSystemsQueryItsystems.parse_obj(it_systems_page([], next_cursor="Mg==")),
+        ITSystemsQueryItsystems.parse_obj(it_systems_page(["SD"], next_cursor=None)),
+    ]
+
+    pages = [
+        [it_system.user_key for it_system in page]
+        async for page in iter_it_systems(client, page_size=1)
+    ]
+
+    # Pages can be shorter than the limit, even empty, before the last one
+    assert pages == [["AD"], [], ["SD"]]
+    assert [c.kwargs["cursor"] for c in client.i_t_systems_query.await_args_list] == [
+        None,
+        "MQ==",
+        "Mg==",
+    ]
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import httpx
+
+from os2mo_init.app import init
+from os2mo_init.autogenerated_graphql_client import RegistrationsQueryRegistrations
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.plan import Plan
+from os2mo_init.state import State
+from os2mo_init.state import changed_since
+from os2mo_init.state import fingerprint
+from os2mo_init.state import latest_registration
+from os2mo_init.state import load_state
+from os2mo_init.state import save_state
+from tests.fake_mo import Drifting
+from tests.fake_mo import connect
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def registrations_page(
+    starts: list[datetime], next_cursor: str | None
+) -> RegistrationsQueryRegistrations:
+    page: dict[str, Any] = {
+        "objects": [
+            {"start": start, "model": "class", "uuid": uuid4()} for start in starts
+        ],
+        "page_info": {"next_cursor": next_cursor},
+    }
+    return RegistrationsQueryRegistrations.parse_obj(page)
+
+
+def test_fingerprint() -> None:
+    def config(title: str) -> ConfigFile:
+        return ConfigFile.parse_obj(
+            {"facets": {"visibility": {"Public": {"title": title}}}}
+        )
+
+    assert fingerprint(config("Public"), {"a", "b"}) == fingerprint(
+        config("Public"), {"b", "a"}
+    )
+    assert fingerprint(config("Public")) != fingerprint(config("Offentlig"))
+
+
+def test_load_save_state(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    assert load_state(path) is None
+
+    state = State(fingerprint="abc", watermark=NOW)
+    save_state(path, state)
+    assert load_state(path) == state
+
+    path.write_text("garbage")
+    assert load_state(path) is None
+
+
+async def test_changed_since() -> None:
+    client = AsyncMock()
+    client.registrations_query.side_effect = [
+        registrations_page([], next_cursor="MQ=="),
+        registrations_page([NOW + timedelta(days=1)], next_cursor="Mg=="),
+    ]
+
+    assert await changed_since(client, NOW)
+    # Stops as soon as a registration is found, and excludes the watermark itself
+    assert client.registrations_query.await_count == 2
+    first_call = client.registrations_query.await_args_list[0]
+    assert first_call.kwargs["start"] == NOW + timedelta(microseconds=1)
+
+
+async def test_latest_registration() -> None:
+    client = AsyncMock()
+    client.registrations_query.side_effect = [
+        registrations_page([NOW + timedelta(days=2), NOW], next_cursor="MQ=="),
+        registrations_page([NOW + timedelta(days=1)], next_cursor=None),
+    ]
+
+    latest = await latest_registration(client, page_size=2, since=NOW)
+
+    assert latest == NOW + timedelta(days=2)
+
+
+async def test_init_changed_during_run(tmp_path: Path, config_file: Path) -> None:
+    settings = Settings(
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        config_file=config_file,
+        state_file=tmp_path / "state.json",
+    )
+    mo = Drifting()
+
+    async def run(classes: list[str]) -> Plan | None:
+        config = ConfigFile.parse_obj(
+            {"facets": {"visibility": {c: {"title": c} for c in classes}}}
+        )
+        http_client = httpx.AsyncClient(transport=mo, base_url="http://mo")
+        async with connect(settings, http_client) as (graphql_client, batcher):
+            return await init(settings, config, graphql_client, batcher)
+
+    def names() -> set[str]:
+        return {c["name"] for c in mo.classes.values()}
+
+    await run(["Public"])
+    # Public is renamed by another client while Secret is being created
+    mo.drift = "Public"
+    await run(["Public", "Secret"])
+    assert names() == {"Drifted", "Secret"}
+
+    # The rename is not mistaken for our own write, so the run is not skipped
+    assert await run(["Public", "Secret"]) is not None
+    assert names() == {"Public", "Secret"}
+    assert await run(["Public", "Secret"]) is None
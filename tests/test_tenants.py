@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from pathlib import Path
+from typing import Any
+
+from pytest import MonkeyPatch
+
+from os2mo_init import tenants
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.config import Tenant
+from os2mo_init.config import get_tenants_file
+from os2mo_init.plan import Action
+from os2mo_init.plan import FacetOperation
+from os2mo_init.plan import Plan
+
+
+def test_get_tenants_file(tmp_path: Path) -> None:
+    tenants_file = tmp_path / "tenants.yml"
+    tenants_file.write_text(
+        "- name: aarhus\n"
+        "  mo_url: http://mo.aarhus\n"
+        "  client_id: os2mo-init\n"
+        "  client_secret: hunter2\n"
+    )
+    [tenant] = get_tenants_file(tenants_file)
+    assert tenant.name == "aarhus"
+    assert tenant.auth_server is None
+    assert tenant.auth_realm == "mo"
+
+
+async def test_reconcile_tenants(
+    config_file: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    calls: list[tuple[Settings, ConfigFile]] = []
+
+    async def init(settings: Settings, config: ConfigFile, *args: Any) -> Plan | None:
+        calls.append((settings, config))
+        if settings.client_id == "broken":
+            raise ValueError("Invalid credentials")
+        if settings.client_id == "unchanged":
+            return None
+        return Plan(
+            root_organisation=None,
+            facets=[
+                FacetOperation(action=Action.CREATE, uuid=None, user_key="role"),
+                FacetOperation(action=Action.NOOP, uuid=None, user_key="visibility"),
+            ],
+        )
+
+    monkeypatch.setattr(tenants, "init", init)
+    settings = Settings(
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        config_file=config_file,
+        cache_dir=tmp_path / "cache",
+    )
+    config = ConfigFile(root_organisation=None, facets=None, it_systems=None)
+    tenant_list = [
+        Tenant.parse_obj(
+            {
+                "name": name,
+                "mo_url": f"http://mo.{name}",
+                "client_id": client_id,
+                "client_secret": "hunter2",
+            }
+        )
+        for name, client_id in [
+            ("aarhus", "os2mo-init"),
+            ("odense", "broken"),
+            ("aalborg", "unchanged"),
+        ]
+    ]
+
+    summary = await tenants.reconcile_tenants(settings, config, tenant_list)
+
+    assert [t.dict() for t in summary.tenants] == [
+        {"name": "aarhus", "skipped": False, "created": 1, "updated": 0, "error": None},
+        {
+            "name": "odense",
+            "skipped": False,
+            "created": 0,
+            "updated": 0,
+            "error": "Invalid credentials",
+        },
+        {"name": "aalborg", "skipped": True, "created": 0, "updated": 0, "error": None},
+    ]
+    assert summary.failed == ["odense"]
+    # The config is parsed once and shared, while each tenant has its own settings
+    assert all(c is config for _, c in calls)
+    assert {s.mo_url for s, _ in calls} == {
+        "http://mo.aarhus",
+        "http://mo.odense",
+        "http://mo.aalborg",
+    }
+    assert (tmp_path / "cache" / "aarhus").is_dir()
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from os2mo_init.tracing import EVENT_HOOKS
+from os2mo_init.tracing import record_trace
+from os2mo_init.tracing import span
+from os2mo_init.tracing import traced
+
+
+async def test_record_trace(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": {}})
+
+    @traced("run")
+    async def run() -> None:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), event_hooks=EVENT_HOOKS
+        ) as client:
+
+            async def write(user_key: str) -> None:
+                with span("write class", user_key=user_key):
+                    await client.post(
+                        "http://mo/graphql/v20",
+                        content=b'{"query": "mutation BatchMutation { m0 }"}',
+                    )
+
+            await asyncio.gather(write("Public"), write("Secret"))
+        with pytest.raises(ValueError), span("failing"):
+            raise ValueError("Boom")
+
+    trace_file = tmp_path / "trace.json"
+    with record_trace(trace_file):
+        await run()
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert sorted(s["name"] for s in spans) == [
+        "failing",
+        "graphql BatchMutation",
+        "graphql BatchMutation",
+        "run",
+        "write class",
+        "write class",
+    ]
+    # The concurrent writes are in separate lanes
+    writes = [s for s in spans if s["name"] == "write class"]
+    assert writes[0]["tid"] != writes[1]["tid"]
+    request = next(s for s in spans if s["name"] == "graphql BatchMutation")
+    assert request["args"]["status_code"] == 200
+    assert request["args"]["operation"] == "BatchMutation"
+    assert next(s for s in spans if s["name"] == "failing")["args"] == {
+        "error": "ValueError('Boom')"
+    }
+
+
+async def test_trace_lanes(tmp_path: Path) -> None:
+    async def write() -> None:
+        with span("write class"):
+            pass
+
+    trace_file = tmp_path / "trace.json"
+    with record_trace(trace_file):
+        # Tasks run one after another, such that the ids of finished tasks may be
+        # reused by the next
+        for _ in range(10):
+            await asyncio.create_task(write())
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    lanes = [e["tid"] for e in events if e["ph"] == "X"]
+    assert len(set(lanes)) == 10
+
+
+async def test_tracing_disabled() -> None:
+    with span("untraced") as s:
+        assert s is None
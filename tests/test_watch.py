@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from os2mo_init.app import watch
+from os2mo_init.config import ConfigFile
+from os2mo_init.config import Settings
+from os2mo_init.config import get_config_file
+from os2mo_init.watch import diff_config
+from os2mo_init.watch import file_version
+from os2mo_init.watch import watch_file
+from tests.fake_mo import FakeMO
+from tests.fake_mo import connect
+
+
+def test_diff_config() -> None:
+    old = ConfigFile.parse_obj(
+        {
+            "root_organisation": {"municipality_code": 101},
+            "it_systems": {"AD": "Active Directory", "SD": "SD"},
+            "facets": {
+                "visibility": {
+                    "Public": {"title": "Public", "it_system": "AD"},
+                    "Intern": {"title": "Intern"},
+                },
+            },
+        }
+    )
+    new = ConfigFile.parse_obj(
+        {
+            "root_organisation": {"municipality_code": 101},
+            "it_systems": {"AD": "Active Directory", "SD": "SD Løn"},
+            "facets": {
+                "visibility": {
+                    "Public": {"title": "Offentlig", "it_system": "AD"},
+                    "Intern": {"title": "Intern"},
+                },
+                "role": {"Admin": {"title": "Admin"}},
+            },
+        }
+    )
+
+    changes = diff_config(old, new)
+
+    assert changes is not None
+    assert changes.dict() == {
+        "root_organisation": None,
+        # AD is unchanged, but referenced by a changed class
+        "it_systems": {"SD": "SD Løn", "AD": "Active Directory"},
+        "facets": {
+            "visibility": {
+                "Public": {"title": "Offentlig", "scope": None, "it_system": "AD"}
+            },
+            "role": {"Admin": {"title": "Admin", "scope": None, "it_system": None}},
+        },
+    }
+    assert diff_config(new, new) is None
+
+
+async def test_watch_file_symlink_swap(tmp_path: Path) -> None:
+    # Kubernetes updates ConfigMaps by atomically swapping a symlink
+    (tmp_path / "v1").mkdir()
+    (tmp_path / "v1" / "config.yml").write_text("facets: {}")
+    (tmp_path / "..data").symlink_to("v1")
+    path = tmp_path / "config.yml"
+    path.symlink_to(tmp_path / "..data" / "config.yml")
+    version = file_version(path)
+
+    (tmp_path / "v2").mkdir()
+    (tmp_path / "v2" / "config.yml").write_text("facets: {}")
+    (tmp_path / "..data_tmp").symlink_to("v2")
+    (tmp_path / "..data_tmp").replace(tmp_path / "..data")
+
+    changes = watch_file(path, interval=0, version=version)
+    new_version = await anext(changes)
+
+    assert new_version == file_version(path) != version
+
+
+async def test_watch_refreshes_snapshot(config_file: Path) -> None:
+    config_file.write_text(
+        "it_systems:\n  AD: Active Directory\n"
+        "facets:\n  visibility:\n    Public:\n      title: Public\n"
+    )
+    settings = Settings(
+        client_id="os2mo-init",
+        client_secret="hunter2",
+        config_file=config_file,
+        watch_interval=0.01,
+    )
+    mo = FakeMO()
+
+    async def until(condition: Any) -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    http_client = httpx.AsyncClient(transport=mo, base_url="http://mo")
+    async with connect(settings, http_client) as (graphql_client, batcher):
+        task = asyncio.create_task(
+            watch(settings, get_config_file(config_file), graphql_client, batcher)
+        )
+        await asyncio.wait_for(until(lambda: len(mo.classes) == 1), 5)
+        mo.requests.clear()
+
+        config_file.write_text(
+            "it_systems:\n  AD: Active Directory\n"
+            "facets:\n  visibility:\n    Public:\n      title: Public\n"
+            "    Secret:\n      title: Secret\n      it_system: AD\n"
+        )
+        await asyncio.wait_for(until(lambda: len(mo.classes) == 2), 5)
+        task.cancel()
+
+    # The snapshot is refreshed with the changes in MO, rather than loaded again,
+    # so only the classes of the changed config are read.
+    assert "FacetsQuery" not in mo.requests
+    assert "ITSystemsQuery" not in mo.requests
+    assert "SnapshotQuery" not in mo.requests